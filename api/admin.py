@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from api.models import Profile, TranslationJob
+from api.models import Profile, RedactionJobArchive, TranslationJob, TranslationJobArchive
 
 # Register your models here.
 @admin.register(TranslationJob)
@@ -10,6 +10,20 @@ class TranslationJobAdmin(admin.ModelAdmin):
     search_fields = ("filename", "profile__user__username", "profile__user__email")
     ordering = ("-created_at",)
 
+@admin.register(TranslationJobArchive)
+class TranslationJobArchiveAdmin(admin.ModelAdmin):
+    list_display = ("id", "profile", "filename", "target_lang", "status", "created_at", "archived_at")
+    list_filter = ("status", "target_lang")
+    search_fields = ("filename", "profile__user__username", "profile__user__email")
+    ordering = ("-created_at",)
+
+@admin.register(RedactionJobArchive)
+class RedactionJobArchiveAdmin(admin.ModelAdmin):
+    list_display = ("id", "profile", "filename", "status", "created_at", "archived_at")
+    list_filter = ("status",)
+    search_fields = ("filename", "profile__user__username", "profile__user__email")
+    ordering = ("-created_at",)
+
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ["user"]
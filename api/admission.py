@@ -0,0 +1,128 @@
+import base64
+import pickle
+import threading
+import uuid
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.redis import RedisCache
+from django.db import connections, router
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from api import metrics
+
+
+class Overloaded(APIException):
+    """503 with Retry-After (DRF's exception handler sends `wait` as the header)."""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many uploads in progress, try again shortly."
+    default_code = "overloaded"
+
+    def __init__(self, wait: int, detail=None):
+        super().__init__(detail)
+        self.wait = wait
+
+
+# Deletes KEYS[1] only while it holds ARGV[1], in one step on the Redis server
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def delete_if_held(key: str, token: str) -> bool:
+    """
+    Deletes the cache entry `key` only while it still holds `token`. Atomic on Redis (a Lua
+    script) and on the database cache (one conditional DELETE); on per-process backends a
+    get-then-delete, which can only race within this process.
+    """
+    backend = caches["default"]
+    cache_key = backend.make_and_validate_key(key)
+    if isinstance(backend, RedisCache):
+        client = backend._cache.get_client(cache_key, write=True)
+        return bool(client.eval(RELEASE_SCRIPT, 1, cache_key, backend._cache._serializer.dumps(token)))
+    if isinstance(backend, DatabaseCache):
+        # the value column holds the base64 of the pickled value, as DatabaseCache writes it
+        stored = base64.b64encode(pickle.dumps(token, backend.pickle_protocol)).decode("latin1")
+        connection = connections[router.db_for_write(backend.cache_model_class)]
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {connection.ops.quote_name(backend._table)} WHERE cache_key = %s AND value = %s",
+                           [cache_key, stored])
+            return cursor.rowcount > 0
+    if backend.get(key) == token:
+        backend.delete(key)
+        return True
+    return False
+
+
+class AdmissionGate:
+    """
+    Caps concurrent work of one kind: `local_limit` per process (a semaphore that is never
+    waited on) and `global_limit` across processes (slots in the shared cache). Requests over
+    either cap are turned away at once instead of queueing behind the ones in progress.
+
+    Each global slot is its own cache key with a TTL, so slots of a worker that died mid-request
+    free themselves. With a per-process cache backend the global cap acts per process as well.
+    """
+
+    def __init__(self, name: str, local_limit: int, global_limit: int, slot_ttl: int):
+        self.name = name
+        self.global_limit = global_limit
+        self.slot_ttl = slot_ttl
+        self._semaphore = threading.BoundedSemaphore(local_limit)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _slot_key(self, slot: int) -> str:
+        return f"api:admission:{self.name}:{slot}"
+
+    def try_acquire(self) -> tuple[str, str] | None:
+        """Returns the (slot key, token) that was taken, or None if the gate is full."""
+        if not self._semaphore.acquire(blocking=False):
+            return None
+        token = uuid.uuid4().hex
+        for slot in range(self.global_limit):
+            key = self._slot_key(slot)
+            if cache.add(key, token, timeout=self.slot_ttl):
+                self._track(+1)
+                return key, token
+        self._semaphore.release()
+        return None
+
+    def release(self, slot: tuple[str, str]):
+        # A request that outlived slot_ttl lost its slot, possibly to another request by now;
+        # only delete the key while it still holds our token.
+        delete_if_held(*slot)
+        self._semaphore.release()
+        self._track(-1)
+
+    def _track(self, delta: int):
+        with self._lock:
+            self._in_flight += delta
+            in_flight = self._in_flight
+        metrics.set_gauge(f"admission.{self.name}.in_flight", in_flight)
+        if delta > 0:
+            metrics.increment(f"admission.{self.name}.admitted")
+
+    def admit(self, stack: ExitStack):
+        """Takes a slot for the lifetime of `stack`, or raises Overloaded."""
+        slot = self.try_acquire()
+        if slot is None:
+            metrics.increment(f"admission.{self.name}.shed")
+            raise Overloaded(wait=settings.ADMISSION_RETRY_AFTER_SECONDS)
+        stack.callback(self.release, slot)
+
+
+UPLOAD_GATE = AdmissionGate("uploads", settings.ADMISSION_UPLOADS_PER_PROCESS, settings.ADMISSION_UPLOADS_GLOBAL,
+                            settings.ADMISSION_SLOT_TTL_SECONDS)
+SUBMIT_GATE = AdmissionGate("submissions", settings.ADMISSION_SUBMISSIONS_PER_PROCESS,
+                            settings.ADMISSION_SUBMISSIONS_GLOBAL, settings.ADMISSION_SLOT_TTL_SECONDS)
+# Status long-polls hold a worker thread for up to 25 s. Over this cap `?wait=` is ignored and the
+# status is answered at once (see JobStatusMixin), so waiting clients cannot take every thread.
+LONG_POLL_GATE = AdmissionGate("long_polls", settings.STATUS_LONG_POLLS_PER_PROCESS, settings.STATUS_LONG_POLLS_GLOBAL,
+                               settings.ADMISSION_SLOT_TTL_SECONDS)
@@ -0,0 +1,141 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+PROFILE_ID_CLAIM = "profile_id"
+IS_STAFF_CLAIM = "is_staff"
+USER_STATE_FIELDS = ("is_active", "is_staff", "is_superuser")
+# users whose state one process keeps in memory; expired entries are purged above this
+LOCAL_USER_STATE_MAX = 10_000
+
+# user id -> (monotonic expiry, state), in front of the shared cache
+_local_states: dict = {}
+_local_lock = threading.Lock()
+
+
+def _user_state_key(user_id) -> str:
+    return f"api:user-state:{user_id}"
+
+
+def _local_get(user_id) -> dict | None:
+    entry = _local_states.get(user_id)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return entry[1]
+
+
+def _local_set(user_id, state: dict):
+    now = time.monotonic()
+    with _local_lock:
+        if len(_local_states) >= LOCAL_USER_STATE_MAX:
+            for expired in [uid for uid, (expires, _) in _local_states.items() if expires <= now]:
+                del _local_states[expired]
+            if len(_local_states) >= LOCAL_USER_STATE_MAX:
+                _local_states.clear()
+        _local_states[user_id] = (now + settings.AUTH_USER_STATE_LOCAL_TTL, state)
+
+
+def get_user_state(user_id) -> dict:
+    """
+    is_active/is_staff/is_superuser of a user, cached for AUTH_USER_STATE_TTL seconds in the
+    shared cache and AUTH_USER_STATE_LOCAL_TTL seconds in this process, so most requests touch
+    neither the database nor the cache backend (a table, too, without REDIS_URL).
+    Deactivation or demotion takes effect within AUTH_USER_STATE_TTL; when the change goes
+    through the ORM, within AUTH_USER_STATE_LOCAL_TTL (see invalidate_user_state).
+    """
+    state = _local_get(user_id)
+    if state is not None:
+        return state
+    key = _user_state_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = get_user_model().objects.filter(pk=user_id).values(*USER_STATE_FIELDS).first()
+        # deleted users are cached as inactive
+        state = state or dict.fromkeys(USER_STATE_FIELDS, False)
+        cache.set(key, state, timeout=settings.AUTH_USER_STATE_TTL)
+    _local_set(user_id, state)
+    return state
+
+
+def invalidate_user_state(user_id):
+    """Drops the shared entry and this process's; other processes keep theirs until it expires."""
+    _local_states.pop(user_id, None)
+    cache.delete(_user_state_key(user_id))
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Embeds the profile id and staff flag, so API requests need no user or profile lookup."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        profile = getattr(user, "profile", None)
+        if profile is not None:
+            token[PROFILE_ID_CLAIM] = profile.id
+        token[IS_STAFF_CLAIM] = user.is_staff
+        return token
+
+
+class ClaimsUser(TokenUser):
+    """
+    Request user built from the token claims. Staff flags come from the cached user state;
+    `profile` is only loaded from the database when a view actually needs the row.
+    """
+
+    def __init__(self, token, state: dict):
+        super().__init__(token)
+        self.state = state
+
+    @cached_property
+    def is_staff(self) -> bool:
+        return self.state["is_staff"]
+
+    @cached_property
+    def is_superuser(self) -> bool:
+        return self.state["is_superuser"]
+
+    @cached_property
+    def profile_id(self) -> int:
+        return self.token[PROFILE_ID_CLAIM]
+
+    @cached_property
+    def profile(self):
+        from api.models import Profile
+        return Profile.objects.get(pk=self.profile_id)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication for the API views that trusts the signed claims instead of loading
+    the User row; only the cached user state is checked for revocation. Tokens issued
+    before the claims existed fall back to the regular database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if PROFILE_ID_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+        state = get_user_state(user_id)
+        if not state["is_active"]:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return ClaimsUser(validated_token, state)
+
+
+def get_profile_id(user) -> int:
+    """Profile id of the request user, from the token claims when available."""
+    profile_id = getattr(user, "profile_id", None)
+    if profile_id is None:
+        profile_id = user.profile.id
+    return profile_id
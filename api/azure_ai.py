@@ -1,63 +1,238 @@
-from urllib.parse import urlsplit
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urlsplit
 import os
 import uuid
 from dotenv import load_dotenv
-from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPermissions, BlobClient
 from datetime import datetime, timedelta, timezone
-import requests
+from typing import TYPE_CHECKING
 import logging
 import warnings
 import json
+import time
 
-from api.entity_processing import EntityProcessor
+from api.endpoint_pool import EndpointPool, load_endpoints
+from api.structured_logging import log_payload
+
+# The Azure SDK and pandas (via api.entity_processing) are imported inside the
+# methods that need them so that settings, manage.py and worker boot stay cheap.
+if TYPE_CHECKING:
+    from azure.storage.blob import BlobClient
 
-logging.basicConfig(level=logging.INFO)
 load_dotenv(override=True)
 
+TEXT_TRANSLATION_ENDPOINT = "https://api.cognitive.microsofttranslator.com"
+SYNC_DOCUMENT_API_VERSION = "2024-05-01"
+
+# Azure Blob batch requests accept at most 256 sub-requests.
+BLOB_BATCH_SIZE = 256
+
+
+def delete_blob_urls(connection_string: str, blob_urls, max_workers: int = 4) -> set[str]:
+    """
+    Deletes the given blobs with batch requests, sending the batches concurrently.
+    Blobs that no longer exist count as deleted. Returns the URLs that could not be deleted.
+    """
+    from azure.storage.blob import BlobServiceClient
+
+    by_container = defaultdict(dict)
+    for url in blob_urls:
+        if not url:
+            continue
+        container, blob_name = unquote(urlsplit(url).path.lstrip('/')).split('/', 1)
+        by_container[container][blob_name] = url
+
+    service_client = BlobServiceClient.from_connection_string(connection_string)
+    chunks = []
+    for container, blobs in by_container.items():
+        names = list(blobs)
+        for i in range(0, len(names), BLOB_BATCH_SIZE):
+            chunks.append((container, names[i:i + BLOB_BATCH_SIZE]))
+
+    def delete_chunk(chunk):
+        container, names = chunk
+        container_client = service_client.get_container_client(container)
+        try:
+            responses = container_client.delete_blobs(*names, raise_on_any_failure=False)
+        except Exception as e:
+            logging.error(f"Batch delete of {len(names)} blobs in {container} failed: {e}")
+            return [by_container[container][name] for name in names]
+        return [by_container[container][name]
+                for name, response in zip(names, responses)
+                if response.status_code not in (202, 404)]
+
+    failed = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for chunk_failed in pool.map(delete_chunk, chunks):
+            failed.update(chunk_failed)
+    return failed
+
+
+def get_container_blob_client(connection_string: str, container: str, blob_name: str) -> "BlobClient":
+    from azure.storage.blob import BlobServiceClient
+    return BlobServiceClient.from_connection_string(connection_string).get_blob_client(container, blob_name)
+
+
+def build_upload_sas_url(connection_string: str, account_name: str, account_key: str, container: str, blob_name: str,
+                         minutes_valid: int) -> tuple[str, datetime]:
+    """
+    Write-only SAS for one blob name: the holder can create and write that blob, but not
+    read, list or delete anything. Used for uploads straight from the browser.
+    """
+    from azure.storage.blob import BlobSasPermissions, generate_blob_sas
+
+    blob_client = get_container_blob_client(connection_string, container, blob_name)
+    expiry = datetime.now(timezone.utc) + timedelta(minutes=minutes_valid)
+    sas = generate_blob_sas(
+        account_name=account_name,
+        container_name=container,
+        blob_name=blob_name,
+        account_key=account_key,
+        permission=BlobSasPermissions(create=True, write=True),
+        expiry=expiry,
+    )
+    return f"{blob_client.url}?{sas}", expiry
+
+
+def get_blob_properties_or_none(connection_string: str, container: str, blob_name: str):
+    """Returns (blob URL, BlobProperties), with None properties if the blob does not exist."""
+    from azure.core.exceptions import ResourceNotFoundError
+
+    blob_client = get_container_blob_client(connection_string, container, blob_name)
+    try:
+        return blob_client.url, blob_client.get_blob_properties()
+    except ResourceNotFoundError:
+        return blob_client.url, None
+
+
+TRANSLATION_POOL = EndpointPool("translation", load_endpoints("AZURE_TRANSLATION_ENDPOINTS", {
+    "endpoint": os.getenv('AZURE_TRANSLATION_ENDPOINT'),
+    "key": os.getenv('AZURE_TRANSLATION_KEY'),
+    "region": os.getenv('AZURE_TRANSLATION_REGION'),
+    "text_endpoint": os.getenv('AZURE_TRANSLATION_TEXT_ENDPOINT', TEXT_TRANSLATION_ENDPOINT),
+    "connection_string": os.getenv('AZURE_STORAGE_ACCOUNT_CONNECTION_STRING'),
+    "account_name": os.getenv('AZURE_STORAGE_ACCOUNT_NAME'),
+    "storage_key": os.getenv('AZURE_STORAGE_ACCOUNT_KEY'),
+    "container_in": os.getenv('AZURE_BLOB_CONTAINER_IN'),
+    "container_out": os.getenv('AZURE_BLOB_CONTAINER_OUT'),
+}))
+
+PII_POOL = EndpointPool("redaction", load_endpoints("PII_ENDPOINTS", {
+    "language_endpoint": os.getenv("PII_LANGUAGE_ENDPOINT"),
+    "language_key": os.getenv("PII_LANGUAGE_KEY"),
+    "region": os.getenv("PII_LANGUAGE_REGION"),
+    "connection_string": os.getenv("PII_STORAGE_ACCOUNT_CONNECTION_STRING"),
+    "account_name": os.getenv("PII_STORAGE_ACCOUNT_NAME"),
+    "storage_key": os.getenv("PII_STORAGE_ACCOUNT_KEY"),
+    "container_in": os.getenv("PII_STORAGE_ACCOUNT_CONTAINER_IN"),
+    "container_out": os.getenv("PII_STORAGE_ACCOUNT_CONTAINER_OUT"),
+}))
+
 
 class AzureDocumentTranslator():
-    def __init__(self):
-        self.endpoint = os.getenv('AZURE_TRANSLATION_ENDPOINT')
-        self.key = os.getenv('AZURE_TRANSLATION_KEY')
-        self.container_in = os.getenv('AZURE_BLOB_CONTAINER_IN')
-        self.container_out = os.getenv('AZURE_BLOB_CONTAINER_OUT')
-        self.account_name = os.getenv('AZURE_STORAGE_ACCOUNT_NAME')
-        self.storage_key = os.getenv('AZURE_STORAGE_ACCOUNT_KEY')
+    pool = TRANSLATION_POOL
+
+    def __init__(self, endpoint_name: str | None = None):
+        """Client for one resource of the pool: a chosen one for new work, or the named one of an existing job."""
+        resource = self.pool.choose() if endpoint_name is None else self.pool.get(endpoint_name)
+        self.endpoint_name = resource.name
+        self.endpoint = resource.config["endpoint"]
+        self.key = resource.config["key"]
+        self.container_in = resource.config["container_in"]
+        self.container_out = resource.config["container_out"]
+        self.account_name = resource.config["account_name"]
+        self.storage_key = resource.config["storage_key"]
+        self.connection_string = resource.config["connection_string"]
+        self.region = resource.config["region"]
+        self.text_endpoint = resource.config["text_endpoint"]
     
     def translate_single_doument(self, file, file_name: str, target_lang: str):
-        print("Uploading to Azure Blob Storage...")
+        started = time.monotonic()
         source_file = self.__upload_to_blob(file, file_name)
-        print(f"Uploaded to blob {source_file}")
-    
+        logging.info(f"Uploaded {file_name} to blob storage", extra={
+            "operation": "translation.upload", "endpoint": self.endpoint_name,
+            "duration_ms": round((time.monotonic() - started) * 1000)})
+        target_file, operation_location = self.submit_translation(source_file, file_name, target_lang)
+        return source_file, target_file, operation_location
+
+    def submit_translation(self, source_file: str, file_name: str, target_lang: str) -> tuple[str, str]:
+        """Starts a batch translation of a blob already in container_in. Returns (target URL, operation location)."""
         target_file = self.__build_target_file_url(source_file, file_name, target_lang)
         
         request_url = f"{self.endpoint}translator/text/batch/v1.1/batches"
         headers = {'Ocp-Apim-Subscription-Key': self.key}
         payload = self.__get_payload(source_file, target_file, target_lang)
 
-        print("Requesting document translation...")
-        response = requests.post(request_url, headers=headers, json=payload)
+        started = time.monotonic()
+        response = self.pool.request(self.endpoint_name, "post", request_url, headers=headers, json=payload)
         response.raise_for_status()
 
         operation_location = response.headers["operation-location"]
-        print(f"Translation job scheduled. Operation location: {operation_location}")
+        logging.info(f"Translation of {file_name} scheduled", extra={
+            "operation": "translation.submit", "endpoint": self.endpoint_name, "operation_location": operation_location,
+            "duration_ms": round((time.monotonic() - started) * 1000)})
 
-        return source_file, target_file, operation_location
+        return target_file, operation_location
+
+    def build_upload_sas(self, blob_name: str, minutes_valid: int) -> tuple[str, datetime]:
+        return build_upload_sas_url(self.connection_string, self.account_name,
+                                    self.storage_key, self.container_in, blob_name, minutes_valid)
+
+    def get_upload_properties(self, blob_name: str):
+        return get_blob_properties_or_none(self.connection_string, self.container_in, blob_name)
+
+    def get_upload_blob_client(self, blob_name: str) -> "BlobClient":
+        return get_container_blob_client(self.connection_string, self.container_in, blob_name)
     
+    def translate_text(self, text: str, target_lang: str) -> str:
+        """Synchronous Translator text API, for short pasted text."""
+        request_url = f"{self.text_endpoint.rstrip('/')}/translate"
+        params = {"api-version": "3.0", "to": target_lang}
+        response = self.pool.request(self.endpoint_name, "post", request_url, headers=self.__get_sync_headers(),
+                                     params=params, json=[{"Text": text}])
+        response.raise_for_status()
+        return response.json()[0]["translations"][0]["text"]
+
+    def translate_document_sync(self, data: bytes, file_name: str, target_lang: str, content_type: str | None = None) -> bytes:
+        """Synchronous document translation: the translated file comes back in the response body."""
+        request_url = f"{self.endpoint}translator/document:translate"
+        params = {"targetLanguage": target_lang, "api-version": SYNC_DOCUMENT_API_VERSION}
+        files = {"document": (file_name, data, content_type or "application/octet-stream")}
+        response = self.pool.request(self.endpoint_name, "post", request_url, headers=self.__get_sync_headers(),
+                                     params=params, files=files)
+        response.raise_for_status()
+        return response.content
+
+    def store_translated_document(self, data: bytes, file_name: str, target_lang: str) -> str:
+        """Uploads an already translated document to the output container and returns its URL."""
+        from azure.storage.blob import BlobServiceClient
+        blob_client = BlobServiceClient.from_connection_string(self.connection_string)
+        container_client = blob_client.get_container_client(self.container_out)
+        target_file = self.__build_target_file_url(container_client.url, file_name, target_lang)
+        blob_name = urlsplit(target_file).path.lstrip('/').split('/', 1)[1]
+        blob = container_client.upload_blob(name=blob_name, data=data, overwrite=True)
+        return blob.url
+
+    def delete_blobs(self, blob_urls) -> set[str]:
+        return delete_blob_urls(self.connection_string, blob_urls)
+
     def get_all_blobs_in_container(self, container_name):
-        blob_client = BlobServiceClient.from_connection_string(os.getenv('AZURE_STORAGE_ACCOUNT_CONNECTION_STRING'))
+        from azure.storage.blob import BlobServiceClient
+        blob_client = BlobServiceClient.from_connection_string(self.connection_string)
         container_client = blob_client.get_container_client(container_name)
         blobs = container_client.list_blobs()
         return [blob.name for blob in blobs]
     
     def get_operation_status(self, operation_location: str) -> dict:
         headers = {'Ocp-Apim-Subscription-Key': self.key}
-        response = requests.get(operation_location, headers=headers)
+        response = self.pool.request(self.endpoint_name, "get", operation_location, headers=headers)
         response.raise_for_status()
-        print(f"Debug info: Operation status response: {response.json()}")
-        return response.json()
+        operation_status = response.json()
+        log_payload("translation.status", operation_status, endpoint=self.endpoint_name)
+        return operation_status
     
     def build_sas_url(self, blob_url:str, minutes_valid: int = 60) -> tuple[str, datetime]:
+        from azure.storage.blob import generate_blob_sas, BlobSasPermissions
         parts = urlsplit(blob_url)
         path = parts.path.lstrip('/')
         container, blob_name = path.split('/', 1)
@@ -88,13 +263,21 @@ class AzureDocumentTranslator():
         
     
     def __upload_to_blob(self, file, name) -> str:
-        blob_client = BlobServiceClient.from_connection_string(os.getenv('AZURE_STORAGE_ACCOUNT_CONNECTION_STRING'))
+        from azure.storage.blob import BlobServiceClient
+        blob_client = BlobServiceClient.from_connection_string(self.connection_string)
         container_client = blob_client.get_container_client(self.container_in)
-        blob = container_client.upload_blob(name = name, data = file, overwrite = True)  
+        # own folder per upload: jobs with the same file name must not share (and purge) one blob
+        blob = container_client.upload_blob(name = f"{uuid.uuid4().hex}/{name}", data = file, overwrite = True)  
         return blob.url
     
     def __normalize_target(self, code: str) -> str:
         return code.lower() if code else code
+
+    def __get_sync_headers(self) -> dict:
+        headers = {'Ocp-Apim-Subscription-Key': self.key}
+        if self.region:
+            headers['Ocp-Apim-Subscription-Region'] = self.region
+        return headers
     
     def __get_payload(self, source_file: str, target_file: str, target_lang: str) -> dict:
         return {
@@ -139,27 +322,42 @@ class AzureLanguageDetector():
     
 
 class AzurePIIRedaction():
-    def __init__(self):
-        self.language_endpoint = os.getenv("PII_LANGUAGE_ENDPOINT")
-        self.language_key = os.getenv("PII_LANGUAGE_KEY")
-        self.container_in = os.getenv("PII_STORAGE_ACCOUNT_CONTAINER_IN")
-        self.container_out = os.getenv("PII_STORAGE_ACCOUNT_CONTAINER_OUT")
-        self.region = os.getenv("PII_LANGUAGE_REGION")
-        self.connection_string = os.getenv("PII_STORAGE_ACCOUNT_CONNECTION_STRING")
-        self.account_name = os.getenv("PII_STORAGE_ACCOUNT_NAME")
-        self.storage_key = os.getenv("PII_STORAGE_ACCOUNT_KEY")
+    PII_CATEGORIES = ["Person", "Organization", "Email", "Address"]
+    # Limits of the synchronous analyze-text API for PII recognition.
+    SYNC_MAX_DOCUMENTS = 5
+    SYNC_MAX_CHARS = 5120
+    pool = PII_POOL
+
+    def __init__(self, endpoint_name: str | None = None):
+        """Client for one resource of the pool: a chosen one for new work, or the named one of an existing job."""
+        resource = self.pool.choose() if endpoint_name is None else self.pool.get(endpoint_name)
+        self.endpoint_name = resource.name
+        self.language_endpoint = resource.config["language_endpoint"]
+        self.language_key = resource.config["language_key"]
+        self.container_in = resource.config["container_in"]
+        self.container_out = resource.config["container_out"]
+        self.region = resource.config["region"]
+        self.connection_string = resource.config["connection_string"]
+        self.account_name = resource.config["account_name"]
+        self.storage_key = resource.config["storage_key"]
 
 
     def perform_redaction(self, file, blob_name, language):
-        logging.info(f"Starting PII redaction for blob: {blob_name}")
+        started = time.monotonic()
         input_blob_url = self.__upload_to_blob(file, blob_name)
-        logging.info(f"Uploaded blob to: {input_blob_url}")
-        
+        logging.info(f"Uploaded {blob_name} to blob storage", extra={
+            "operation": "redaction.upload", "endpoint": self.endpoint_name,
+            "duration_ms": round((time.monotonic() - started) * 1000)})
+        operation_location = self.submit_redaction(input_blob_url, language)
+        if operation_location is None:
+            return
+        return input_blob_url, operation_location
+
+    def submit_redaction(self, input_blob_url: str, language: str) -> str | None:
+        """Starts a redaction job for a blob already in container_in. Returns the operation location."""
+        from azure.storage.blob import BlobServiceClient
         blob_service_client = BlobServiceClient.from_connection_string(self.connection_string)
         output_container = blob_service_client.get_container_client(self.container_out)
-        logging.info(f"Output Container URL: {output_container.url}")
-        
-        logging.info("Preparing payload and headers for http request...")
         request_url = f"{self.language_endpoint}/language/analyze-documents/jobs?api-version=2024-11-15-preview"
         payload = self.__get_payload(
             source_blob_url=input_blob_url,
@@ -167,20 +365,98 @@ class AzurePIIRedaction():
             language=language
         )
         headers = self.__get_headers()
-        response = requests.post(url=request_url, headers=headers, json=payload)
+        started = time.monotonic()
+        response = self.pool.request(self.endpoint_name, "post", request_url, headers=headers, json=payload)
+        fields = {"operation": "redaction.submit", "endpoint": self.endpoint_name,
+                  "duration_ms": round((time.monotonic() - started) * 1000)}
         if response.status_code != 202:
-            logging.error(f"Failed to submit redaction job: {response.status_code} - {response.text}")
+            logging.error(f"Failed to submit redaction job: {response.status_code} - {response.text}", extra=fields)
             return
         operation_location = response.headers.get("Operation-Location")
-        logging.info(f"Redaction job submitted successfully. Operation Location: {operation_location}")
-        return input_blob_url, operation_location
+        logging.info("Redaction job submitted", extra={**fields, "operation_location": operation_location})
+        return operation_location
+
+    def build_upload_sas(self, blob_name: str, minutes_valid: int) -> tuple[str, datetime]:
+        return build_upload_sas_url(self.connection_string, self.account_name, self.storage_key,
+                                    self.container_in, blob_name, minutes_valid)
+
+    def get_upload_properties(self, blob_name: str):
+        return get_blob_properties_or_none(self.connection_string, self.container_in, blob_name)
+
+    def get_upload_blob_client(self, blob_name: str) -> "BlobClient":
+        return get_container_blob_client(self.connection_string, self.container_in, blob_name)
     
+    def delete_blobs(self, blob_urls) -> set[str]:
+        return delete_blob_urls(self.connection_string, blob_urls)
+
+    def recognize_pii_texts(self, texts: list[str], language: str, max_workers: int = 4) -> list[dict]:
+        """
+        Synchronous PII recognition for short texts. Texts are sent SYNC_MAX_DOCUMENTS per
+        request, requests run concurrently. Offsets are in code points so they index Python strings.
+        Returns one {"entities": [...], "warnings": [...]} per input text, in input order, or
+        {"error": "..."} for a text Azure could not analyze (e.g. an unsupported language).
+        """
+        request_url = f"{self.language_endpoint}/language/:analyze-text?api-version=2023-04-01"
+        headers = self.__get_headers()
+
+        def analyze(start):
+            documents = [
+                {"id": str(start + i), "language": language, "text": text}
+                for i, text in enumerate(texts[start:start + self.SYNC_MAX_DOCUMENTS])
+            ]
+            payload = {
+                "kind": "PiiEntityRecognition",
+                "parameters": {
+                    "modelVersion": "latest",
+                    "piiCategories": self.PII_CATEGORIES,
+                    "stringIndexType": "UnicodeCodePoint",
+                },
+                "analysisInput": {"documents": documents},
+            }
+            response = self.pool.request(self.endpoint_name, "post", request_url, headers=headers, json=payload)
+            response.raise_for_status()
+            results = response.json()["results"]
+            for error in results.get("errors", []):
+                logging.error(f"PII recognition failed for document {error.get('id')}: {error.get('error')}")
+            return results.get("documents", []), results.get("errors", [])
+
+        by_id = {}
+        errors = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for documents, failed in pool.map(analyze, range(0, len(texts), self.SYNC_MAX_DOCUMENTS)):
+                for doc in documents:
+                    by_id[int(doc["id"])] = doc
+                for error in failed:
+                    detail = error.get("error") or {}
+                    errors[int(error["id"])] = detail.get("message") or detail.get("code") or "PII recognition failed."
+
+        results = []
+        for i in range(len(texts)):
+            doc = by_id.get(i)
+            if doc is None:
+                # never report a text without a result as free of entities
+                results.append({"error": errors.get(i, "No result for this text.")})
+                continue
+            entities = [
+                {
+                    "text": e.get("text"),
+                    "type": e.get("category"),
+                    "offset": e.get("offset"),
+                    "length": e.get("length"),
+                    "confidenceScore": e.get("confidenceScore"),
+                }
+                for e in doc.get("entities", [])
+            ]
+            results.append({"entities": entities, "warnings": doc.get("warnings", [])})
+        return results
+
     def get_operation_status(self, operation_location: str) -> dict:
         headers = {'Ocp-Apim-Subscription-Key': self.language_key}
-        response = requests.get(operation_location, headers=headers)
+        response = self.pool.request(self.endpoint_name, "get", operation_location, headers=headers)
         response.raise_for_status()
-        print(f"Debug info: Operation status response: {response.json()}")
-        return response.json()
+        operation_status = response.json()
+        log_payload("redaction.status", operation_status, endpoint=self.endpoint_name)
+        return operation_status
     
     def get_target_blob_urls(self, operation_status: dict, process_entities=False) -> tuple[str | None, str | None]:
         """
@@ -217,17 +493,18 @@ class AzurePIIRedaction():
                     json_url = location
                     logging.info(f"Found extraction JSON URL: {json_url}")
                     if process_entities:
+                        from api.entity_processing import EntityProcessor
                         logging.info("Processing extracted entities JSON...")
                         #TODO: try: blob client from json_url -> download json -> process entities DONE -> upload processed json
-                        blob_client = self.__get_blob_from_url(json_url)
+                        blob_client = self.get_blob_client(json_url)
                         try:
                             raw = blob_client.download_blob().readall()
                             data = json.loads(raw)
                         except Exception as e:
                             logging.error(f"Failed to download or parse entities JSON from {json_url}: {e}")
                             continue
-                        aggregated_df = EntityProcessor("<blob>").load_from_dict(data).aggregate_entity_ids_by_text()
-                        logging.info(f"Aggregated {len(aggregated_df)} entities by text.") 
+                        aggregated = EntityProcessor("<blob>").load_from_dict(data).aggregate_records()
+                        logging.info(f"Aggregated {len(aggregated)} entities by text.") 
                 else:
                     # everything else is the redacted document
                     redacted_url = location
@@ -275,6 +552,7 @@ class AzurePIIRedaction():
 
     
     def build_sas_url(self, blob_url:str, minutes_valid: int = 60, as_attachment=True) -> tuple[str, datetime]:
+        from azure.storage.blob import generate_blob_sas, BlobSasPermissions
         parts = urlsplit(blob_url)
         path = parts.path.lstrip('/')
         container, blob_name = path.split('/', 1)
@@ -319,12 +597,7 @@ class AzurePIIRedaction():
                         "redactionPolicy": {
                             "policyKind": "entityMask"  
                         },
-                        "piiCategories": [
-                            "Person",
-                            "Organization",
-                            "Email",
-                            "Address",
-                        ],
+                        "piiCategories": self.PII_CATEGORIES,
                         "excludeExtractionData": False
                     }
                 }
@@ -344,14 +617,17 @@ class AzurePIIRedaction():
     
 
     def __upload_to_blob(self, file, name) -> str:
+        from azure.storage.blob import BlobServiceClient
         blob_client = BlobServiceClient.from_connection_string(self.connection_string)
         container_client = blob_client.get_container_client(self.container_in)
-        blob = container_client.upload_blob(name = name, data = file, overwrite = True)  
+        # own folder per upload: jobs with the same file name must not share (and purge) one blob
+        blob = container_client.upload_blob(name = f"{uuid.uuid4().hex}/{name}", data = file, overwrite = True)  
         return blob.url
     
-    def __get_blob_from_url(self, blob_url: str) -> BlobClient:
+    def get_blob_client(self, blob_url: str) -> "BlobClient":
+        from azure.storage.blob import BlobServiceClient
         parts = urlsplit(blob_url)
-        path = parts.path.lstrip('/')
+        path = unquote(parts.path).lstrip('/')
         container, blob_name = path.split('/', 1)
         blob_service_client = BlobServiceClient.from_connection_string(self.connection_string)
         container_client = blob_service_client.get_container_client(container)
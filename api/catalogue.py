@@ -0,0 +1,73 @@
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db import router
+from django.utils import timezone as django_timezone
+
+LANGUAGE_CATALOGUE_CACHE_KEY = "api:language-catalogue"
+# How long a worker trusts its own copy before re-checking the shared cache,
+# so invalidations from other workers become visible within this window.
+LOCAL_TTL_SECONDS = 60
+# Upper bound for the shared copy as well, in case an invalidation is ever missed.
+SHARED_TTL_SECONDS = 60 * 60
+
+
+@dataclass(frozen=True)
+class CatalogueEntry:
+    data: list
+    etag: str
+    last_modified: datetime
+
+
+_local_lock = threading.Lock()
+_local_entry: CatalogueEntry | None = None
+_local_checked_at = 0.0
+
+
+def get_language_catalogue() -> CatalogueEntry:
+    """
+    Returns the serialized language catalogue. Served from the worker's memory,
+    then the shared cache, and only built from the database when both are empty.
+    """
+    global _local_entry, _local_checked_at
+    now = time.monotonic()
+    with _local_lock:
+        if _local_entry is not None and now - _local_checked_at < LOCAL_TTL_SECONDS:
+            return _local_entry
+
+    entry = cache.get(LANGUAGE_CATALOGUE_CACHE_KEY)
+    if entry is None:
+        entry = _build_language_catalogue()
+        cache.set(LANGUAGE_CATALOGUE_CACHE_KEY, entry, timeout=SHARED_TTL_SECONDS)
+
+    with _local_lock:
+        _local_entry = entry
+        _local_checked_at = now
+    return entry
+
+
+def invalidate_language_catalogue():
+    global _local_entry
+    with _local_lock:
+        _local_entry = None
+    cache.delete(LANGUAGE_CATALOGUE_CACHE_KEY)
+
+
+def _build_language_catalogue() -> CatalogueEntry:
+    from api.models import LanguageCode
+    from api.serializers import LanguageCodeSerializer
+
+    # Built from the primary: the result is cached until the next LanguageCode change,
+    # so a lagging replica snapshot would be served indefinitely.
+    languages = LanguageCode.objects.using(router.db_for_write(LanguageCode)).order_by('name')
+    data = LanguageCodeSerializer(languages, many=True).data
+    data = [dict(item) for item in data]
+    digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+    # HTTP dates have second precision, so drop microseconds to keep If-Modified-Since comparable.
+    last_modified = django_timezone.now().replace(microsecond=0)
+    return CatalogueEntry(data=data, etag=f'"{digest[:32]}"', last_modified=last_modified)
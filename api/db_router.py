@@ -0,0 +1,49 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+# Set for the duration of a request whose reads may be served by a replica
+# (see ReplicaReadMixin). Everything else, including all writes, uses the primary.
+read_from_replica: ContextVar[bool] = ContextVar("read_from_replica", default=False)
+
+
+class ReplicaRouter:
+    """
+    Sends reads to a random alias in DATABASE_READ_REPLICAS while replica reads are enabled
+    for the current request. Replicas hold the same data, so relations between them are allowed,
+    and only the primary is migrated.
+    """
+
+    def db_for_read(self, model, **hints):
+        # the database cache table (DatabaseCache) is read where it is written
+        if read_from_replica.get() and settings.DATABASE_READ_REPLICAS and model._meta.app_label != "django_cache":
+            return random.choice(settings.DATABASE_READ_REPLICAS)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_READ_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def _sticky_key(user_id) -> str:
+    return f"api:db-sticky:{user_id}"
+
+
+def mark_primary_sticky(user_id):
+    """Keeps the user's reads on the primary while replicas may still lag behind their write."""
+    cache.set(_sticky_key(user_id), True, timeout=settings.READ_REPLICA_STICKY_SECONDS)
+
+
+def is_primary_sticky(user_id) -> bool:
+    return bool(cache.get(_sticky_key(user_id)))
@@ -0,0 +1,35 @@
+import os
+import re
+import uuid
+
+# Browser uploads land in container_in as uploads/{profile_id}/{uuid}/{filename}.
+UPLOAD_PREFIX = "uploads"
+MAX_FILENAME_LENGTH = 200
+UNSAFE_FILENAME_CHARS = re.compile(r'[\x00-\x1f\x7f/\\"]')
+
+
+def clean_filename(filename: str) -> str:
+    name = UNSAFE_FILENAME_CHARS.sub("_", os.path.basename(filename.replace("\\", "/"))).strip()
+    stem, ext = os.path.splitext(name)
+    return (stem[:MAX_FILENAME_LENGTH - len(ext)] + ext) if stem else "document" + ext
+
+
+def new_upload_blob_name(profile_id: int, filename: str) -> str:
+    return f"{UPLOAD_PREFIX}/{profile_id}/{uuid.uuid4().hex}/{clean_filename(filename)}"
+
+
+def upload_filename(blob_name: str, profile_id: int) -> str | None:
+    """
+    Returns the file name of an upload blob issued to this profile, or None for any
+    other blob name (foreign profile, other containers' layout, path tricks).
+    """
+    parts = blob_name.split("/")
+    if len(parts) != 4 or parts[0] != UPLOAD_PREFIX or parts[1] != str(profile_id):
+        return None
+    try:
+        uuid.UUID(hex=parts[2])
+    except ValueError:
+        return None
+    if not parts[3] or parts[3] != clean_filename(parts[3]):
+        return None
+    return parts[3]
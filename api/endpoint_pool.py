@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+from django.conf import settings
+
+from api import metrics
+
+DEFAULT_ENDPOINT_NAME = "default"
+
+
+@dataclass(frozen=True)
+class AzureEndpoint:
+    name: str
+    weight: float
+    config: dict
+
+
+def load_endpoints(env_var: str, default_config: dict) -> list[AzureEndpoint]:
+    """
+    Reads a pool from a JSON list in `env_var`, e.g.
+    [{"name": "weu", "weight": 2, "endpoint": "...", "key": "..."}, {"name": "neu", ...}].
+    Keys an entry leaves out are taken from `default_config` (the single-resource variables),
+    so entries only need what differs. Without the variable the pool is that single resource.
+    """
+    raw = os.getenv(env_var)
+    if not raw:
+        return [AzureEndpoint(DEFAULT_ENDPOINT_NAME, 1.0, default_config)]
+    endpoints = []
+    for entry in json.loads(raw):
+        entry = dict(entry)
+        name = entry.pop("name")
+        weight = float(entry.pop("weight", 1))
+        if weight <= 0 or any(e.name == name for e in endpoints):
+            raise ValueError(f"{env_var}: endpoint {name!r} needs a unique name and a positive weight")
+        endpoints.append(AzureEndpoint(name, weight, {**default_config, **entry}))
+    if not endpoints:
+        raise ValueError(f"{env_var} is empty")
+    return endpoints
+
+
+def is_retryable(error: requests.RequestException) -> bool:
+    """Connection problems, throttling and server errors; another resource may well succeed."""
+    response = getattr(error, "response", None)
+    return response is None or response.status_code == 429 or response.status_code >= 500
+
+
+class EndpointPool:
+    """
+    Weighted choice between interchangeable Azure resources with a per-process circuit breaker:
+    after ENDPOINT_FAILURE_THRESHOLD consecutive failures an endpoint gets no new work for
+    ENDPOINT_COOLDOWN_SECONDS. After that a single further failure opens it again, a success closes it.
+    Existing jobs always go back to the endpoint they were created on (`get`).
+    """
+
+    def __init__(self, kind: str, endpoints: list[AzureEndpoint]):
+        self.kind = kind
+        self.endpoints = endpoints
+        self._by_name = {e.name: e for e in endpoints}
+        self._failures: dict[str, int] = {}
+        self._open_until: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._by_name)
+
+    def get(self, name: str) -> AzureEndpoint:
+        """The endpoint a job was created on. Jobs from before the pool existed have no name."""
+        endpoint = self._by_name.get(name or DEFAULT_ENDPOINT_NAME)
+        if endpoint is None:
+            logging.warning(f"Unknown {self.kind} endpoint {name!r}, using {self.endpoints[0].name}")
+            endpoint = self.endpoints[0]
+        return endpoint
+
+    def choose(self, exclude=()) -> AzureEndpoint:
+        """Weighted random healthy endpoint for new work; the one closest to recovery if none is healthy."""
+        now = time.monotonic()
+        candidates = [e for e in self.endpoints if e.name not in exclude] or self.endpoints
+        with self._lock:
+            healthy = [e for e in candidates if self._open_until.get(e.name, 0) <= now]
+            if not healthy:
+                return min(candidates, key=lambda e: self._open_until[e.name])
+        return random.choices(healthy, weights=[e.weight for e in healthy])[0]
+
+    def record_success(self, name: str):
+        with self._lock:
+            self._failures.pop(name, None)
+            reopened = self._open_until.pop(name, None) is not None
+        if reopened:
+            metrics.set_gauge(f"endpoints.{self.kind}.{name}.open", 0)
+            logging.info(f"{self.kind} endpoint {name} recovered")
+
+    def record_failure(self, name: str):
+        metrics.increment(f"endpoints.{self.kind}.{name}.failures")
+        with self._lock:
+            failures = self._failures.get(name, 0) + 1
+            self._failures[name] = failures
+            if failures < settings.ENDPOINT_FAILURE_THRESHOLD:
+                return
+            self._open_until[name] = time.monotonic() + settings.ENDPOINT_COOLDOWN_SECONDS
+        metrics.set_gauge(f"endpoints.{self.kind}.{name}.open", 1)
+        logging.warning(f"{self.kind} endpoint {name} failed {failures} times in a row, "
+                        f"skipping it for {settings.ENDPOINT_COOLDOWN_SECONDS}s")
+
+    def request(self, name: str, method: str, url: str, **kwargs) -> requests.Response:
+        """requests.request that feeds the endpoint's health."""
+        try:
+            response = requests.request(method, url, **kwargs)
+        except requests.RequestException:
+            self.record_failure(name)
+            raise
+        if response.status_code == 429 or response.status_code >= 500:
+            self.record_failure(name)
+        else:
+            self.record_success(name)
+        return response
+
+
+def call_with_failover(client_class, call):
+    """
+    Runs call(client) on an endpoint chosen from client_class.pool. If it fails with a retryable
+    error the call is repeated on each of the other endpoints. For stateless calls and for calls
+    that upload their own input; jobs whose input already sits in one storage account cannot move.
+    """
+    pool = client_class.pool
+    tried = []
+    while True:
+        client = client_class(pool.choose(exclude=tried).name)
+        try:
+            return call(client)
+        except requests.RequestException as e:
+            tried.append(client.endpoint_name)
+            if not is_retryable(e) or len(tried) >= len(pool.endpoints):
+                raise
+            logging.warning(f"{pool.kind} endpoint {client.endpoint_name} failed ({e}), trying another one")
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import logging
+import math
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api import metrics
+from api.azure_ai import AzurePIIRedaction
+
+SHARED_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class BoundedLRU:
+    """
+    Thread-safe LRU bounded by the total number of cached entity rows,
+    so a few huge results cannot push the worker's memory up unbounded.
+    """
+
+    def __init__(self, max_rows: int):
+        self.max_rows = max_rows
+        self._rows = 0
+        self._items: OrderedDict[str, list] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> list | None:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: list):
+        if len(value) > self.max_rows:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._rows -= len(old)
+            self._items[key] = value
+            self._rows += len(value)
+            while self._rows > self.max_rows:
+                _, evicted = self._items.popitem(last=False)
+                self._rows -= len(evicted)
+            metrics.set_gauge("entity_cache.local_rows", self._rows)
+
+
+_local = BoundedLRU(settings.ENTITY_CACHE_MAX_ROWS)
+
+
+def _cache_key(blob_url: str, etag: str) -> str:
+    # SAS query strings change on every signing, the blob path does not.
+    path = urlsplit(blob_url).path
+    return "api:entities:" + hashlib.sha256(f"{path}|{etag}".encode("utf-8")).hexdigest()
+
+
+def _clean(records: list[dict]) -> list[dict]:
+    """NaN means "no score" and is not valid JSON."""
+    for record in records:
+        score = record.get("confidenceScore")
+        if isinstance(score, float) and math.isnan(score):
+            record["confidenceScore"] = None
+    return records
+
+
+def get_entity_summary(blob_url: str, az: AzurePIIRedaction | None = None) -> tuple[list[dict], str, str]:
+    """
+    Returns the aggregated entities (EntityProcessor.aggregate_records) of a `.result.json`
+    blob, where they came from ("local", "shared" or "blob") and the blob's ETag.
+
+    The blob's ETag is read with one HEAD request; an unchanged blob is then answered from
+    the in-process LRU or the shared cache without downloading or parsing it again.
+    """
+    from azure.core import MatchConditions
+    from api.entity_processing import EntityProcessor
+
+    # without a client the blob is looked up in the default storage account
+    blob_client = (az or AzurePIIRedaction("")).get_blob_client(blob_url)
+    etag = blob_client.get_blob_properties().etag
+    key = _cache_key(blob_url, etag)
+
+    records = _local.get(key)
+    if records is not None:
+        metrics.increment("entity_cache.local_hits")
+        return records, "local", etag
+
+    records = cache.get(key)
+    if records is not None:
+        metrics.increment("entity_cache.shared_hits")
+        _local.set(key, records)
+        return records, "shared", etag
+
+    metrics.increment("entity_cache.misses")
+    # Only download the version whose ETag we just keyed on.
+    raw = blob_client.download_blob(etag=etag, match_condition=MatchConditions.IfNotModified).readall()
+    records = _clean(EntityProcessor(blob_url).load_from_dict(json.loads(raw)).aggregate_records())
+    logging.info(f"Cached {len(records)} aggregated entities for {urlsplit(blob_url).path}")
+    cache.set(key, records, timeout=SHARED_CACHE_TIMEOUT)
+    _local.set(key, records)
+    return records, "blob", etag
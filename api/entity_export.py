@@ -0,0 +1,252 @@
+import csv
+import io
+import logging
+import re
+import tempfile
+from itertools import islice
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+
+from api.entity_processing import AGGREGATED_COLUMNS
+
+# output -> (content type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "arrow": ("application/vnd.apache.arrow.file", ".arrow"),
+}
+EXPORT_CHUNK_SIZE = 64 * 1024
+ARROW_BATCH_ROWS = 10_000
+# Parquet/Arrow files spill from memory to disk above this size
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+# Cells starting with these are evaluated as formulas by spreadsheet programs
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_lines(records: list[dict]):
+    """Yields the encoded CSV one line at a time (UTF-8 with BOM so Excel picks the encoding)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> bytes:
+        line = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    buffer.write("\ufeff")
+    writer.writerow(AGGREGATED_COLUMNS)
+    yield flush()
+    for record in records:
+        writer.writerow([_csv_cell(record.get(col)) for col in AGGREGATED_COLUMNS])
+        yield flush()
+
+
+class CsvExport:
+    """
+    CSV rendered on the fly. The size is measured with a first pass over the rows,
+    so neither pass holds more than one line in memory.
+    """
+
+    def __init__(self, records: list[dict]):
+        self.records = records
+        self.size = sum(len(line) for line in _csv_lines(records))
+
+    def iter_range(self, start: int, end: int):
+        position = 0
+        for line in _csv_lines(self.records):
+            line_end = position + len(line)
+            if line_end > start:
+                yield line[max(start - position, 0):end + 1 - position]
+            if line_end > end:
+                return
+            position = line_end
+
+    def close(self):
+        pass
+
+
+def _arrow_writer(output: str, sink):
+    """Opens a Parquet or Arrow IPC writer on `sink`; returns it and a function writing one batch of records."""
+    import pyarrow as pa
+
+    schema = pa.schema([
+        ("text", pa.string()),
+        ("type", pa.string()),
+        ("entityId", pa.string()),
+        ("confidenceScore", pa.float64()),
+    ])
+    if output == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(sink, schema)
+        return writer, lambda batch: writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    writer = pa.ipc.new_file(sink, schema)
+    return writer, lambda batch: writer.write(pa.RecordBatch.from_pylist(batch, schema=schema))
+
+
+def _batches(records):
+    rows = iter(records)
+    while batch := list(islice(rows, ARROW_BATCH_ROWS)):
+        yield batch
+
+
+class _Sink:
+    """Write-only file object that keeps what was written until it is drained."""
+
+    def __init__(self):
+        self.chunks, self.position, self.closed = [], 0, False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ArrowStream:
+    """
+    Parquet or Arrow IPC file streamed while it is written, one record batch at a time.
+    The size is only known at the end, so the response has no Content-Length.
+    """
+
+    def __init__(self, records, output: str):
+        self.records = records
+        self.sink = _Sink()
+        self.writer, self.write = _arrow_writer(output, self.sink)
+
+    def __iter__(self):
+        for batch in _batches(self.records):
+            self.write(batch)
+            if chunk := self.sink.drain():
+                yield chunk
+        self.writer.close()
+        yield self.sink.drain()
+
+
+class ArrowExport:
+    """
+    Parquet or Arrow IPC file written in record batches to a spooled temporary file,
+    then streamed from it in chunks. Used for Range requests, which need the size up front.
+    """
+
+    def __init__(self, records, output: str):
+        self.file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        writer, write = _arrow_writer(output, self.file)
+        for batch in _batches(records):
+            write(batch)
+        writer.close()
+        self.size = self.file.tell()
+
+    def iter_range(self, start: int, end: int):
+        try:
+            self.file.seek(start)
+            remaining = end + 1 - start
+            while remaining > 0:
+                chunk = self.file.read(min(EXPORT_CHUNK_SIZE, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Returns the inclusive (start, end) of a single `bytes=` range, or None to send the
+    whole body (no header, or a multi-range request). Raises ValueError if unsatisfiable.
+    """
+    if not header:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def build_export_response(request, records: list[dict], output: str, blob_etag: str, filename: str) -> HttpResponse:
+    """
+    Streams the entity export. The ETag derives from the result blob's ETag, so resumed
+    downloads (Range + If-Range) continue only while the underlying result is unchanged.
+    CSV and range requests are sized first (Content-Length); a whole Parquet/Arrow file
+    is streamed batch by batch without one.
+    """
+    content_type, extension = EXPORT_FORMATS[output]
+    etag = f'"{blob_etag.strip(chr(34))}-{output}"'
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    if output != "csv" and not request.headers.get("Range"):
+        # whole Parquet/Arrow file: stream the batches as they are written
+        response = StreamingHttpResponse(ArrowStream(records, output), content_type=content_type)
+        logging.info(f"Exporting {len(records)} entities as {output} (streamed)")
+        return _export_headers(response, etag, filename, extension)
+
+    export = CsvExport(records) if output == "csv" else ArrowExport(records, output)
+    size = export.size
+
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    if not if_range or if_range == etag:
+        try:
+            byte_range = parse_range(request.headers.get("Range"), size)
+        except ValueError:
+            export.close()
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    start, end = byte_range or (0, size - 1)
+    response = StreamingHttpResponse(export.iter_range(start, end), content_type=content_type,
+                                     status=206 if byte_range else 200)
+    if byte_range:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Content-Length"] = str(max(end + 1 - start, 0))
+    logging.info(f"Exporting {len(records)} entities as {output} ({start}-{end}/{size} bytes)")
+    return _export_headers(response, etag, filename, extension)
+
+
+def _export_headers(response, etag: str, filename: str, extension: str):
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    stem = filename.rsplit(".", 1)[0].replace('"', "") or "entities"
+    response["Content-Disposition"] = f'attachment; filename="{stem}.entities{extension}"'
+    return response
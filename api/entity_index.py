@@ -0,0 +1,99 @@
+import logging
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import transaction
+from django.utils import timezone as django_timezone
+
+from api.azure_ai import AzurePIIRedaction
+from api.entity_cache import get_entity_summary
+from api.models import RedactionEntity
+
+INDEX_BATCH_SIZE = 1000
+
+SEARCH_CONTAINS = "contains"  # case-insensitive substring, trigram index
+SEARCH_WORDS = "words"        # full-text word match, tsvector index
+SEARCH_MATCHES = (SEARCH_CONTAINS, SEARCH_WORDS)
+
+
+def index_redaction_job(job) -> int:
+    """
+    Replaces the RedactionEntity rows of a succeeded RedactionJob (or RedactionJobArchive)
+    with its aggregated entities and marks the job as indexed. Returns the number of rows.
+    A result blob that no longer exists is marked as indexed with no rows.
+    """
+    from azure.core.exceptions import ResourceNotFoundError
+
+    try:
+        records, _, _ = get_entity_summary(job.entity_download_url, AzurePIIRedaction(job.endpoint_name))
+    except ResourceNotFoundError:
+        logging.warning(f"Entity result of redaction job {job.id} is gone, nothing to index")
+        records = []
+
+    text_length = RedactionEntity._meta.get_field("text").max_length
+    rows = [
+        RedactionEntity(
+            job_id=job.id,
+            profile_id=job.profile_id,
+            filename=job.filename,
+            text=record["text"][:text_length],
+            type=record["type"],
+            entity_ids=record.get("entityId") or "",
+            confidence_score=record.get("confidenceScore"),
+            job_created_at=job.created_at,
+        )
+        for record in records
+        if record.get("text") and record.get("type")
+    ]
+    with transaction.atomic():
+        RedactionEntity.objects.filter(job_id=job.id).delete()
+        RedactionEntity.objects.bulk_create(rows, batch_size=INDEX_BATCH_SIZE)
+        # .update() keeps updated_at (and the status ETag) untouched
+        type(job).objects.filter(pk=job.pk).update(entities_indexed_at=django_timezone.now())
+    logging.info(f"Indexed {len(rows)} entities of redaction job {job.id}")
+    return len(rows)
+
+
+def pending_jobs(model, reindex: bool = False):
+    qs = model.objects.filter(status="succeeded").exclude(entity_download_url="")
+    if not reindex:
+        qs = qs.filter(entities_indexed_at__isnull=True)
+    return qs.order_by("created_at", "id")
+
+
+def index_pending_jobs(model, limit: int | None = None, reindex: bool = False) -> tuple[int, int]:
+    """
+    Indexes succeeded jobs of `model` that were not indexed yet. Returns (jobs, rows).
+    Failures are logged and retried on the next call.
+    """
+    qs = pending_jobs(model, reindex)
+    if limit is not None:
+        qs = qs[:limit]
+    jobs = rows = 0
+    for job in qs.iterator():
+        try:
+            rows += index_redaction_job(job)
+            jobs += 1
+        except Exception:
+            logging.exception(f"Indexing entities of {model.__name__} {job.id} failed")
+    return jobs, rows
+
+
+def search_entities(q: str, entity_type: str, match: str = SEARCH_CONTAINS, cursor: int | None = None,
+                    limit: int = 50) -> tuple[list, int | None]:
+    """
+    Returns one page of RedactionEntity rows (newest first) and the cursor of the next page.
+    Keyset pagination on id: no OFFSET and no COUNT(*), so every page costs the same.
+    """
+    qs = RedactionEntity.objects.all()
+    if q and match == SEARCH_WORDS:
+        qs = qs.annotate(search=SearchVector("text", config="simple")).filter(
+            search=SearchQuery(q, config="simple", search_type="websearch"))
+    elif q:
+        qs = qs.filter(text__icontains=q)
+    if entity_type:
+        qs = qs.filter(type=entity_type)
+    if cursor is not None:
+        qs = qs.filter(id__lt=cursor)
+    page = list(qs.order_by("-id")[:limit + 1])
+    next_cursor = page[limit - 1].id if len(page) > limit else None
+    return page[:limit], next_cursor
@@ -1,17 +1,243 @@
 import json
-import pandas as pd
+import math
 from pathlib import Path
+from typing import TYPE_CHECKING
 import logging
-logging.basicConfig(level=logging.INFO)
 
-pd.set_option('display.max_columns', 1000)
+# pandas is only imported once a PandasEntityBackend is needed, so small results
+# (and workers that never see a large one) do not pay for it.
+if TYPE_CHECKING:
+    import pandas as pd
+
+ENTITY_COLUMNS = ["text", "type", "entityId", "confidenceScore"]
+AGGREGATED_COLUMNS = ["text", "type", "entityId", "confidenceScore"]
+
+# Inputs with at most this many entities use the pure-Python backend.
+SMALL_INPUT_THRESHOLD = 2000
+
+
+def _pandas():
+    import pandas as pd
+    pd.set_option('display.max_columns', 1000)
+    return pd
+
+
+def _is_missing(value) -> bool:
+    if value is None:
+        return True
+    try:
+        return value != value  # NaN / pd.NA
+    except TypeError:
+        return True
+
+
+def _key_label(value) -> str:
+    """String form of a text/type key; every kind of missing value maps to "None"."""
+    return "None" if _is_missing(value) else str(value)
+
+
+class RecordEntityBackend:
+    """
+    Column arrays in plain lists. Mirrors PandasEntityBackend for the few dozen
+    entities a typical redaction result has, where DataFrame overhead dominates.
+    """
+    name = "records"
+
+    def __init__(self, columns: dict[str, list] | None = None):
+        self.columns = columns or {col: [] for col in ENTITY_COLUMNS}
+
+    @classmethod
+    def from_entities(cls, entities: list[dict]) -> "RecordEntityBackend":
+        return cls({col: [e.get(col) for e in entities] for col in ENTITY_COLUMNS})
+
+    def __len__(self) -> int:
+        return len(self.columns["text"])
+
+    def filter(self, types: list[str], min_scores: list[float]) -> "RecordEntityBackend":
+        min_score = max(min_scores) if min_scores else None
+        keep = [
+            i for i, (entity_type, score) in enumerate(zip(self.columns["type"], self.columns["confidenceScore"]))
+            if all(entity_type == t for t in types)
+            and (min_score is None or (not _is_missing(score) and score >= min_score))
+        ]
+        return RecordEntityBackend({col: [values[i] for i in keep] for col, values in self.columns.items()})
+
+    def assign_unique_entity_ids(self) -> "RecordEntityBackend":
+        mapping = {}
+        counters = {}
+        unique_ids = []
+        for text, entity_type in zip(self.columns["text"], self.columns["type"]):
+            key = (_key_label(text), _key_label(entity_type))
+            if key not in mapping:
+                upper = key[1].upper()
+                counters[upper] = counters.get(upper, 0) + 1
+                mapping[key] = f"[{upper}-{counters[upper]}]"
+            unique_ids.append(mapping[key])
+        return RecordEntityBackend({**self.columns, "uniqueEntityId": unique_ids})
+
+    def aggregate_records(self) -> list[dict]:
+        groups = {}
+        for text, entity_type, entity_id, score in zip(*(self.columns[col] for col in ENTITY_COLUMNS)):
+            if _is_missing(text) or _is_missing(entity_type):
+                continue
+            ids, scores = groups.setdefault((text, entity_type), (set(), []))
+            if not _is_missing(entity_id):
+                ids.add(str(entity_id))
+            if not _is_missing(score):
+                scores.append(score)
+        return [
+            {
+                "text": text,
+                "type": entity_type,
+                "entityId": ",".join(sorted(ids)),
+                "confidenceScore": sum(scores) / len(scores) if scores else math.nan,
+            }
+            for (text, entity_type), (ids, scores) in sorted(groups.items(), key=lambda item: item[0])
+        ]
+
+    def to_records(self) -> list[dict]:
+        names = list(self.columns)
+        return [dict(zip(names, row)) for row in zip(*self.columns.values())]
+
+    def to_frame(self) -> "pd.DataFrame":
+        return _pandas().DataFrame(self.columns, columns=list(self.columns))
+
+
+class PandasEntityBackend:
+    name = "pandas"
+
+    def __init__(self, df: "pd.DataFrame | None" = None):
+        self.df = df if df is not None else _pandas().DataFrame(columns=ENTITY_COLUMNS)
+
+    @classmethod
+    def from_entities(cls, entities: list[dict]) -> "PandasEntityBackend":
+        pd = _pandas()
+        df = pd.DataFrame(entities)
+
+        for col in ENTITY_COLUMNS:
+            if col not in df:
+                df[col] = pd.NA
+
+        return cls(df[ENTITY_COLUMNS])
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def filter(self, types: list[str], min_scores: list[float]) -> "PandasEntityBackend":
+        """Runs all filters as one combined mask."""
+        import numpy as np
+        df = self.df
+        if df.empty or not (types or min_scores):
+            return self
+        mask = np.ones(len(df), dtype=bool)
+        if types:
+            column = df["type"].to_numpy()
+            for entity_type in types:
+                mask &= column == entity_type
+        if min_scores:
+            mask &= (df["confidenceScore"] >= max(min_scores)).to_numpy(dtype=bool, na_value=False)
+        return PandasEntityBackend(df[mask])
+
+    def assign_unique_entity_ids(self) -> "PandasEntityBackend":
+        df = self.df.copy()
+        if df.empty:
+            df["uniqueEntityId"] = _pandas().Series(dtype="string")
+            return PandasEntityBackend(df)
+
+        # Reihenfolge beibehalten → cumcount wäre falsch!
+        keys = df[["text", "type"]].map(_key_label)
+
+        # eindeutige Gruppen in Erscheinungs-Reihenfolge
+        unique_keys = (
+            keys.drop_duplicates()
+            .reset_index(drop=True)
+        )
+
+        # Zähler pro Typ (PERSON, ORGANIZATION, ...)
+        counters = {}
+
+        def make_id(row):
+            entity_type = row["type"].upper()
+            counters.setdefault(entity_type, 0)
+            counters[entity_type] += 1
+            return f"[{entity_type}-{counters[entity_type]}]"
+
+        unique_keys["uniqueEntityId"] = unique_keys.apply(make_id, axis=1)
+
+        # Mapping zurück auf das Original-DF
+        mapping = {
+            (row.text, row.type): row.uniqueEntityId
+            for row in unique_keys.itertuples()
+        }
+
+        df["uniqueEntityId"] = [
+            mapping[(t, ty)] for t, ty in zip(keys["text"], keys["type"])
+        ]
+        return PandasEntityBackend(df)
+
+    def aggregate_frame(self) -> "pd.DataFrame":
+        """
+        Vectorized form of groupby(text, type) with entityId -> ",".join(sorted(set(ids))) and
+        confidenceScore -> mean: ids are de-duplicated and sorted once for the whole frame,
+        then joined per group, instead of running a Python lambda per group.
+        """
+        pd = _pandas()
+        df = self.df
+        if df.empty:
+            return pd.DataFrame(columns=AGGREGATED_COLUMNS)
+
+        keys = ["text", "type"]
+        scores = df.groupby(keys)["confidenceScore"].mean()
+
+        ids = df[keys + ["entityId"]].dropna(subset=["entityId"])
+        ids = ids.assign(entityId=ids["entityId"].astype(str)).drop_duplicates()
+        ids = ids.sort_values("entityId", kind="stable")
+        joined = ids.groupby(keys, sort=False)["entityId"].agg(",".join)
+
+        aggregated = pd.DataFrame({"entityId": joined.reindex(scores.index, fill_value=""), "confidenceScore": scores})
+        return aggregated.reset_index()
+
+    def aggregate_records(self) -> list[dict]:
+        return self.aggregate_frame().to_dict("records")
+
+    def to_records(self) -> list[dict]:
+        return self.df.astype(object).where(self.df.notna(), None).to_dict("records") if len(self.df) else []
+
+    def to_frame(self) -> "pd.DataFrame":
+        return self.df
+
+
+BACKENDS = {
+    RecordEntityBackend.name: RecordEntityBackend,
+    PandasEntityBackend.name: PandasEntityBackend,
+}
+
 
 class EntityProcessor:
-    ENTITY_COLUMNS = ["text", "type", "entityId", "confidenceScore"]
+    ENTITY_COLUMNS = ENTITY_COLUMNS
 
-    def __init__(self, path: str | Path):
+    def __init__(self, path: str | Path, backend: str | None = None):
+        """
+        backend: "records", "pandas" or None to pick by input size (SMALL_INPUT_THRESHOLD).
+        """
+        if backend is not None and backend not in BACKENDS:
+            raise ValueError(f"Unknown entity backend {backend!r}, expected one of {list(BACKENDS)}")
         self.path = Path(path)
-        self.df: pd.DataFrame = pd.DataFrame(columns=self.ENTITY_COLUMNS)
+        self.backend_name = backend
+        self._data = RecordEntityBackend()
+
+    @property
+    def backend(self) -> str:
+        return self._data.name
+
+    @property
+    def df(self) -> "pd.DataFrame":
+        """The entities as a DataFrame (a fresh copy when the records backend is in use)."""
+        return self._data.to_frame()
+
+    @df.setter
+    def df(self, value: "pd.DataFrame"):
+        self._data = PandasEntityBackend(value)
 
     # ---------- Loading ----------
 
@@ -27,7 +253,7 @@ class EntityProcessor:
 
         return self.load_from_dict(data)
 
-    
+
     def load_from_dict(self, data: dict) -> "EntityProcessor":
         """
         Load entities from already parsed JSON dict.
@@ -46,88 +272,108 @@ class EntityProcessor:
             self._empty()
             return self
 
-        df = pd.DataFrame(entities)
-
-        for col in self.ENTITY_COLUMNS:
-            if col not in df:
-                df[col] = pd.NA
-
-        self.df = df[self.ENTITY_COLUMNS]
+        backend = self.backend_name or ("records" if len(entities) <= SMALL_INPUT_THRESHOLD else "pandas")
+        self._data = BACKENDS[backend].from_entities(entities)
         return self
 
-    
-    def aggregate_entity_ids_by_text(self) -> pd.DataFrame:
+
+    def aggregate_entity_ids_by_text(self) -> "pd.DataFrame":
         """
         Aggregates entityIds by text, joining multiple IDs with a comma. Returns a new DataFrame of columns: text, type, entityIds, confidenceScore (mean).
         """
-        if self.df.empty:
+        if not len(self._data):
             logging.warning("aggregate_entity_ids_by_text called on empty DataFrame")
-            return pd.DataFrame(
-            columns=["text", "type", "entityId", "confidenceScore"]
-            )
+            return _pandas().DataFrame(columns=AGGREGATED_COLUMNS)
+
+        if isinstance(self._data, PandasEntityBackend):
+            aggregated = self._data.aggregate_frame()
+        else:
+            aggregated = _pandas().DataFrame(self._data.aggregate_records(), columns=AGGREGATED_COLUMNS)
+        logging.info("Aggregated entityIds by text, resulting in %d unique texts", len(aggregated))
+        return aggregated
 
-        aggregated = self.df.groupby(["text", "type"]).agg({
-            "entityId": lambda ids: ",".join(sorted(set(ids.dropna().astype(str)))),
-            "confidenceScore": "mean"}).reset_index()
+    def aggregate_records(self) -> list[dict]:
+        """
+        Same as aggregate_entity_ids_by_text, as a list of dicts. Does not need pandas
+        when the records backend is in use.
+        """
+        if not len(self._data):
+            logging.warning("aggregate_records called on empty entities")
+            return []
+        aggregated = self._data.aggregate_records()
         logging.info("Aggregated entityIds by text, resulting in %d unique texts", len(aggregated))
         return aggregated
-    
+
+    def to_records(self) -> list[dict]:
+        return self._data.to_records()
+
     def assign_unique_entity_ids(self) -> "EntityProcessor":
         """
         Adds a stable uniqueEntityId column based on (text, type).
         Same text+type will always receive the same ID.
         """
-        if self.df.empty:
+        if not len(self._data):
             logging.warning("assign_unique_entity_ids called on empty DataFrame")
-            self.df["uniqueEntityId"] = pd.Series(dtype="string")
-            return self
+        self._data = self._data.assign_unique_entity_ids()
+        if len(self._data):
+            logging.info("Assigned uniqueEntityId to %d entities", len(self._data))
+        return self
 
-        # Reihenfolge beibehalten → cumcount wäre falsch!
-        keys = self.df[["text", "type"]].astype(str)
+    def filter_by_type(self, entity_type: str) -> "EntityProcessor":
+        self._data = self._data.filter([entity_type], [])
+        return self
 
-        # eindeutige Gruppen in Erscheinungs-Reihenfolge
-        unique_keys = (
-            keys.drop_duplicates()
-            .reset_index(drop=True)
-        )
+    def filter_by_confidence(self, min_score: float) -> "EntityProcessor":
+        self._data = self._data.filter([], [min_score])
+        return self
 
-        # Zähler pro Typ (PERSON, ORGANIZATION, ...)
-        counters = {}
+    def lazy(self) -> "EntityQuery":
+        """
+        Starts a lazy query on the loaded entities. Filters are recorded and run as one
+        combined pass when the query is collected or aggregated.
+        """
+        return EntityQuery(self)
 
-        def make_id(row):
-            entity_type = row["type"].upper()
-            counters.setdefault(entity_type, 0)
-            counters[entity_type] += 1
-            return f"[{entity_type}-{counters[entity_type]}]"
+    def _empty(self):
+        self._data = BACKENDS[self.backend_name or "records"]()
 
-        unique_keys["uniqueEntityId"] = unique_keys.apply(make_id, axis=1)
 
-        # Mapping zurück auf das Original-DF
-        mapping = {
-            (row.text, row.type): row.uniqueEntityId
-            for row in unique_keys.itertuples()
-        }
+class EntityQuery:
+    """
+    Lazy counterpart of the EntityProcessor filters:
 
-        self.df["uniqueEntityId"] = [
-            mapping[(t, ty)] for t, ty in zip(self.df["text"], self.df["type"])
-        ]
+        EntityProcessor(path).load().lazy().filter_by_type("Person").filter_by_confidence(0.8).aggregate_entity_ids_by_text()
 
-        logging.info("Assigned uniqueEntityId to %d entities", len(self.df))
+    gives the same result as the eager chain but builds no intermediate frames.
+    """
 
-        return self
-    
-    def filter_by_type(self, entity_type: str) -> "EntityProcessor":
-        if not self.df.empty:
-            self.df = self.df[self.df["type"] == entity_type]
+    def __init__(self, processor: EntityProcessor):
+        self._processor = processor
+        self._types: list[str] = []
+        self._min_scores: list[float] = []
+
+    def filter_by_type(self, entity_type: str) -> "EntityQuery":
+        self._types.append(entity_type)
         return self
 
-    def filter_by_confidence(self, min_score: float) -> "EntityProcessor":
-        if not self.df.empty:
-            self.df = self.df[self.df["confidenceScore"] >= min_score]
+    def filter_by_confidence(self, min_score: float) -> "EntityQuery":
+        self._min_scores.append(min_score)
         return self
-    
-    def _empty(self):
-        self.df = pd.DataFrame(columns=self.ENTITY_COLUMNS)
+
+    def collect(self) -> "pd.DataFrame":
+        """Runs the recorded filters in one pass and returns the matching entities."""
+        return self._run().df
+
+    def aggregate_entity_ids_by_text(self) -> "pd.DataFrame":
+        return self._run().aggregate_entity_ids_by_text()
+
+    def aggregate_records(self) -> list[dict]:
+        return self._run().aggregate_records()
+
+    def _run(self) -> EntityProcessor:
+        result = EntityProcessor(self._processor.path, self._processor.backend_name)
+        result._data = self._processor._data.filter(self._types, self._min_scores)
+        return result
 
 # df = (
 #     EntityProcessor("api/utils/The_King’s_Challenge.result.json")
@@ -136,6 +382,3 @@ class EntityProcessor:
 #     )
 
 # print(df.head(10))
-
-
-
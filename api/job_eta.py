@@ -0,0 +1,117 @@
+import bisect
+import logging
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone as django_timezone
+
+from api.models import JobDurationStat, RedactionJob, TranslationJob
+
+SERVICES = {TranslationJob: "translation", RedactionJob: "redaction"}
+
+# Upper bounds (bytes) of the size buckets; larger files fall into the last bucket.
+SIZE_BUCKET_BOUNDS = [256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024]
+UNKNOWN_SIZE_BUCKET = -1
+STATS_CACHE_SECONDS = 60
+
+# Estimates fall back from the exact key to ever coarser groups until one has enough samples.
+FALLBACK_LEVELS = [
+    ("target_lang", "file_type", "size_bucket"),
+    ("file_type", "size_bucket"),
+    ("file_type",),
+    (),
+]
+
+
+def size_bucket(size: int | None) -> int:
+    if size is None:
+        return UNKNOWN_SIZE_BUCKET
+    return bisect.bisect_left(SIZE_BUCKET_BOUNDS, size)
+
+
+def file_type(filename: str) -> str:
+    return os.path.splitext(filename)[1].lower()[:16]
+
+
+def stat_key(job) -> dict:
+    return {
+        "service": SERVICES[type(job)],
+        "target_lang": getattr(job, "target_lang", ""),
+        "file_type": file_type(job.filename),
+        "size_bucket": size_bucket(job.file_size),
+    }
+
+
+def record_duration(job):
+    """
+    Folds the creation-to-terminal time of a succeeded job into the rolling mean of its key:
+    mean += alpha * (duration - mean), as one UPDATE so concurrent pollers cannot lose samples.
+    """
+    key = stat_key(job)
+    seconds = max((job.updated_at - job.created_at).total_seconds(), 0.0)
+    alpha = settings.JOB_DURATION_EWMA_ALPHA
+
+    def update() -> int:
+        return JobDurationStat.objects.filter(**key).update(
+            samples=F("samples") + 1, mean_seconds=F("mean_seconds") + alpha * (seconds - F("mean_seconds")))
+
+    if update():
+        return
+    try:
+        with transaction.atomic():
+            JobDurationStat.objects.create(samples=1, mean_seconds=seconds, **key)
+    except IntegrityError:
+        # another poller created the row in between
+        update()
+
+
+def _service_stats(service: str) -> list[dict]:
+    cache_key = f"api:job-eta:{service}"
+    rows = cache.get(cache_key)
+    if rows is None:
+        rows = list(JobDurationStat.objects.filter(service=service)
+                    .values("target_lang", "file_type", "size_bucket", "samples", "mean_seconds"))
+        cache.set(cache_key, rows, STATS_CACHE_SECONDS)
+    return rows
+
+
+def estimate_seconds(job) -> float:
+    """Expected creation-to-terminal time of the job (sample-weighted mean of the first level with enough samples)."""
+    key = stat_key(job)
+    rows = _service_stats(key["service"])
+    for fields in FALLBACK_LEVELS:
+        matching = [row for row in rows if all(row[f] == key[f] for f in fields)]
+        samples = sum(row["samples"] for row in matching)
+        if samples >= settings.JOB_DURATION_MIN_SAMPLES:
+            return sum(row["mean_seconds"] * row["samples"] for row in matching) / samples
+    return float(settings.JOB_DURATION_DEFAULT_SECONDS)
+
+
+def estimated_completion(job):
+    return job.created_at + timedelta(seconds=estimate_seconds(job))
+
+
+def poll_delay(job, now=None) -> int:
+    """
+    Seconds until the job is worth checking again: until its estimated completion while that lies
+    ahead, then half the time it is overdue (backing off as the estimate proves too low).
+    Bounded by JOB_POLL_MIN_SECONDS and JOB_POLL_MAX_SECONDS.
+    """
+    now = now or django_timezone.now()
+    remaining = (estimated_completion(job) - now).total_seconds()
+    delay = remaining if remaining > 0 else -remaining / 2
+    return int(min(max(delay, settings.JOB_POLL_MIN_SECONDS), settings.JOB_POLL_MAX_SECONDS))
+
+
+def record_terminal(job):
+    """Called after a terminal transition; only succeeded jobs say how long the work takes."""
+    if job.status != "succeeded":
+        return
+    try:
+        record_duration(job)
+    except Exception:
+        logging.exception(f"Recording the duration of job {job.id} failed")
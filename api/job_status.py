@@ -0,0 +1,169 @@
+import logging
+import time
+
+import requests
+from django.db import router, transaction
+from django.utils import timezone as django_timezone
+
+from api import metrics
+from api.azure_ai import AzureDocumentTranslator, AzurePIIRedaction
+from api.endpoint_pool import is_retryable
+from api.job_eta import record_terminal
+from api.models import RedactionJob, TranslationJob
+from api.webhooks import enqueue_job_event
+
+SAS_TTL_MINUTES = 60
+
+# No jumping back in status - useful for UI display
+PROGRESS_ORDER = ["notStarted", "running", "succeeded", "failed", "canceled"]
+TERMINAL_STATUSES = {"succeeded", "failed", "canceled"}
+
+AZURE_STATUS_MAP = {
+    "notstarted": "notStarted",
+    "running": "running",
+    "cancelling": "running",
+    "succeeded": "succeeded",
+    "failed": "failed",
+    "cancelled": "canceled"
+}
+
+
+# The state machine: a job may move to a status from any non-terminal status before it
+# in PROGRESS_ORDER. Terminal statuses never change again.
+ALLOWED_PREDECESSORS = {
+    status: [p for p in PROGRESS_ORDER[:i] if p not in TERMINAL_STATUSES]
+    for i, status in enumerate(PROGRESS_ORDER)
+}
+
+
+def is_monotone(old_status: str, new_status: str) -> bool:
+    try:
+        return PROGRESS_ORDER.index(new_status) >= PROGRESS_ORDER.index(old_status)
+    except ValueError:
+        return False
+
+
+def map_azure_status(operation_status: dict, current_status: str) -> str:
+    azure_status = (operation_status.get('status') or '').lower()
+    return AZURE_STATUS_MAP.get(azure_status, current_status)
+
+
+def job_etag(job) -> str:
+    """
+    Strong ETag for a job's status payload. updated_at only moves when the job
+    is actually written, so unchanged polls produce the same tag.
+    """
+    return f'"{job.status}-{int(job.updated_at.timestamp() * 1_000_000)}"'
+
+
+def transition_job(job, new_status: str, fields: dict | None = None) -> bool:
+    """
+    Moves the job to `new_status` with one conditional
+    UPDATE ... SET <status, updated_at, fields> WHERE id = ... AND status IN (<allowed predecessors>).
+    Only the given columns are written. For terminal states the webhook event is recorded in the
+    same transaction, and afterwards the job's duration is folded into api.job_eta's model.
+    If another poller got there first nothing is written, `job` is reloaded and False is returned.
+    """
+    values = {"status": new_status, "updated_at": django_timezone.now(), **(fields or {})}
+    with transaction.atomic():
+        # .update() bypasses auto_now, hence updated_at above
+        updated = type(job).objects.filter(
+            pk=job.pk, status__in=ALLOWED_PREDECESSORS.get(new_status, [])
+        ).update(**values)
+        if updated:
+            for name, value in values.items():
+                setattr(job, name, value)
+            if new_status in TERMINAL_STATUSES:
+                enqueue_job_event(job)
+    if not updated:
+        metrics.increment("job_status.conflicts")
+        # from the primary: `job` may have been read from a lagging replica
+        job.refresh_from_db(using=router.db_for_write(type(job), instance=job))
+        return False
+    metrics.increment("job_status.transitions")
+    if new_status in TERMINAL_STATUSES:
+        record_terminal(job)
+    return True
+
+
+def _poll_fields(job, operation: str, az, started: float) -> dict:
+    # Only transitions are logged; unchanged polls are just counted, so log volume does not grow with polling.
+    return {"job_id": str(job.id), "operation": operation, "status": job.status, "endpoint": az.endpoint_name,
+            "duration_ms": round((time.monotonic() - started) * 1000)}
+
+
+def _poll_operation(job, az) -> dict | None:
+    """
+    Azure's status of the job's operation, or None if this poll failed. Throttling, server and
+    connection errors are left for the next poll; any other error fails the job.
+    """
+    try:
+        return az.get_operation_status(job.operation_location)
+    except requests.RequestException as e:
+        if is_retryable(e):
+            metrics.increment("job_status.poll_errors")
+            logging.warning(f"Polling job {job.id} failed, retrying later: {e}")
+        else:
+            transition_job(job, "failed", {"error_message": f"Azure polling error: {str(e)}"})
+        return None
+
+
+def refresh_translation_job(job: TranslationJob) -> TranslationJob:
+    """
+    Polls Azure for a non-terminal translation job and saves it only if something changed.
+    """
+    if job.status in TERMINAL_STATUSES:
+        return job
+
+    metrics.increment("job_status.polls")
+    az = AzureDocumentTranslator(job.endpoint_name)
+    started = time.monotonic()
+    op = _poll_operation(job, az)
+    if op is None:
+        return job
+
+    mapped = map_azure_status(op, job.status)
+    if mapped == job.status or not is_monotone(job.status, mapped):
+        metrics.increment("job_status.unchanged")
+        return job
+
+    fields = {}
+    # Generate SAS only once when first succeeded and not already existing
+    if mapped == "succeeded" and not job.download_url:
+        fields["download_url"], fields["download_expires_at"] = az.build_sas_url(job.target_container_url, minutes_valid=SAS_TTL_MINUTES)
+    if transition_job(job, mapped, fields):
+        logging.info(f"Translation job {job.id} moved to {job.status}",
+                     extra=_poll_fields(job, "translation.poll", az, started))
+    return job
+
+
+def refresh_redaction_job(job: RedactionJob) -> RedactionJob:
+    """
+    Polls Azure for a non-terminal redaction job and saves it only if something changed.
+    """
+    if job.status in TERMINAL_STATUSES:
+        return job
+
+    metrics.increment("job_status.polls")
+    az = AzurePIIRedaction(job.endpoint_name)
+    started = time.monotonic()
+    op = _poll_operation(job, az)
+    if op is None:
+        return job
+
+    mapped = map_azure_status(op, job.status)
+    if mapped == job.status or not is_monotone(job.status, mapped):
+        metrics.increment("job_status.unchanged")
+        return job
+
+    fields = {}
+    # Generate SAS only once when first succeeded and not already existing
+    if mapped == "succeeded" and not job.download_url:
+        redacted_file_url, entities_json_url = az.get_target_blob_urls(op)
+        fields["target_blob_url"] = redacted_file_url
+        fields["download_url"], fields["download_expires_at"] = az.build_sas_url(redacted_file_url, minutes_valid=SAS_TTL_MINUTES, as_attachment=False)
+        fields["entity_download_url"], fields["entity_expires_at"] = az.build_sas_url(entities_json_url, minutes_valid=SAS_TTL_MINUTES, as_attachment=True)
+    if transition_job(job, mapped, fields):
+        logging.info(f"Redaction job {job.id} moved to {job.status}",
+                     extra=_poll_fields(job, "redaction.poll", az, started))
+    return job
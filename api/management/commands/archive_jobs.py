@@ -0,0 +1,62 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone as django_timezone
+
+from api.models import RedactionJob, RedactionJobArchive, TranslationJob, TranslationJobArchive
+
+ARCHIVE_TARGETS = [
+    (TranslationJob, TranslationJobArchive),
+    (RedactionJob, RedactionJobArchive),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves jobs older than JOB_ARCHIVE_AFTER_DAYS from the hot job tables into the archive "
+        "tables. Every batch is copied and deleted in one short transaction, oldest first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.JOB_ARCHIVE_AFTER_DAYS,
+                            help="Archive jobs created more than this many days ago.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--pause", type=float, default=0.0,
+                            help="Seconds to sleep between batches to limit load on the database.")
+
+    def handle(self, *args, **options):
+        cutoff = django_timezone.now() - timedelta(days=options["days"])
+        self.stdout.write(f"Archiving jobs created before {cutoff.isoformat()}")
+        for model, archive_model in ARCHIVE_TARGETS:
+            self._archive_model(model, archive_model, cutoff, options)
+
+    def _archive_model(self, model, archive_model, cutoff, options):
+        fields = [f.attname for f in model._meta.concrete_fields]
+        started = time.monotonic()
+        moved = 0
+
+        while True:
+            with transaction.atomic():
+                # Moved rows leave the hot table, so the oldest remaining rows are always next.
+                rows = list(
+                    model.objects.filter(created_at__lt=cutoff)
+                    .order_by("created_at", "id")
+                    .values(*fields)[:options["batch_size"]]
+                )
+                if not rows:
+                    break
+                # ignore_conflicts: a row copied by an interrupted earlier run is simply kept.
+                archive_model.objects.bulk_create([archive_model(**row) for row in rows], ignore_conflicts=True)
+                model.objects.filter(pk__in=[row["id"] for row in rows]).delete()
+
+            moved += len(rows)
+            elapsed = max(time.monotonic() - started, 1e-6)
+            logging.info(f"{model.__name__}: archived {moved} rows ({moved / elapsed:.0f}/s)")
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        self.stdout.write(f"Archived {moved} {model.__name__} rows in {time.monotonic() - started:.1f}s")
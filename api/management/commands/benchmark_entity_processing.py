@@ -0,0 +1,72 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.entity_processing import ENTITY_COLUMNS, EntityProcessor, _pandas
+
+FIRST_NAMES = ["Anna", "Lukas", "Mara", "Jonas", "Lea", "Felix", "Sofia", "Elias", "Emma", "Paul"]
+LAST_NAMES = ["Bauer", "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker", "Koch"]
+TYPES = ["Person", "Organization", "Email", "Address", None]
+
+
+def synthetic_result(count: int, rng: random.Random) -> dict:
+    """A `.result.json`-shaped dict with missing texts, ids and scores, like real results have."""
+    return {"entities": [
+        {"text": rng.choice([f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i % 100}", None]),
+         "type": rng.choice(TYPES),
+         "entityId": rng.choice([f"[P-{i % 997}]", None, i % 13]),
+         "confidenceScore": rng.choice([rng.random(), None])}
+        for i in range(count)
+    ]}
+
+
+def old_path(data: dict, entity_type: str, min_score: float):
+    """The previous implementation: a materialized frame per filter and a Python lambda per group."""
+    pd = _pandas()
+    df = pd.DataFrame([e for e in data["entities"] if isinstance(e, dict)])
+    for col in ENTITY_COLUMNS:
+        if col not in df:
+            df[col] = pd.NA
+    df = df[ENTITY_COLUMNS]
+    df = df[df["type"] == entity_type]
+    df = df[df["confidenceScore"] >= min_score]
+    return df.groupby(["text", "type"]).agg({
+        "entityId": lambda ids: ",".join(sorted(set(ids.dropna().astype(str)))),
+        "confidenceScore": "mean"}).reset_index()
+
+
+class Command(BaseCommand):
+    help = (
+        "Times filter + aggregate of EntityProcessor on synthetic results (10k, 100k and 1M entities by default): "
+        "the previous DataFrame path, the eager chain and the lazy fused query."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10000,100000,1000000")
+        parser.add_argument("--runs", type=int, default=3, help="Timed runs per size and path; the median is reported.")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        paths = {
+            "old": lambda data: old_path(data, "Person", 0.5),
+            "eager": lambda data: (EntityProcessor("benchmark").load_from_dict(data)
+                                   .filter_by_type("Person").filter_by_confidence(0.5).aggregate_entity_ids_by_text()),
+            "lazy": lambda data: (EntityProcessor("benchmark").load_from_dict(data).lazy()
+                                  .filter_by_type("Person").filter_by_confidence(0.5).aggregate_entity_ids_by_text()),
+        }
+        for size in (int(s) for s in options["sizes"].split(",")):
+            data = synthetic_result(size, rng)
+            for run in paths.values():
+                run({"entities": data["entities"][:100]})  # imports and warm-up
+            line = [f"  {size:>9} entities"]
+            for name, run in paths.items():
+                timings = []
+                for _ in range(options["runs"]):
+                    started = time.perf_counter()
+                    run(data)
+                    timings.append((time.perf_counter() - started) * 1000)
+                line.append(f"{name} {statistics.median(timings):9.1f} ms")
+            self.stdout.write("  ".join(line))
@@ -0,0 +1,97 @@
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone as django_timezone
+
+from api.entity_index import SEARCH_CONTAINS, SEARCH_WORDS, search_entities
+from api.models import Profile, RedactionEntity
+
+FIRST_NAMES = ["Anna", "Lukas", "Mara", "Jonas", "Lea", "Felix", "Sofia", "Elias", "Emma", "Paul",
+               "Mia", "Noah", "Hannah", "Ben", "Lina", "Finn", "Clara", "Leon", "Ida", "Theo"]
+LAST_NAMES = ["Bauer", "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker", "Hoffmann",
+              "Schulz", "Koch", "Richter", "Klein", "Wolf", "Neumann", "Schwarz", "Zimmermann", "Braun", "Krüger"]
+ORG_SUFFIXES = ["GmbH", "AG", "KG", "Stiftung", "e.V.", "Holding"]
+ENTITY_TYPES = ["Person", "Organization", "Email", "PhoneNumber", "Address"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds RedactionEntity with deterministic synthetic rows, times the search queries the "
+        "/api/entities/ endpoint runs, and removes the rows again. Meant for a Postgres dev database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--queries", type=int, default=50, help="Timed queries per query kind.")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded rows afterwards.")
+
+    def handle(self, *args, **options):
+        profile = Profile.objects.order_by("id").first()
+        if profile is None:
+            raise CommandError("Create at least one user profile before seeding.")
+        rng = random.Random(options["seed"])
+        job_id = uuid.UUID(int=rng.getrandbits(128))
+
+        started = time.monotonic()
+        self._seed(rng, profile, job_id, options["rows"], options["batch_size"])
+        self.stdout.write(f"Seeded {options['rows']} entities in {time.monotonic() - started:.1f}s")
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {RedactionEntity._meta.db_table}")
+
+        try:
+            self._run_queries(rng, options["queries"])
+        finally:
+            if not options["keep"]:
+                deleted, _ = RedactionEntity.objects.filter(job_id=job_id).delete()
+                self.stdout.write(f"Removed {deleted} seeded entities")
+
+    def _seed(self, rng, profile, job_id, rows, batch_size):
+        now = django_timezone.now()
+        for start in range(0, rows, batch_size):
+            batch = []
+            for i in range(start, min(start + batch_size, rows)):
+                entity_type = rng.choice(ENTITY_TYPES)
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                if entity_type == "Person":
+                    text = f"{first} {last}"
+                elif entity_type == "Organization":
+                    text = f"{last} {rng.choice(ORG_SUFFIXES)}"
+                elif entity_type == "Email":
+                    text = f"{first.lower()}.{last.lower()}{rng.randint(1, 9999)}@example.com"
+                elif entity_type == "PhoneNumber":
+                    text = f"+49 {rng.randint(100, 999)} {rng.randint(1000000, 9999999)}"
+                else:
+                    text = f"{last}straße {rng.randint(1, 200)}, {rng.randint(10000, 99999)} Berlin"
+                batch.append(RedactionEntity(
+                    job_id=job_id, profile=profile, filename=f"benchmark-{i // 500}.pdf", text=text,
+                    type=entity_type, entity_ids=str(i), confidence_score=rng.random(), job_created_at=now,
+                ))
+            RedactionEntity.objects.bulk_create(batch)
+
+    def _run_queries(self, rng, queries):
+        _, cursor = search_entities("", "Person")
+        kinds = {
+            "contains": lambda: search_entities(rng.choice(LAST_NAMES)[1:6], "", SEARCH_CONTAINS),
+            "contains+type": lambda: search_entities(rng.choice(LAST_NAMES), "Organization", SEARCH_CONTAINS),
+            "words": lambda: search_entities(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", "", SEARCH_WORDS),
+            "type": lambda: search_entities("", rng.choice(ENTITY_TYPES), SEARCH_CONTAINS),
+            "second page": lambda: search_entities(rng.choice(FIRST_NAMES), "", SEARCH_CONTAINS, cursor=cursor),
+        }
+        if connection.vendor != "postgresql":
+            del kinds["words"]  # to_tsvector is Postgres only
+        for name, run in kinds.items():
+            timings = []
+            for _ in range(queries):
+                started = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p95 = timings[min(int(len(timings) * 0.95), len(timings) - 1)]
+            self.stdout.write(f"  {name:14} p50 {statistics.median(timings):7.2f} ms  p95 {p95:7.2f} ms  max {timings[-1]:7.2f} ms")
@@ -0,0 +1,129 @@
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone as django_timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.models import Profile, RedactionJob, RedactionJobArchive, TranslationJob, TranslationJobArchive
+from api.views import PIIRedactionViewSet, TranslationJobViewSet, sync_cursor
+from core.models import User
+
+KINDS = {
+    "translation": (TranslationJob, TranslationJobArchive, TranslationJobViewSet, {"target_lang": "de"}),
+    "redaction": (RedactionJob, RedactionJobArchive, PIIRedactionViewSet, {}),
+}
+FILENAME_PREFIX = "benchmark-archive-"
+# hot rows get their created_at in groups of this size (auto_now_add ignores it on insert)
+HOT_TIMESTAMP_GROUP = 100
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a job archive table and its hot table with deterministic synthetic rows, times the "
+        "user list and the staff `?include_archive=true` pages, and removes the rows again. "
+        "Meant for a Postgres dev database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", choices=sorted(KINDS), default="translation")
+        parser.add_argument("--rows", type=int, default=10_000_000, help="Archived (historical) jobs.")
+        parser.add_argument("--hot-rows", type=int, default=50_000, help="Jobs of the last JOB_ARCHIVE_AFTER_DAYS.")
+        parser.add_argument("--days", type=int, default=7, help="Age of the oldest hot job.")
+        parser.add_argument("--history-days", type=int, default=3 * 365, help="Age of the oldest archived job.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--queries", type=int, default=30, help="Timed requests per query kind.")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded rows afterwards.")
+
+    def handle(self, *args, **options):
+        profile = Profile.objects.order_by("id").first()
+        if profile is None:
+            raise CommandError("Create at least one user profile before seeding.")
+        model, archive_model, viewset, extra = KINDS[options["kind"]]
+        rng = random.Random(options["seed"])
+        now = django_timezone.now()
+
+        started = time.monotonic()
+        self._seed_archive(rng, archive_model, profile, extra, now, options)
+        self._seed_hot(rng, model, profile, extra, now, options)
+        self.stdout.write(f"Seeded {options['rows']} archived and {options['hot_rows']} hot jobs "
+                          f"in {time.monotonic() - started:.1f}s")
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+                cursor.execute(f"ANALYZE {archive_model._meta.db_table}")
+
+        try:
+            self._run_queries(rng, viewset, archive_model, profile, now, options)
+        finally:
+            if not options["keep"]:
+                for table in (model, archive_model):
+                    deleted, _ = table.objects.filter(profile=profile, filename__startswith=FILENAME_PREFIX).delete()
+                    self.stdout.write(f"Removed {deleted} seeded {table.__name__} rows")
+
+    def _job_fields(self, rng, profile, extra, i) -> dict:
+        return {"profile": profile, "filename": f"{FILENAME_PREFIX}{i}.pdf", "status": rng.choice(["succeeded", "failed"]),
+                "source_blob_url": f"https://example.blob.core.windows.net/source/{i}.pdf",
+                "operation_location": f"https://example.cognitiveservices.azure.com/operations/{i}", **extra}
+
+    def _seed_archive(self, rng, archive_model, profile, extra, now, options):
+        history = timedelta(days=options["history_days"] - options["days"])
+        oldest_hot = now - timedelta(days=options["days"])
+        for start in range(0, options["rows"], options["batch_size"]):
+            batch = []
+            for i in range(start, min(start + options["batch_size"], options["rows"])):
+                created_at = oldest_hot - history * rng.random()
+                batch.append(archive_model(id=uuid.UUID(int=rng.getrandbits(128)), created_at=created_at,
+                                           updated_at=created_at, **self._job_fields(rng, profile, extra, i)))
+            archive_model.objects.bulk_create(batch)
+
+    def _seed_hot(self, rng, model, profile, extra, now, options):
+        window = timedelta(days=options["days"])
+        for start in range(0, options["hot_rows"], options["batch_size"]):
+            end = min(start + options["batch_size"], options["hot_rows"])
+            jobs = model.objects.bulk_create(
+                [model(**self._job_fields(rng, profile, extra, i)) for i in range(start, end)])
+            for group in range(0, len(jobs), HOT_TIMESTAMP_GROUP):
+                ids = [job.id for job in jobs[group:group + HOT_TIMESTAMP_GROUP]]
+                model.objects.filter(pk__in=ids).update(created_at=now - window * rng.random())
+
+    def _run_queries(self, rng, viewset, archive_model, profile, now, options):
+        factory = APIRequestFactory()
+        staff = User(id=0, email="benchmark@example.com", is_staff=True)
+        owner = profile.user
+        list_view = viewset.as_view({"get": "list"})
+        oldest = archive_model.objects.order_by("created_at").values_list("created_at", flat=True).first()
+
+        def get(user, **params):
+            request = factory.get("/", params)
+            force_authenticate(request, user=user)
+            response = list_view(request)
+            if response.status_code != 200:
+                raise CommandError(f"List answered {response.status_code}: {response.data}")
+            return response
+
+        def deep_page():
+            # a cursor at a random depth of the archive
+            moment = oldest + (now - oldest) * rng.random() if oldest else now
+            cursor = f"{sync_cursor(moment)}:{uuid.UUID(int=(1 << 128) - 1)}"
+            return get(staff, include_archive="true", archive_cursor=cursor)
+
+        kinds = {
+            "user 24h list": lambda: get(owner),
+            "staff first page": lambda: get(staff, include_archive="true"),
+            "staff deep page": deep_page,
+        }
+        for name, run in kinds.items():
+            timings = []
+            for _ in range(options["queries"]):
+                started = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p95 = timings[min(int(len(timings) * 0.95), len(timings) - 1)]
+            self.stdout.write(f"  {name:16} p50 {statistics.median(timings):7.2f} ms  p95 {p95:7.2f} ms  max {timings[-1]:7.2f} ms")
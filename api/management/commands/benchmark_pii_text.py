@@ -0,0 +1,152 @@
+import json
+import random
+import re
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.azure_ai import AzurePIIRedaction
+from api.endpoint_pool import AzureEndpoint, EndpointPool
+from api.views import PIIRedactionViewSet
+from core.models import User
+
+PERSON = re.compile(r"\b[A-Z][a-zäöü]+ [A-Z][a-zäöü]+\b")
+EMAIL = re.compile(r"\b[\w.]+@[\w.]+\.[a-z]{2,}\b")
+NAMES = ["Anna Bauer", "Lukas Müller", "Mara Schmidt", "Jonas Weber", "Lea Fischer", "Felix Wagner"]
+FILLER = "The request from {name} about the invoice was forwarded to {email} yesterday. "
+# pause of a throughput thread after a 503 from the admission gates
+SHED_PAUSE_SECONDS = 0.01
+
+
+class FakeLanguageHandler(BaseHTTPRequestHandler):
+    """
+    Answers POST /language/:analyze-text like Azure's synchronous PII recognition, after
+    `server.latency` seconds: person-like name pairs and e-mail addresses, offsets in code points.
+    """
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.server.latency)
+        documents = []
+        for doc in request["analysisInput"]["documents"]:
+            entities = [
+                {"text": m.group(), "category": category, "offset": m.start(), "length": len(m.group()),
+                 "confidenceScore": 0.95}
+                for category, pattern in (("Person", PERSON), ("Email", EMAIL))
+                for m in pattern.finditer(doc["text"])
+            ]
+            documents.append({"id": doc["id"], "entities": sorted(entities, key=lambda e: e["offset"]), "warnings": []})
+        body = json.dumps({"kind": "PiiEntityRecognitionResults",
+                           "results": {"documents": documents, "errors": [], "modelVersion": "fake"}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fake_language_service(latency: float = 0.0) -> ThreadingHTTPServer:
+    """Serves FakeLanguageHandler on a free loopback port in a daemon thread; shut it down when done."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeLanguageHandler)
+    server.latency = latency
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def fake_pii_pool(server: ThreadingHTTPServer) -> EndpointPool:
+    """A one-resource PII pool pointing at the fake service (no storage: text mode never uploads)."""
+    config = dict(AzurePIIRedaction.pool.endpoints[0].config,
+                  language_endpoint=f"http://127.0.0.1:{server.server_port}", language_key="fake", region="local")
+    return EndpointPool("redaction", [AzureEndpoint("fake", 1.0, config)])
+
+
+class Command(BaseCommand):
+    help = (
+        "Times inline text redaction (POST /api/redact/ with `texts`) end to end against a local fake "
+        "of Azure's synchronous PII endpoint: latency by batch size, then throughput under concurrency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--latency-ms", type=float, default=50, help="Simulated Azure latency per request.")
+        parser.add_argument("--batch-sizes", default="1,5,20,100", help="Snippets per request for the latency runs.")
+        parser.add_argument("--requests", type=int, default=20, help="Timed requests per batch size.")
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds of the throughput run.")
+        parser.add_argument("--throughput-batch", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        server = start_fake_language_service(options["latency_ms"] / 1000)
+        original_pool = AzurePIIRedaction.pool
+        AzurePIIRedaction.pool = fake_pii_pool(server)
+        try:
+            self._run(rng, options)
+        finally:
+            AzurePIIRedaction.pool = original_pool
+            server.shutdown()
+            server.server_close()
+
+    def _run(self, rng, options):
+        factory = APIRequestFactory()
+        view = PIIRedactionViewSet.as_view({"post": "create"})
+        user = User(id=0, email="benchmark@example.com")
+
+        def snippet():
+            name = rng.choice(NAMES)
+            return FILLER.format(name=name, email=f"{name.split()[0].lower()}@example.com") * rng.randint(1, 4)
+
+        def post(texts) -> int:
+            request = factory.post("/", {"texts": texts, "document_lang": "en"}, format="json")
+            force_authenticate(request, user=user)
+            return view(request).status_code
+
+        self.stdout.write(f"Fake PII endpoint latency {options['latency_ms']:.0f} ms")
+        for size in (int(s) for s in options["batch_sizes"].split(",")):
+            timings, statuses = [], Counter()
+            for _ in range(options["requests"]):
+                texts = [snippet() for _ in range(size)]
+                started = time.perf_counter()
+                statuses[post(texts)] += 1
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p95 = timings[min(int(len(timings) * 0.95), len(timings) - 1)]
+            self.stdout.write(f"  {size:4} snippets  p50 {statistics.median(timings):8.2f} ms  p95 {p95:8.2f} ms  "
+                              f"statuses {dict(statuses)}")
+
+        deadline = time.monotonic() + options["duration"]
+        batch = options["throughput_batch"]
+
+        def worker(_):
+            statuses = Counter()
+            try:
+                while time.monotonic() < deadline:
+                    code = post([snippet() for _ in range(batch)])
+                    statuses[code] += 1
+                    if code == 503:
+                        time.sleep(SHED_PAUSE_SECONDS)  # shed by the admission gates, don't spin
+            finally:
+                connections.close_all()
+            return statuses
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            statuses = sum(pool.map(worker, range(options["concurrency"])), Counter())
+        elapsed = time.monotonic() - started
+        ok = statuses.get(200, 0)
+        # text mode passes the upload and submission gates like a document upload
+        self.stdout.write(f"  admission caps per process: uploads {settings.ADMISSION_UPLOADS_PER_PROCESS}, "
+                          f"submissions {settings.ADMISSION_SUBMISSIONS_PER_PROCESS}")
+        self.stdout.write(f"  throughput, {options['concurrency']} threads x {batch} snippets: "
+                          f"{ok / elapsed:.1f} requests/s, {ok * batch / elapsed:.1f} snippets/s, statuses {dict(statuses)}")
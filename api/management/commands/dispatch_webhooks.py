@@ -0,0 +1,31 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.webhooks import dispatch_due_deliveries
+
+
+class Command(BaseCommand):
+    help = "Sends due webhook deliveries from the outbox, with retries and exponential backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent HTTP requests per batch.")
+        parser.add_argument("--loop", action="store_true", help="Keep running instead of draining once.")
+        parser.add_argument("--interval", type=float, default=2.0,
+                            help="Seconds to sleep in --loop mode when nothing is due.")
+
+    def handle(self, *args, **options):
+        total_delivered = total_failed = 0
+        while True:
+            delivered, failed = dispatch_due_deliveries(options["batch_size"], options["workers"])
+            total_delivered += delivered
+            total_failed += failed
+            if delivered or failed:
+                logging.info(f"Webhooks: {delivered} delivered, {failed} failed attempts")
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(f"Delivered {total_delivered} webhooks, {total_failed} failed attempts")
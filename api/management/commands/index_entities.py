@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.entity_index import index_pending_jobs, pending_jobs
+from api.models import RedactionJob, RedactionJobArchive
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfills the RedactionEntity search table from the entity results of succeeded "
+        "redaction jobs (hot and archived). New jobs are indexed by `poll_jobs`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reindex", action="store_true",
+                            help="Rebuild the rows of jobs that were already indexed.")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Only count the jobs that would be indexed.")
+
+    def handle(self, *args, **options):
+        for model in (RedactionJob, RedactionJobArchive):
+            if options["dry_run"]:
+                self.stdout.write(f"Would index {pending_jobs(model, options['reindex']).count()} {model.__name__} jobs")
+                continue
+            started = time.monotonic()
+            jobs, rows = index_pending_jobs(model, reindex=options["reindex"])
+            self.stdout.write(f"Indexed {rows} entities from {jobs} {model.__name__} jobs in {time.monotonic() - started:.1f}s")
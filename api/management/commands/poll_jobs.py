@@ -0,0 +1,52 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone as django_timezone
+
+from api.entity_index import index_pending_jobs
+from api.job_eta import poll_delay
+from api.job_status import TERMINAL_STATUSES, refresh_redaction_job, refresh_translation_job
+from api.models import RedactionJob, TranslationJob
+
+POLL_TARGETS = [
+    (TranslationJob, refresh_translation_job),
+    (RedactionJob, refresh_redaction_job),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Polls Azure for unfinished jobs so terminal transitions (and their webhooks) "
+        "happen even when no client calls the status endpoints, and indexes the entities "
+        "of newly succeeded redaction jobs for search. Each job is checked again when the "
+        "job duration model (api.job_eta) expects it to be worthwhile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of running once.")
+        parser.add_argument("--interval", type=float, default=10.0,
+                            help="Seconds between rounds in --loop mode; each job is only checked when due.")
+        parser.add_argument("--index-limit", type=int, default=20,
+                            help="Succeeded redaction jobs whose entities are indexed per round.")
+
+    def handle(self, *args, **options):
+        while True:
+            for model, refresh in POLL_TARGETS:
+                due = (model.objects.exclude(status__in=TERMINAL_STATUSES)
+                       .filter(Q(next_poll_at__isnull=True) | Q(next_poll_at__lte=django_timezone.now())))
+                for job in due.select_related("profile").iterator():
+                    try:
+                        refresh(job)
+                    except Exception:
+                        logging.exception(f"Polling {model.__name__} {job.id} failed")
+                    if job.status not in TERMINAL_STATUSES:
+                        # .update() keeps updated_at (and the status ETag) untouched
+                        next_poll_at = django_timezone.now() + timedelta(seconds=poll_delay(job))
+                        model.objects.filter(pk=job.pk).update(next_poll_at=next_poll_at)
+            index_pending_jobs(RedactionJob, limit=options["index_limit"])
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,173 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone as django_timezone
+
+from api.azure_ai import AzureDocumentTranslator, AzurePIIRedaction
+from api.models import (JobTombstone, RedactionEntity, RedactionJob, RedactionJobArchive, TranslationJob,
+                        TranslationJobArchive, UploadSession, WebhookDelivery)
+
+# (model, blob URL fields, Azure client class; each job's endpoint_name picks the storage account)
+PURGE_TARGETS = [
+    (TranslationJob, ["source_blob_url", "target_container_url"], AzureDocumentTranslator),
+    (RedactionJob, ["source_blob_url", "target_blob_url", "entity_download_url"], AzurePIIRedaction),
+    (TranslationJobArchive, ["source_blob_url", "target_container_url"], AzureDocumentTranslator),
+    (RedactionJobArchive, ["source_blob_url", "target_blob_url", "entity_download_url"], AzurePIIRedaction),
+]
+# UploadSession.job_type -> Azure client owning container_in
+UPLOAD_CLIENTS = {"translation": AzureDocumentTranslator, "redaction": AzurePIIRedaction}
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes jobs older than the retention period together with their blobs. "
+        "Rows are walked in (created_at, id) order in small batches, each deleted in its own "
+        "short statement, so the command can be stopped and re-run at any time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.JOB_RETENTION_DAYS,
+                            help="Delete jobs created more than this many days ago.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--pause", type=float, default=0.0,
+                            help="Seconds to sleep between batches to limit load on the database.")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Only count what would be deleted.")
+
+    def handle(self, *args, **options):
+        cutoff = django_timezone.now() - timedelta(days=options["days"])
+        self.stdout.write(f"Purging jobs created before {cutoff.isoformat()}")
+        for model, url_fields, client_class in PURGE_TARGETS:
+            self._purge_model(model, url_fields, client_class, cutoff, options)
+        self._purge_webhook_deliveries(cutoff, options)
+        self._purge_upload_sessions(options)
+        self._purge_tombstones(options)
+
+    def _purge_model(self, model, url_fields, client_class, cutoff, options):
+        clients = {}
+        started = time.monotonic()
+        rows_deleted = blobs_deleted = blobs_failed = 0
+        cursor = None
+
+        while True:
+            batch = self._next_batch(model, url_fields, cutoff, cursor, options["batch_size"])
+            if not batch:
+                break
+            cursor = (batch[-1]["created_at"], batch[-1]["id"])
+
+            urls_by_job = {row["id"]: [row[field] for field in url_fields if row[field]] for row in batch}
+            endpoint_by_job = {row["id"]: row["endpoint_name"] for row in batch}
+            # Uploads used to be named after the file alone, so a newer job may share the source blob.
+            shared = self._still_referenced([row["source_blob_url"] for row in batch], cutoff)
+            urls_by_job = {job_id: [url for url in urls if url not in shared] for job_id, urls in urls_by_job.items()}
+            if options["dry_run"]:
+                rows_deleted += len(batch)
+                blobs_deleted += sum(len(urls) for urls in urls_by_job.values())
+                continue
+
+            # Blobs first: if we stop in between, the rows are still there and the
+            # next run retries the (idempotent) blob deletes.
+            all_urls = [url for urls in urls_by_job.values() for url in urls]
+            failed = set()
+            for endpoint in set(endpoint_by_job.values()):
+                if endpoint not in clients:
+                    clients[endpoint] = client_class(endpoint)
+                failed |= clients[endpoint].delete_blobs(
+                    [url for job_id, urls in urls_by_job.items() if endpoint_by_job[job_id] == endpoint for url in urls])
+            deletable = [job_id for job_id, urls in urls_by_job.items() if not failed.intersection(urls)]
+            if model in (RedactionJob, RedactionJobArchive):
+                RedactionEntity.objects.filter(job_id__in=deletable).delete()
+            deleted, _ = model.objects.filter(pk__in=deletable).delete()
+
+            rows_deleted += deleted
+            blobs_deleted += len(all_urls) - len(failed)
+            blobs_failed += len(failed)
+            elapsed = max(time.monotonic() - started, 1e-6)
+            logging.info(
+                f"{model.__name__}: {rows_deleted} rows ({rows_deleted / elapsed:.0f}/s), "
+                f"{blobs_deleted} blobs ({blobs_deleted / elapsed:.0f}/s), {blobs_failed} blob failures"
+            )
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        elapsed = time.monotonic() - started
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            f"{verb} {rows_deleted} {model.__name__} rows and {blobs_deleted} blobs "
+            f"in {elapsed:.1f}s ({blobs_failed} blobs failed and were kept for the next run)"
+        )
+
+    def _still_referenced(self, source_urls, cutoff) -> set:
+        """Source blob URLs that jobs created at or after the cutoff still use."""
+        source_urls = [url for url in source_urls if url]
+        shared = set()
+        for model, _, _ in PURGE_TARGETS:
+            shared.update(model.objects.filter(created_at__gte=cutoff, source_blob_url__in=source_urls)
+                          .values_list("source_blob_url", flat=True))
+        return shared
+
+    def _purge_webhook_deliveries(self, cutoff, options):
+        qs = WebhookDelivery.objects.filter(created_at__lt=cutoff).exclude(status=WebhookDelivery.STATUS_PENDING)
+        if options["dry_run"]:
+            self.stdout.write(f"Would delete {qs.count()} webhook deliveries")
+            return
+        deleted = 0
+        while True:
+            ids = list(qs.order_by("id").values_list("id", flat=True)[:options["batch_size"]])
+            if not ids:
+                break
+            deleted += WebhookDelivery.objects.filter(pk__in=ids).delete()[0]
+        self.stdout.write(f"Deleted {deleted} webhook deliveries")
+
+    def _purge_upload_sessions(self, options):
+        """
+        Expired sessions go away. Blobs of sessions that never became a job are deleted;
+        uncommitted blocks are discarded by Azure on their own after a week.
+        """
+        qs = UploadSession.objects.filter(expires_at__lt=django_timezone.now())
+        if options["dry_run"]:
+            self.stdout.write(f"Would delete {qs.count()} expired upload sessions")
+            return
+        deleted = 0
+        while True:
+            sessions = list(qs.order_by("expires_at").values(
+                "id", "job_type", "endpoint_name", "blob_url", "status")[:options["batch_size"]])
+            if not sessions:
+                break
+            failed = set()
+            for job_type, endpoint in {(s["job_type"], s["endpoint_name"]) for s in sessions}:
+                urls = [s["blob_url"] for s in sessions
+                        if (s["job_type"], s["endpoint_name"]) == (job_type, endpoint)
+                        and s["status"] != UploadSession.STATUS_FINALIZED]
+                if urls and job_type in UPLOAD_CLIENTS:
+                    failed |= UPLOAD_CLIENTS[job_type](endpoint).delete_blobs(urls)
+            deletable = [s["id"] for s in sessions if s["blob_url"] not in failed]
+            if not deletable:
+                break
+            deleted += UploadSession.objects.filter(pk__in=deletable).delete()[0]
+        self.stdout.write(f"Deleted {deleted} expired upload sessions")
+
+    def _purge_tombstones(self, options):
+        """Sync cursors older than JOB_TOMBSTONE_DAYS are refused, so their tombstones are no longer needed."""
+        qs = JobTombstone.objects.filter(deleted_at__lt=django_timezone.now() - timedelta(days=settings.JOB_TOMBSTONE_DAYS))
+        if options["dry_run"]:
+            self.stdout.write(f"Would delete {qs.count()} job tombstones")
+            return
+        deleted = 0
+        while True:
+            ids = list(qs.order_by("id").values_list("id", flat=True)[:options["batch_size"]])
+            if not ids:
+                break
+            deleted += JobTombstone.objects.filter(pk__in=ids).delete()[0]
+        self.stdout.write(f"Deleted {deleted} job tombstones")
+
+    def _next_batch(self, model, url_fields, cutoff, cursor, batch_size) -> list[dict]:
+        qs = model.objects.filter(created_at__lt=cutoff)
+        if cursor is not None:
+            created_at, job_id = cursor
+            qs = qs.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=job_id))
+        return list(qs.order_by("created_at", "id").values("id", "created_at", "endpoint_name", *url_fields)[:batch_size])
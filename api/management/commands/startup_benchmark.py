@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.warmup import HEAVY_MODULES
+
+SETUP_SNIPPET = "import django; django.setup()"
+
+
+class Command(BaseCommand):
+    help = "Measures django.setup() import time with `python -X importtime` and checks it against a budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--budget-ms", type=int, default=settings.STARTUP_IMPORT_BUDGET_MS,
+                            help="Fail if the cumulative import time exceeds this many milliseconds.")
+        parser.add_argument("--runs", type=int, default=3,
+                            help="Number of fresh interpreters to measure; the fastest run is reported.")
+        parser.add_argument("--top", type=int, default=10,
+                            help="Number of slowest top-level imports to print.")
+
+    def handle(self, *args, **options):
+        runs = [self._measure() for _ in range(max(options["runs"], 1))]
+        total_us, imports = min(runs, key=lambda run: run[0])
+
+        self.stdout.write(f"django.setup() import time: {total_us / 1000:.1f} ms (best of {len(runs)})")
+        top_level = sorted(
+            ((cumulative, name) for name, (cumulative, level) in imports.items() if level == 0),
+            reverse=True,
+        )
+        for cumulative, name in top_level[:options["top"]]:
+            self.stdout.write(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+        eager = [name for name in HEAVY_MODULES if name in imports]
+        if eager:
+            raise CommandError(f"Heavy modules imported during startup: {', '.join(eager)}")
+        if total_us / 1000 > options["budget_ms"]:
+            raise CommandError(f"Startup import time {total_us / 1000:.1f} ms exceeds budget of {options['budget_ms']} ms")
+        self.stdout.write(self.style.SUCCESS(f"Within budget of {options['budget_ms']} ms"))
+
+    def _measure(self) -> tuple[int, dict[str, tuple[int, int]]]:
+        """
+        Runs django.setup() in a fresh interpreter and parses the -X importtime report.
+        Returns (total cumulative microseconds, {module: (cumulative_us, nesting level)}).
+        """
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE)}
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SETUP_SNIPPET],
+            env=env, capture_output=True, text=True, cwd=settings.BASE_DIR,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"django.setup() failed:\n{result.stderr[-2000:]}")
+
+        imports = {}
+        total_us = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            level = (len(name) - len(name.lstrip(" ")) - 1) // 2
+            cumulative_us = int(cumulative)
+            imports[name.strip()] = (cumulative_us, level)
+            if level == 0:
+                total_us += cumulative_us
+        return total_us, imports
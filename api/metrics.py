@@ -0,0 +1,23 @@
+import threading
+from collections import defaultdict
+
+# Process-local counters and gauges. Every gunicorn worker keeps its own set;
+# GET /api/metrics/ reports the worker that serves the request.
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_gauges = {}
+
+
+def increment(name: str, value: int = 1):
+    with _lock:
+        _counters[name] += value
+
+
+def set_gauge(name: str, value):
+    with _lock:
+        _gauges[name] = value
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {"counters": dict(_counters), "gauges": dict(_gauges)}
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_redactionjob_entity_download_url_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='redactionjob',
+            index=models.Index(fields=['created_at', 'id'], name='redactionjob_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='translationjob',
+            index=models.Index(fields=['created_at', 'id'], name='translationjob_created_idx'),
+        ),
+    ]
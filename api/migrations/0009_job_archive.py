@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_job_created_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RedactionJobArchive',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=256)),
+                ('source_blob_url', models.URLField(max_length=2048)),
+                ('target_blob_url', models.URLField(blank=True, max_length=2048, null=True)),
+                ('operation_location', models.URLField(max_length=2048)),
+                ('status', models.CharField(max_length=32)),
+                ('error_message', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('download_url', models.URLField(blank=True, default='', max_length=2048)),
+                ('download_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('entity_download_url', models.URLField(blank=True, default='', max_length=2048)),
+                ('entity_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_redaction_jobs', to='api.profile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at', 'id'], name='redactionjobarch_created_idx'), models.Index(fields=['profile', 'created_at'], name='redactionjobarch_profile_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TranslationJobArchive',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=256)),
+                ('target_lang', models.CharField(max_length=16)),
+                ('source_blob_url', models.URLField(max_length=2048)),
+                ('target_container_url', models.URLField(max_length=2048)),
+                ('operation_location', models.URLField(max_length=2048)),
+                ('status', models.CharField(max_length=32)),
+                ('error_message', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('download_url', models.URLField(blank=True, default='', max_length=2048)),
+                ('download_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_jobs', to='api.profile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at', 'id'], name='translationjobarch_created_idx'), models.Index(fields=['profile', 'created_at'], name='translationjobarch_profile_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:23
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_job_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='webhook_secret',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='webhook_url',
+            field=models.URLField(blank=True, default='', max_length=2048),
+        ),
+        migrations.AddField(
+            model_name='redactionjob',
+            name='callback_url',
+            field=models.URLField(blank=True, default='', max_length=2048),
+        ),
+        migrations.AddField(
+            model_name='redactionjobarchive',
+            name='callback_url',
+            field=models.URLField(blank=True, default='', max_length=2048),
+        ),
+        migrations.AddField(
+            model_name='translationjob',
+            name='callback_url',
+            field=models.URLField(blank=True, default='', max_length=2048),
+        ),
+        migrations.AddField(
+            model_name='translationjobarchive',
+            name='callback_url',
+            field=models.URLField(blank=True, default='', max_length=2048),
+        ),
+        migrations.CreateModel(
+            name='WebhookDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_type', models.CharField(max_length=16)),
+                ('job_id', models.UUIDField()),
+                ('event', models.CharField(max_length=32)),
+                ('url', models.URLField(max_length=2048)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('status', models.CharField(default='pending', max_length=16)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField()),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('delivered_at', models.DateTimeField(blank=True, null=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='webhook_deliveries', to='api.profile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='webhookdelivery_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:36
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.contrib.postgres.search
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_webhooks'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='redactionjob',
+            name='entities_indexed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='redactionjobarchive',
+            name='entities_indexed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='RedactionEntity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.UUIDField()),
+                ('filename', models.CharField(max_length=256)),
+                ('text', models.CharField(max_length=1024)),
+                ('type', models.CharField(max_length=64)),
+                ('entity_ids', models.TextField(blank=True, default='')),
+                ('confidence_score', models.FloatField(blank=True, null=True)),
+                ('job_created_at', models.DateTimeField()),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='redaction_entities', to='api.profile')),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('text'), name='gin_trgm_ops'), name='redactionentity_text_trgm'), django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('text', config='simple'), name='redactionentity_text_fts'), models.Index(fields=['type', 'id'], name='redactionentity_type_idx'), models.Index(fields=['job_id'], name='redactionentity_job_idx')],
+            },
+        ),
+    ]
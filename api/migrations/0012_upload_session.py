@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:41
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_redaction_entity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('job_type', models.CharField(max_length=16)),
+                ('filename', models.CharField(max_length=256)),
+                ('blob_name', models.CharField(max_length=1024)),
+                ('blob_url', models.URLField(max_length=2048)),
+                ('size', models.BigIntegerField()),
+                ('chunk_size', models.PositiveIntegerField()),
+                ('status', models.CharField(default='open', max_length=16)),
+                ('job_id', models.UUIDField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField()),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='api.profile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['expires_at'], name='uploadsession_expires_idx')],
+            },
+        ),
+    ]
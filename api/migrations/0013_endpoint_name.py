@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_upload_session'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='redactionjob',
+            name='endpoint_name',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='redactionjobarchive',
+            name='endpoint_name',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='translationjob',
+            name='endpoint_name',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='translationjobarchive',
+            name='endpoint_name',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='uploadsession',
+            name='endpoint_name',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobDurationStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('service', models.CharField(max_length=16)),
+                ('target_lang', models.CharField(blank=True, default='', max_length=16)),
+                ('file_type', models.CharField(blank=True, default='', max_length=16)),
+                ('size_bucket', models.SmallIntegerField()),
+                ('samples', models.PositiveIntegerField(default=0)),
+                ('mean_seconds', models.FloatField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='redactionjob',
+            name='file_size',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='redactionjob',
+            name='next_poll_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='redactionjobarchive',
+            name='file_size',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='redactionjobarchive',
+            name='next_poll_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='translationjob',
+            name='file_size',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='translationjob',
+            name='next_poll_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='translationjobarchive',
+            name='file_size',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='translationjobarchive',
+            name='next_poll_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='redactionjob',
+            index=models.Index(fields=['next_poll_at'], name='redactionjob_next_poll_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='translationjob',
+            index=models.Index(fields=['next_poll_at'], name='translationjob_next_poll_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobdurationstat',
+            constraint=models.UniqueConstraint(fields=('service', 'target_lang', 'file_type', 'size_bucket'), name='jobdurationstat_key_uniq'),
+        ),
+    ]
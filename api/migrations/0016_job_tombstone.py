@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_job_duration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_type', models.CharField(max_length=16)),
+                ('job_id', models.UUIDField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='redactionjob',
+            index=models.Index(fields=['profile', 'updated_at'], name='redactionjob_profile_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='redactionjob',
+            index=models.Index(fields=['updated_at'], name='redactionjob_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='translationjob',
+            index=models.Index(fields=['profile', 'updated_at'], name='translationjob_profile_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='translationjob',
+            index=models.Index(fields=['updated_at'], name='translationjob_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='jobtombstone',
+            name='profile',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_tombstones', to='api.profile'),
+        ),
+        migrations.AddIndex(
+            model_name='jobtombstone',
+            index=models.Index(fields=['profile', 'deleted_at'], name='jobtombstone_profile_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobtombstone',
+            index=models.Index(fields=['deleted_at'], name='jobtombstone_deleted_idx'),
+        ),
+    ]
@@ -2,9 +2,15 @@
 import uuid
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.functions import Upper
 
 class Profile(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, unique=True, related_name="profile")
+    webhook_url = models.URLField(max_length=2048, blank=True, default="")
+    webhook_secret = models.CharField(max_length=64, blank=True, default="")
     def __str__(self):
         return self.user.email
 
@@ -22,8 +28,26 @@ class TranslationJob(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     download_url = models.URLField(max_length=2048, blank=True, default="")
     download_expires_at = models.DateTimeField(null=True, blank=True)
+    callback_url = models.URLField(max_length=2048, blank=True, default="")  # overrides Profile.webhook_url
+    endpoint_name = models.CharField(max_length=64, blank=True, default="")  # Azure resource of the pool; "" = default
+    idempotency_key = models.CharField(max_length=255, blank=True, default="")  # Idempotency-Key header of the create request
+    file_size = models.BigIntegerField(null=True, blank=True)  # bytes of the source document
+    next_poll_at = models.DateTimeField(null=True, blank=True)  # next Azure check of `manage.py poll_jobs`
+
+    class Meta:
+        indexes = [
+            # keyset walk of the retention purge
+            models.Index(fields=["created_at", "id"], name="translationjob_created_idx"),
+            models.Index(fields=["next_poll_at"], name="translationjob_next_poll_idx"),
+            # `?since=` list syncs
+            models.Index(fields=["profile", "updated_at"], name="translationjob_profile_upd_idx"),
+            models.Index(fields=["updated_at"], name="translationjob_updated_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["profile", "idempotency_key"], condition=~models.Q(idempotency_key=""),
+                                    name="translationjob_idempotency_uniq"),
+        ]
 
-    
 
 class LanguageCode(models.Model):
     code = models.CharField(max_length=16, unique=True)
@@ -44,5 +68,216 @@ class RedactionJob(models.Model):
     download_expires_at = models.DateTimeField(null=True, blank=True)
     entity_download_url = models.URLField(max_length=2048, blank=True, default="")
     entity_expires_at = models.DateTimeField(null=True, blank=True)
+    callback_url = models.URLField(max_length=2048, blank=True, default="")  # overrides Profile.webhook_url
+    endpoint_name = models.CharField(max_length=64, blank=True, default="")  # Azure resource of the pool; "" = default
+    idempotency_key = models.CharField(max_length=255, blank=True, default="")  # Idempotency-Key header of the create request
+    file_size = models.BigIntegerField(null=True, blank=True)  # bytes of the source document
+    next_poll_at = models.DateTimeField(null=True, blank=True)  # next Azure check of `manage.py poll_jobs`
+    entities_indexed_at = models.DateTimeField(null=True, blank=True)  # copied into RedactionEntity
+
+    class Meta:
+        indexes = [
+            # keyset walk of the retention purge
+            models.Index(fields=["created_at", "id"], name="redactionjob_created_idx"),
+            models.Index(fields=["next_poll_at"], name="redactionjob_next_poll_idx"),
+            # `?since=` list syncs
+            models.Index(fields=["profile", "updated_at"], name="redactionjob_profile_upd_idx"),
+            models.Index(fields=["updated_at"], name="redactionjob_updated_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["profile", "idempotency_key"], condition=~models.Q(idempotency_key=""),
+                                    name="redactionjob_idempotency_uniq"),
+        ]
 
     
+
+
+# ---------- Archive ----------
+# Jobs older than JOB_ARCHIVE_AFTER_DAYS are moved here by `manage.py archive_jobs`
+# so the hot tables (and their indexes) only hold recent jobs. Timestamps are copied
+# verbatim, hence no auto_now/auto_now_add.
+
+class TranslationJobArchive(models.Model):
+    id = models.UUIDField(primary_key=True, editable=False)
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="archived_jobs")
+    filename = models.CharField(max_length=256)
+    target_lang = models.CharField(max_length=16)
+    source_blob_url = models.URLField(max_length=2048)
+    target_container_url = models.URLField(max_length=2048)
+    operation_location = models.URLField(max_length=2048)
+    status = models.CharField(max_length=32)
+    error_message = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    download_url = models.URLField(max_length=2048, blank=True, default="")
+    download_expires_at = models.DateTimeField(null=True, blank=True)
+    callback_url = models.URLField(max_length=2048, blank=True, default="")
+    endpoint_name = models.CharField(max_length=64, blank=True, default="")
+    idempotency_key = models.CharField(max_length=255, blank=True, default="")
+    file_size = models.BigIntegerField(null=True, blank=True)
+    next_poll_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="translationjobarch_created_idx"),
+            models.Index(fields=["profile", "created_at"], name="translationjobarch_profile_idx"),
+        ]
+
+
+class RedactionJobArchive(models.Model):
+    id = models.UUIDField(primary_key=True, editable=False)
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="archived_redaction_jobs")
+    filename = models.CharField(max_length=256)
+    source_blob_url = models.URLField(max_length=2048)
+    target_blob_url = models.URLField(max_length=2048, null=True, blank=True)
+    operation_location = models.URLField(max_length=2048)
+    status = models.CharField(max_length=32)
+    error_message = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    download_url = models.URLField(max_length=2048, blank=True, default="")
+    download_expires_at = models.DateTimeField(null=True, blank=True)
+    entity_download_url = models.URLField(max_length=2048, blank=True, default="")
+    entity_expires_at = models.DateTimeField(null=True, blank=True)
+    callback_url = models.URLField(max_length=2048, blank=True, default="")
+    endpoint_name = models.CharField(max_length=64, blank=True, default="")
+    idempotency_key = models.CharField(max_length=255, blank=True, default="")
+    file_size = models.BigIntegerField(null=True, blank=True)
+    next_poll_at = models.DateTimeField(null=True, blank=True)
+    entities_indexed_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="redactionjobarch_created_idx"),
+            models.Index(fields=["profile", "created_at"], name="redactionjobarch_profile_idx"),
+        ]
+
+
+class WebhookDelivery(models.Model):
+    """
+    Outbox row for one webhook POST. Written in the same transaction as the job's
+    terminal status change and sent later by `manage.py dispatch_webhooks`.
+    """
+    STATUS_PENDING = "pending"
+    STATUS_DELIVERED = "delivered"
+    STATUS_FAILED = "failed"
+
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="webhook_deliveries")
+    job_type = models.CharField(max_length=16)  # translation|redaction
+    job_id = models.UUIDField()
+    event = models.CharField(max_length=32)
+    url = models.URLField(max_length=2048)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=16, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="webhookdelivery_due_idx"),
+        ]
+
+
+class JobTombstone(models.Model):
+    """
+    Left behind by a job deleted through the API, so `?since=` list syncs can report the deletion.
+    Removed by `manage.py purge_expired_jobs` after JOB_TOMBSTONE_DAYS.
+    """
+    job_type = models.CharField(max_length=16)  # translation|redaction
+    job_id = models.UUIDField()
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="job_tombstones")
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["profile", "deleted_at"], name="jobtombstone_profile_idx"),
+            models.Index(fields=["deleted_at"], name="jobtombstone_deleted_idx"),
+        ]
+
+
+class JobDurationStat(models.Model):
+    """
+    Rolling (exponentially weighted) mean of how long succeeded jobs took from creation to their
+    terminal status, per service, target language, file type and size bucket. Maintained by
+    api.job_eta at terminal transitions and used for status ETAs and poll scheduling.
+    """
+    service = models.CharField(max_length=16)  # translation|redaction
+    target_lang = models.CharField(max_length=16, blank=True, default="")
+    file_type = models.CharField(max_length=16, blank=True, default="")  # lower-case extension, e.g. ".pdf"
+    size_bucket = models.SmallIntegerField()  # api.job_eta.size_bucket; -1 = size unknown
+    samples = models.PositiveIntegerField(default=0)
+    mean_seconds = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["service", "target_lang", "file_type", "size_bucket"],
+                                    name="jobdurationstat_key_uniq"),
+        ]
+
+
+class RedactionEntity(models.Model):
+    """
+    One aggregated entity (text + type) found in a redaction job, for cross-job search.
+    job_id is not a foreign key because jobs move to RedactionJobArchive; rows are removed
+    by `manage.py purge_expired_jobs` together with their job.
+    """
+    job_id = models.UUIDField()
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="redaction_entities")
+    filename = models.CharField(max_length=256)
+    text = models.CharField(max_length=1024)
+    type = models.CharField(max_length=64)
+    entity_ids = models.TextField(blank=True, default="")
+    confidence_score = models.FloatField(null=True, blank=True)
+    job_created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # icontains compiles to UPPER(text) LIKE UPPER(%q%), served by this trigram index
+            GinIndex(OpClass(Upper("text"), name="gin_trgm_ops"), name="redactionentity_text_trgm"),
+            GinIndex(SearchVector("text", config="simple"), name="redactionentity_text_fts"),
+            models.Index(fields=["type", "id"], name="redactionentity_type_idx"),
+            models.Index(fields=["job_id"], name="redactionentity_job_idx"),
+        ]
+
+
+class UploadSession(models.Model):
+    """
+    Resumable upload of one document into container_in. Every chunk is staged as an
+    Azure block (ids "000000", "000001", ...); finalize commits the block list and
+    submits the job. Unfinished sessions are removed by `manage.py purge_expired_jobs`.
+    """
+    STATUS_OPEN = "open"
+    STATUS_COMMITTED = "committed"  # block list committed, job not submitted yet
+    STATUS_FINALIZED = "finalized"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="upload_sessions")
+    job_type = models.CharField(max_length=16)  # translation|redaction
+    endpoint_name = models.CharField(max_length=64, blank=True, default="")  # resource owning the blob
+    filename = models.CharField(max_length=256)
+    blob_name = models.CharField(max_length=1024)
+    blob_url = models.URLField(max_length=2048)
+    size = models.BigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    status = models.CharField(max_length=16, default=STATUS_OPEN)
+    job_id = models.UUIDField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["expires_at"], name="uploadsession_expires_idx"),
+        ]
+
+    @property
+    def chunk_count(self) -> int:
+        return -(-self.size // self.chunk_size)
+
+    def chunk_length(self, index: int) -> int:
+        return min(self.chunk_size, self.size - index * self.chunk_size)
@@ -0,0 +1,20 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class ChunkParser(BaseParser):
+    """
+    Raw request body of one upload chunk, read straight from the stream (bypassing
+    DATA_UPLOAD_MAX_MEMORY_SIZE) but never more than UPLOAD_CHUNK_BYTES.
+    """
+    media_type = "application/octet-stream"
+
+    def parse(self, stream, media_type=None, parser_context=None) -> bytes:
+        if stream is None:
+            return b""
+        limit = settings.UPLOAD_CHUNK_BYTES
+        data = stream.read(limit + 1)
+        if len(data) > limit:
+            raise ParseError(f"A chunk may not exceed {limit} bytes.")
+        return data
@@ -0,0 +1,103 @@
+import logging
+
+# Replacement policies for apply_redactions.
+POLICY_MASK = "mask"            # "Mara" -> "****"
+POLICY_CATEGORY = "category"    # "Mara" -> "[PERSON]"
+POLICY_PSEUDONYM = "pseudonym"  # "Mara" -> "[PERSON-3]", same text+type always gets the same number
+POLICIES = (POLICY_MASK, POLICY_CATEGORY, POLICY_PSEUDONYM)
+
+
+def entity_error(text: str, entity: dict) -> str | None:
+    """
+    Why `entity` cannot be applied to `text`, or None. An entity either carries an integer
+    `offset` and `length` within the text, or the `text` to locate (see resolve_offsets).
+    """
+    if entity.get("type") is not None and not isinstance(entity["type"], str):
+        return "type must be a string."
+    offset, length = entity.get("offset"), entity.get("length")
+    if offset is None:
+        if entity.get("text") is not None and not isinstance(entity["text"], str):
+            return "text must be a string."
+        return None
+    # bool is an int subclass, but true/false are not offsets
+    if any(not isinstance(v, int) or isinstance(v, bool) for v in (offset, length)):
+        return "offset and length must be integers."
+    if offset < 0 or length < 0 or offset + length > len(text):
+        return f"offset {offset} and length {length} are outside the text ({len(text)} characters)."
+    return None
+
+
+def resolve_offsets(text: str, entities: list[dict]) -> list[dict]:
+    """
+    Returns the entities with an `offset` for each one. Entities that already carry an
+    offset keep it; the rest (e.g. from a `.result.json`, which lists entities in document
+    order without offsets) are located by searching forward from the previous match, and
+    from the start of the text when they are out of order. Entities whose text does not
+    occur in the text at all are dropped (there is nothing to redact).
+    """
+    resolved = []
+    cursor = 0
+    for entity in entities:
+        if entity.get("offset") is not None:
+            resolved.append(entity)
+            cursor = max(cursor, entity["offset"] + (entity.get("length") or 0))
+            continue
+        needle = entity.get("text")
+        if not needle:
+            continue
+        start = text.find(needle, cursor)
+        if start < 0:
+            start = text.find(needle)
+        if start < 0:
+            logging.debug(f"Entity text {needle!r} does not occur in the text")
+            continue
+        resolved.append({**entity, "offset": start, "length": len(needle)})
+        cursor = start + len(needle)
+    return resolved
+
+
+def apply_redactions(text: str, entities: list[dict], policy: str = POLICY_CATEGORY, mask_char: str = "*") -> str:
+    """
+    Replaces every entity span (offset/length in code points) according to `policy` in a
+    single pass over the text. Overlapping spans are merged into one span covering both,
+    replaced as the first one's type. Entities without offsets are located with resolve_offsets first.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown redaction policy {policy!r}, expected one of {POLICIES}")
+    if any(e.get("offset") is None for e in entities):
+        entities = resolve_offsets(text, entities)
+
+    spans = sorted(
+        (e for e in entities if e.get("offset") is not None and e.get("length")),
+        key=lambda e: e["offset"],
+    )
+    merged = []  # [start, end, first entity]
+    for entity in spans:
+        start = entity["offset"]
+        end = start + entity["length"]
+        if merged and start < merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end, entity])
+
+    pseudonyms = {}
+    counters = {}
+    parts = []
+    position = 0
+    for start, end, entity in merged:
+        entity_type = (entity.get("type") or "ENTITY").upper()
+        if policy == POLICY_MASK:
+            replacement = mask_char * (end - start)
+        elif policy == POLICY_CATEGORY:
+            replacement = f"[{entity_type}]"
+        else:
+            key = (text[start:end], entity_type)
+            replacement = pseudonyms.get(key)
+            if replacement is None:
+                counters[entity_type] = counters.get(entity_type, 0) + 1
+                replacement = pseudonyms[key] = f"[{entity_type}-{counters[entity_type]}]"
+        parts.append(text[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
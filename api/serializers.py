@@ -2,7 +2,9 @@ from django.conf import settings
 from rest_framework import serializers
 from urllib.parse import urlsplit
 
-from api.models import LanguageCode, Profile, RedactionJob, TranslationJob 
+from api.models import (LanguageCode, Profile, RedactionEntity, RedactionJob, RedactionJobArchive, TranslationJob,
+                        TranslationJobArchive, UploadSession)
+from api.webhooks import webhook_url_error
 
 def normalize_target(code: str) -> str:
     return code.lower() if code else code
@@ -16,7 +18,7 @@ class TranslationJobSerializer(serializers.ModelSerializer):
         fields = ['id', 'filename', 'target_lang', 'source_blob_url', 'target_container_url',
                     'operation_location', 'status', 'error_message', 'created_at', 'updated_at',
                     'display_status', 'target_name', 'profile',
-                    'download_expires_at', 'download_url']
+                    'download_expires_at', 'download_url', 'callback_url']
         read_only_fields = ['id', 'source_blob_url', 'target_container_url', 'operation_location', 
                             'status', 'error_message', 'created_at', 'updated_at',
                             'display_status', 'target_name', 'profile', 'download_expires_at', 'download_url']       
@@ -35,6 +37,11 @@ class TranslationJobSerializer(serializers.ModelSerializer):
         return obj.target_container_url.rsplit('/', 1)[-1]
 
 
+class TranslationJobArchiveSerializer(TranslationJobSerializer):
+    class Meta(TranslationJobSerializer.Meta):
+        model = TranslationJobArchive
+
+
 class LanguageCodeSerializer(serializers.ModelSerializer):
     class Meta:
         model = LanguageCode
@@ -51,7 +58,8 @@ class RedactionJobSerializer(serializers.ModelSerializer):
         fields = ['id', 'filename', 'source_blob_url', 'target_blob_url',
                     'status', 'operation_location', 'error_message', 'created_at', 'updated_at',
                     'display_status', 'profile',
-                    'download_expires_at', 'download_url', 'entity_download_url', 'entity_expires_at', 'target_name']
+                    'download_expires_at', 'download_url', 'entity_download_url', 'entity_expires_at', 'target_name',
+                    'callback_url']
         
         read_only_fields = ['id', 'source_blob_url', 'target_blob_url', 
                             'status', 'operation_location', 'error_message', 'created_at', 'updated_at',
@@ -73,8 +81,42 @@ class RedactionJobSerializer(serializers.ModelSerializer):
         return obj.target_blob_url.rsplit('/', 1)[-1]
     
 
+class RedactionJobArchiveSerializer(RedactionJobSerializer):
+    class Meta(RedactionJobSerializer.Meta):
+        model = RedactionJobArchive
+
+
 class ProfileSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(source='user.email', read_only=True)
     class Meta:
         model = Profile
-        fields = ['email']
\ No newline at end of file
+        fields = ['email']
+
+
+class WebhookSettingsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Profile
+        fields = ['webhook_url', 'webhook_secret']
+        read_only_fields = ['webhook_secret']
+
+    def validate_webhook_url(self, value):
+        error = webhook_url_error(value) if value else None
+        if error is not None:
+            raise serializers.ValidationError(error)
+        return value
+
+
+class RedactionEntitySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RedactionEntity
+        fields = ['id', 'job_id', 'profile', 'filename', 'text', 'type', 'entity_ids', 'confidence_score', 'job_created_at']
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    chunk_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'job_type', 'filename', 'size', 'chunk_size', 'chunk_count', 'status', 'job_id',
+                  'created_at', 'expires_at']
+        read_only_fields = fields
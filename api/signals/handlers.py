@@ -1,10 +1,22 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.conf import settings
 
-from api.models import Profile
+from api.authentication import invalidate_user_state
+from api.catalogue import invalidate_language_catalogue
+from api.models import LanguageCode, Profile
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_profile_from_new_user(sender, **kwargs):
     if kwargs['created']:
-        Profile.objects.create(user = kwargs['instance'])
\ No newline at end of file
+        Profile.objects.create(user = kwargs['instance'])
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_state_on_change(sender, instance, **kwargs):
+    invalidate_user_state(instance.pk)
+
+@receiver(post_save, sender=LanguageCode)
+@receiver(post_delete, sender=LanguageCode)
+def invalidate_language_catalogue_on_change(sender, **kwargs):
+    invalidate_language_catalogue()
@@ -0,0 +1,120 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from api import metrics
+
+# Attributes every LogRecord has; anything else came in through `extra=` and is emitted as a field.
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, message, the `extra=` fields
+    (job_id, operation, duration_ms, endpoint, ...) and the traceback if any.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class BackgroundStreamHandler(QueueHandler):
+    """
+    Puts records on a bounded in-process queue; a listener thread formats them and writes
+    them to the stream, so request and poller threads never wait on stdout. When the queue
+    is full records are dropped and counted (metrics `logging.dropped`) instead of blocking.
+    """
+
+    def __init__(self, stream=None, maxsize: int = 10000):
+        super().__init__(queue.Queue(maxsize))
+        self.target = logging.StreamHandler(stream)
+        self._start_listener()
+        # A worker forked after configuration (gunicorn --preload) needs its own thread, and its
+        # own queue: the inherited one still lists the parent's listener as the waiter to wake.
+        os.register_at_fork(after_in_child=self._restart_after_fork)
+        atexit.register(self.close)
+
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=False)
+        self.listener.start()
+
+    def _restart_after_fork(self):
+        self.queue = queue.Queue(self.queue.maxsize)
+        self._start_listener()
+
+    def setFormatter(self, fmt):
+        # formatting happens on the listener thread
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Render the message now, while its arguments still hold their current values.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.increment("logging.dropped")
+
+    def close(self):
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
+        super().close()
+
+
+class PayloadSampler:
+    """
+    Token bucket per operation: at most `per_minute` verbose payload logs per process and
+    operation, however many polls run. Skipped payloads are counted (`logging.payloads_skipped`).
+    """
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, operation: str) -> bool:
+        if self.per_minute <= 0:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(operation, (self.per_minute, now))
+            tokens = min(self.per_minute, tokens + (now - updated) * self.per_minute / 60)
+            allowed = tokens >= 1
+            self._buckets[operation] = (tokens - 1 if allowed else tokens, now)
+        if not allowed:
+            metrics.increment("logging.payloads_skipped")
+        return allowed
+
+
+_sampler = None
+
+
+def log_payload(operation: str, payload, **fields):
+    """Logs a (sampled) verbose Azure response body."""
+    global _sampler
+    if _sampler is None:
+        from django.conf import settings
+        _sampler = PayloadSampler(settings.LOG_PAYLOADS_PER_MINUTE)
+    if _sampler.allow(operation):
+        logging.info(f"{operation} payload", extra={"operation": operation, "payload": payload, **fields})
@@ -0,0 +1,47 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api.azure_ai import AzureDocumentTranslator
+from api.endpoint_pool import call_with_failover
+
+SYNC_TRANSLATION_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def use_sync_document_path(file) -> bool:
+    """
+    Small documents in a format the synchronous API understands skip blob upload,
+    batch submission and polling.
+    """
+    _, ext = os.path.splitext(file.name)
+    return file.size <= settings.SYNC_TRANSLATION_MAX_BYTES and ext.lower() in settings.SYNC_TRANSLATION_EXTENSIONS
+
+
+def _cache_key(kind: str, content: bytes, target_lang: str) -> str:
+    return f"api:sync-translation:{kind}:{hashlib.sha256(content).hexdigest()}:{target_lang.lower()}"
+
+
+def translate_text_cached(text: str, target_lang: str) -> tuple[str, bool]:
+    """Returns (translated text, served from cache). Translator failures raise requests.RequestException."""
+    key = _cache_key("text", text.encode("utf-8"), target_lang)
+    translated = cache.get(key)
+    if translated is not None:
+        return translated, True
+    translated = call_with_failover(AzureDocumentTranslator, lambda az: az.translate_text(text, target_lang))
+    cache.set(key, translated, timeout=SYNC_TRANSLATION_CACHE_TIMEOUT)
+    return translated, False
+
+
+def translate_document_cached(data: bytes, file_name: str, target_lang: str, content_type: str | None = None) -> tuple[bytes, bool]:
+    """Returns (translated document, served from cache)."""
+    _, ext = os.path.splitext(file_name)
+    key = _cache_key(f"doc{ext.lower()}", data, target_lang)
+    translated = cache.get(key)
+    if translated is not None:
+        return translated, True
+    translated = call_with_failover(
+        AzureDocumentTranslator, lambda az: az.translate_document_sync(data, file_name, target_lang, content_type))
+    cache.set(key, translated, timeout=SYNC_TRANSLATION_CACHE_TIMEOUT)
+    return translated, False
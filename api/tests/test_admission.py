@@ -0,0 +1,42 @@
+from contextlib import ExitStack
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from api.admission import AdmissionGate, Overloaded, delete_if_held
+
+
+class AdmissionGateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.gate = AdmissionGate("test", local_limit=3, global_limit=2, slot_ttl=60)
+
+    def test_global_cap_sheds_and_release_frees_a_slot(self):
+        first, second = self.gate.try_acquire(), self.gate.try_acquire()
+        self.assertIsNotNone(first)
+        self.assertIsNotNone(second)
+        self.assertIsNone(self.gate.try_acquire())
+        self.gate.release(first)
+        self.assertEqual(first[0], self.gate.try_acquire()[0])
+
+    def test_admit_raises_overloaded_and_releases_with_the_stack(self):
+        with ExitStack() as stack:
+            self.gate.admit(stack)
+            self.gate.admit(stack)
+            with self.assertRaises(Overloaded):
+                self.gate.admit(ExitStack())
+        self.assertIsNotNone(self.gate.try_acquire())
+
+    def test_release_keeps_a_slot_taken_over_after_expiry(self):
+        key, token = self.gate.try_acquire()
+        cache.set(key, "other request", timeout=60)  # our slot expired and was taken again
+        self.gate.release((key, token))
+        self.assertEqual("other request", cache.get(key))
+
+    def test_delete_if_held(self):
+        cache.set("api:admission:x", "token", timeout=60)
+        self.assertFalse(delete_if_held("api:admission:x", "stale"))
+        self.assertEqual("token", cache.get("api:admission:x"))
+        self.assertTrue(delete_if_held("api:admission:x", "token"))
+        self.assertIsNone(cache.get("api:admission:x"))
+        self.assertFalse(delete_if_held("api:admission:x", "token"))
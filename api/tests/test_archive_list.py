@@ -0,0 +1,62 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone as django_timezone
+from rest_framework.test import APIClient
+
+from api.models import RedactionJob, RedactionJobArchive
+from core.models import User
+
+
+class ArchiveListTests(TestCase):
+    """Staff `?include_archive=true` walks every hot job and then the archive, newest first."""
+
+    def setUp(self):
+        staff = User.objects.create_user(email="staff@example.com", password="x", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(staff)
+        now = django_timezone.now()
+        # 2 jobs within the 24h list window, 3 between one and seven days old, 4 archived
+        self.ages = [timedelta(hours=1), timedelta(hours=5), timedelta(days=2), timedelta(days=4),
+                     timedelta(days=6), timedelta(days=8), timedelta(days=9), timedelta(days=10), timedelta(days=11)]
+        self.ids = []
+        for age in self.ages:
+            job = RedactionJob.objects.create(profile=staff.profile, filename=f"{age.days}.pdf", status="succeeded")
+            RedactionJob.objects.filter(pk=job.pk).update(created_at=now - age)
+            self.ids.append(str(job.id))
+        call_command("archive_jobs", days=7, stdout=StringIO())
+
+    def walk(self, limit: int) -> list[list[str]]:
+        pages, cursor = [], None
+        while True:
+            params = {"include_archive": "true", "limit": limit, **({"archive_cursor": cursor} if cursor else {})}
+            response = self.client.get("/api/redact/", params)
+            self.assertEqual(200, response.status_code)
+            pages.append([job["id"] for job in response.data["results"]])
+            cursor = response.data["next_cursor"]
+            if cursor is None:
+                return pages
+
+    def test_archive_follows_every_hot_job(self):
+        self.assertEqual(5, RedactionJob.objects.count())
+        self.assertEqual(4, RedactionJobArchive.objects.count())
+        self.assertEqual([self.ids], self.walk(limit=100))
+        # the plain list keeps its 24h window
+        self.assertEqual(self.ids[:2], [job["id"] for job in self.client.get("/api/redact/").data])
+
+    def test_pages_cross_from_hot_to_archive(self):
+        pages = self.walk(limit=2)
+        self.assertEqual([self.ids[i:i + 2] for i in range(0, 9, 2)], pages)
+
+    def test_job_archived_between_pages_is_not_repeated_or_skipped(self):
+        first = self.client.get("/api/redact/", {"include_archive": "true", "limit": 3}).data
+        call_command("archive_jobs", days=1, stdout=StringIO())
+        rest = self.client.get("/api/redact/", {"include_archive": "true", "limit": 100,
+                                                "archive_cursor": first["next_cursor"]}).data
+        self.assertEqual(self.ids, [job["id"] for job in first["results"] + rest["results"]])
+
+    def test_bad_cursor_is_rejected(self):
+        response = self.client.get("/api/redact/", {"include_archive": "true", "archive_cursor": "yesterday"})
+        self.assertEqual(400, response.status_code)
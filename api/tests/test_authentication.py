@@ -0,0 +1,88 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import authentication
+from api.authentication import ClaimsTokenObtainPairSerializer, ClaimsUser, get_user_state
+from core.models import User
+
+JOBS_URL = "/api/translate/"
+
+
+class ClaimsAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        authentication._local_states.clear()
+        self.addCleanup(authentication._local_states.clear)
+        self.user = User.objects.create_user(email="claims@example.com", password="x")
+        self.client = APIClient()
+        self.authorize(ClaimsTokenObtainPairSerializer.get_token(self.user).access_token)
+
+    def authorize(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"JWT {token}")
+
+    def get(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(JOBS_URL)
+        return response, [q["sql"] for q in queries.captured_queries]
+
+    def test_claims_token_needs_no_user_or_user_state_query_once_warm(self):
+        response, queries = self.get()
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, sum('"core_user"' in sql for sql in queries))  # the cache miss
+
+        response, queries = self.get()
+        self.assertEqual(200, response.status_code)
+        self.assertFalse([sql for sql in queries if '"core_user"' in sql or "user-state" in sql])
+        self.assertEqual(response.wsgi_request.user.id, self.user.id)
+
+    def test_token_carries_profile_and_staff_claims(self):
+        token = ClaimsTokenObtainPairSerializer.get_token(self.user).access_token
+        self.assertEqual((self.user.profile.id, False), (token["profile_id"], token["is_staff"]))
+
+    def test_deactivation_through_the_orm_revokes_at_once(self):
+        self.assertEqual(200, self.get()[0].status_code)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(401, self.get()[0].status_code)
+
+    def test_deleted_user_is_rejected(self):
+        self.assertEqual(200, self.get()[0].status_code)
+        self.user.delete()
+        self.assertEqual(401, self.get()[0].status_code)
+
+    @override_settings(AUTH_USER_STATE_LOCAL_TTL=0)
+    def test_bulk_deactivation_takes_effect_when_the_shared_entry_expires(self):
+        self.assertEqual(200, self.get()[0].status_code)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)  # no signal
+        self.assertEqual(200, self.get()[0].status_code)
+        cache.clear()  # AUTH_USER_STATE_TTL elapsed
+        self.assertEqual(401, self.get()[0].status_code)
+
+    def test_cache_miss_falls_back_to_the_database(self):
+        self.user.is_staff = True
+        self.user.save()
+        cache.clear()
+        authentication._local_states.clear()
+        with CaptureQueriesContext(connection) as queries:
+            state = get_user_state(self.user.pk)
+        self.assertEqual(1, sum('"core_user"' in q["sql"] for q in queries.captured_queries))
+        self.assertEqual({"is_active": True, "is_staff": True, "is_superuser": False}, state)
+        self.assertEqual(state, cache.get(f"api:user-state:{self.user.pk}"))
+
+    def test_other_processes_hit_the_shared_entry(self):
+        get_user_state(self.user.pk)
+        authentication._local_states.clear()
+        with CaptureQueriesContext(connection) as queries:
+            get_user_state(self.user.pk)
+        self.assertFalse([q for q in queries.captured_queries if '"core_user"' in q["sql"]])
+
+    def test_token_without_claims_uses_the_user_row(self):
+        self.authorize(AccessToken.for_user(self.user))
+        response, queries = self.get()
+        self.assertEqual(200, response.status_code)
+        self.assertIsInstance(response.wsgi_request.user, User)
+        self.assertNotIsInstance(response.wsgi_request.user, ClaimsUser)
@@ -0,0 +1,116 @@
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.db_router import ReplicaRouter, is_primary_sticky, mark_primary_sticky, read_from_replica
+from api.models import RedactionJob, TranslationJob
+from api.views import PIIRedactionViewSet
+from core.models import User
+
+REPLICAS = ["replica_1", "replica_2"]
+
+
+class CacheEntry:
+    """Stands in for the model DatabaseCache reads through the router."""
+
+    class _meta:
+        app_label = "django_cache"
+
+
+@override_settings(DATABASE_READ_REPLICAS=REPLICAS)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def read_from_replica(self):
+        token = read_from_replica.set(True)
+        self.addCleanup(read_from_replica.reset, token)
+
+    def test_reads_use_the_primary_by_default(self):
+        self.assertEqual(DEFAULT_DB_ALIAS, self.router.db_for_read(TranslationJob))
+
+    def test_replica_reads_are_spread_over_the_replicas(self):
+        self.read_from_replica()
+        self.assertEqual(set(REPLICAS), {self.router.db_for_read(RedactionJob) for _ in range(200)})
+
+    def test_writes_and_the_cache_table_stay_on_the_primary(self):
+        self.read_from_replica()
+        self.assertEqual(DEFAULT_DB_ALIAS, self.router.db_for_write(TranslationJob))
+        self.assertEqual(DEFAULT_DB_ALIAS, self.router.db_for_read(CacheEntry))
+
+    def test_no_replicas_configured(self):
+        self.read_from_replica()
+        with override_settings(DATABASE_READ_REPLICAS=[]):
+            self.assertEqual(DEFAULT_DB_ALIAS, self.router.db_for_read(TranslationJob))
+
+    def test_only_the_primary_is_migrated(self):
+        self.assertTrue(self.router.allow_migrate(DEFAULT_DB_ALIAS, "api"))
+        for alias in REPLICAS:
+            self.assertFalse(self.router.allow_migrate(alias, "api"))
+
+    def test_relations_across_the_aliases_are_allowed(self):
+        primary, replica = TranslationJob(), TranslationJob()
+        primary._state.db, replica._state.db = DEFAULT_DB_ALIAS, "replica_1"
+        self.assertTrue(self.router.allow_relation(primary, replica))
+        replica._state.db = "other"
+        self.assertIsNone(self.router.allow_relation(primary, replica))
+
+
+class PrimaryStickinessTests(TestCase):
+    def test_a_write_keeps_the_user_on_the_primary(self):
+        cache.delete("api:db-sticky:42")
+        self.assertFalse(is_primary_sticky(42))
+        mark_primary_sticky(42)
+        self.assertTrue(is_primary_sticky(42))
+        self.assertFalse(is_primary_sticky(43))
+
+
+@skipUnless(settings.DATABASE_READ_REPLICAS, "needs a replica alias (a TEST MIRROR of default)")
+class ReplicaReadViewTests(TransactionTestCase):
+    """
+    Against the configured aliases: which connection each request actually queries.
+    No wrapping transaction, the mirror connection must see the rows setUp commits.
+    """
+
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        self.replica = settings.DATABASE_READ_REPLICAS[0]
+        user = User.objects.create_user(email="router@example.com", password="x")
+        self.job = RedactionJob.objects.create(profile=user.profile, filename="a.pdf", status="succeeded")
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def queries(self, method: str, path: str) -> tuple[int, int]:
+        """Model queries the request sent to the primary and to the replica (cache table lookups excluded)."""
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary, \
+                CaptureQueriesContext(connections[self.replica]) as replica:
+            response = getattr(self.client, method)(path)
+        self.assertLess(response.status_code, 400)
+        count = lambda captured: sum(settings.CACHES["default"].get("LOCATION") not in q["sql"] for q in captured)
+        return count(primary), count(replica)
+
+    @override_settings(DATABASE_READ_REPLICAS=settings.DATABASE_READ_REPLICAS[:1])
+    def test_reads_go_to_the_replica_until_the_user_writes(self):
+        for path in ("/api/redact/", f"/api/redact/{self.job.id}/", f"/api/redact/{self.job.id}/status/"):
+            primary, replica = self.queries("get", path)
+            self.assertEqual(0, primary, path)
+            self.assertGreater(replica, 0, path)
+
+        primary, replica = self.queries("delete", f"/api/redact/{self.job.id}/")
+        self.assertEqual(0, replica)
+        primary, replica = self.queries("get", "/api/redact/")
+        self.assertGreater(primary, 0)
+        self.assertEqual(0, replica)
+
+    def test_a_failing_request_does_not_leave_replica_reads_on(self):
+        with mock.patch.object(PIIRedactionViewSet, "list", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.get("/api/redact/")
+        self.assertFalse(read_from_replica.get())
@@ -0,0 +1,147 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from api.endpoint_pool import AzureEndpoint, EndpointPool, call_with_failover
+
+
+class FakeEndpoint(BaseHTTPRequestHandler):
+    """Answers every request with the status in its path, e.g. POST /503; counts requests per path."""
+
+    def do_POST(self):
+        self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+        body = b'{"ok": true}'
+        self.send_response(int(self.path.strip("/")))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def unused_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def first_healthy(population, weights):
+    """Deterministic stand-in for random.choices: the first candidate in pool order."""
+    return [population[0]]
+
+
+class FakeClient:
+    """Shaped like AzureDocumentTranslator: one client per resource, requests go through the pool."""
+    pool: EndpointPool
+
+    def __init__(self, endpoint_name: str | None = None):
+        resource = self.pool.choose() if endpoint_name is None else self.pool.get(endpoint_name)
+        self.endpoint_name = resource.name
+        self.url = resource.config["url"]
+
+    def submit(self) -> str:
+        response = self.pool.request(self.endpoint_name, "post", self.url, timeout=5)
+        response.raise_for_status()
+        return self.endpoint_name
+
+
+@override_settings(ENDPOINT_FAILURE_THRESHOLD=2, ENDPOINT_COOLDOWN_SECONDS=30)
+class EndpointFailoverTests(SimpleTestCase):
+    def setUp(self):
+        self.server = HTTPServer(("127.0.0.1", 0), FakeEndpoint)
+        self.server.hits = {}
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        patcher = mock.patch("api.endpoint_pool.random.choices", first_healthy)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def client_over(self, *endpoints: tuple[str, str]) -> type[FakeClient]:
+        """A client class over a fresh pool of (name, url) endpoints, in that order."""
+        pool = EndpointPool("test", [AzureEndpoint(name, 1.0, {"url": url}) for name, url in endpoints])
+        return type("Client", (FakeClient,), {"pool": pool})
+
+    def test_throttled_or_failing_endpoint_fails_over(self):
+        for status in (429, 503):
+            with self.subTest(status=status):
+                self.server.hits.clear()
+                client = self.client_over(("weu", f"{self.base}/{status}"), ("neu", f"{self.base}/200"))
+                self.assertEqual("neu", call_with_failover(client, lambda c: c.submit()))
+                self.assertEqual({f"/{status}": 1, "/200": 1}, self.server.hits)
+
+    def test_unreachable_endpoint_fails_over(self):
+        client = self.client_over(("weu", f"http://127.0.0.1:{unused_port()}/200"), ("neu", f"{self.base}/200"))
+        self.assertEqual("neu", call_with_failover(client, lambda c: c.submit()))
+
+    def test_client_errors_are_not_retried_elsewhere(self):
+        client = self.client_over(("weu", f"{self.base}/400"), ("neu", f"{self.base}/200"))
+        with self.assertRaises(requests.HTTPError):
+            call_with_failover(client, lambda c: c.submit())
+        self.assertEqual({"/400": 1}, self.server.hits)
+
+    def test_gives_up_after_every_endpoint_failed_once(self):
+        client = self.client_over(("weu", f"{self.base}/503"), ("neu", f"{self.base}/502"))
+        with self.assertRaises(requests.HTTPError):
+            call_with_failover(client, lambda c: c.submit())
+        self.assertEqual({"/503": 1, "/502": 1}, self.server.hits)
+
+    def test_breaker_opens_after_consecutive_failures(self):
+        client = self.client_over(("weu", f"{self.base}/503"), ("neu", f"{self.base}/200"))
+        call_with_failover(client, lambda c: c.submit())
+        # one failure is below the threshold: weu still gets new work first
+        self.assertEqual("weu", client.pool.choose().name)
+        call_with_failover(client, lambda c: c.submit())
+        self.assertEqual("neu", client.pool.choose().name)
+        # open: new work skips weu without trying it
+        self.assertEqual("neu", call_with_failover(client, lambda c: c.submit()))
+        self.assertEqual({"/503": 2, "/200": 3}, self.server.hits)
+        # existing jobs still go back to their own endpoint
+        self.assertEqual("weu", client("weu").endpoint_name)
+
+    def test_breaker_closes_on_success_after_the_cooldown(self):
+        client = self.client_over(("weu", f"{self.base}/200"), ("neu", f"{self.base}/200"))
+        pool = client.pool
+        with mock.patch("api.endpoint_pool.time.monotonic", return_value=1000.0) as clock:
+            pool.record_failure("weu")
+            pool.record_failure("weu")
+            self.assertEqual("neu", pool.choose().name)
+            clock.return_value = 1031.0
+            self.assertEqual("weu", pool.choose().name)
+            # half-open: a single further failure opens it again
+            pool.record_failure("weu")
+            self.assertEqual("neu", pool.choose().name)
+            clock.return_value = 1062.0
+            self.assertEqual("weu", client("weu").submit())
+            pool.record_failure("weu")
+            self.assertEqual("weu", pool.choose().name)
+
+    def test_all_open_picks_the_endpoint_closest_to_recovery(self):
+        pool = self.client_over(("weu", f"{self.base}/200"), ("neu", f"{self.base}/200")).pool
+        with mock.patch("api.endpoint_pool.time.monotonic", return_value=1000.0) as clock:
+            pool.record_failure("neu")
+            pool.record_failure("neu")
+            clock.return_value = 1010.0
+            pool.record_failure("weu")
+            pool.record_failure("weu")
+            self.assertEqual("neu", pool.choose().name)
+            self.assertEqual("weu", pool.choose(exclude=["neu"]).name)
+
+
+class WeightedChoiceTests(SimpleTestCase):
+    def test_weights_and_open_endpoints(self):
+        pool = EndpointPool("test", [AzureEndpoint("weu", 3.0, {}), AzureEndpoint("neu", 1.0, {}),
+                                     AzureEndpoint("eus", 1.0, {})])
+        picks = [pool.choose().name for _ in range(2000)]
+        self.assertGreater(picks.count("weu"), picks.count("neu") * 2)
+        self.assertEqual({"weu", "neu", "eus"}, set(picks))
+        self.assertEqual({"neu", "eus"}, {pool.choose(exclude=["weu"]).name for _ in range(200)})
+        with override_settings(ENDPOINT_FAILURE_THRESHOLD=1):
+            pool.record_failure("weu")
+        self.assertEqual({"neu", "eus"}, {pool.choose().name for _ in range(200)})
@@ -0,0 +1,155 @@
+import json
+from unittest import mock
+
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceModifiedError
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from api import entity_cache, metrics
+from api.azure_ai import AzurePIIRedaction
+from api.entity_cache import BoundedLRU, get_entity_summary
+from api.models import RedactionJob
+from core.models import User
+
+BLOB_URL = "https://acct.blob.core.windows.net/out/job%201.result.json"
+
+
+def result_json(*names: str) -> bytes:
+    return json.dumps({"entities": [
+        {"text": name, "type": "Person", "entityId": f"[P-{i}]", "confidenceScore": 0.9} for i, name in enumerate(names)
+    ]}).encode("utf-8")
+
+
+class FakeBlob:
+    """Stands in for the result blob's BlobClient: counts HEADs and downloads, honours If-Match."""
+
+    def __init__(self, content: bytes, etag: str = '"0x1"'):
+        self.content, self.etag = content, etag
+        self.heads = self.downloads = 0
+
+    def replace(self, content: bytes, etag: str):
+        self.content, self.etag = content, etag
+
+    def get_blob_properties(self):
+        self.heads += 1
+        return mock.Mock(etag=self.etag)
+
+    def download_blob(self, etag=None, match_condition=None):
+        self.downloads += 1
+        if match_condition == MatchConditions.IfNotModified and etag != self.etag:
+            raise ResourceModifiedError("The condition specified using HTTP conditional header(s) is not met.")
+        return mock.Mock(readall=lambda: self.content)
+
+
+class EntitySummaryCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(entity_cache, "_local", BoundedLRU(1000))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.blob = FakeBlob(result_json("Mara", "Tom", "Mara"))
+        self.az = mock.Mock(get_blob_client=lambda url: self.blob)
+
+    def counters(self) -> dict:
+        counters = metrics.snapshot()["counters"]
+        return {name: counters.get(f"entity_cache.{name}", 0) for name in ("local_hits", "shared_hits", "misses")}
+
+    def delta(self, before: dict) -> dict:
+        return {name: value - before[name] for name, value in self.counters().items() if value != before[name]}
+
+    def test_unchanged_blob_costs_one_head_and_no_download(self):
+        before = self.counters()
+        records, source, etag = get_entity_summary(BLOB_URL, self.az)
+        self.assertEqual(("blob", '"0x1"'), (source, etag))
+        self.assertEqual(["Mara", "Tom"], [r["text"] for r in records])
+        self.assertEqual("[P-0],[P-2]", records[0]["entityId"])
+
+        again, source, _ = get_entity_summary(BLOB_URL + "?sig=resigned", self.az)  # a new SAS is the same blob
+        self.assertEqual(("local", records), (source, again))
+        self.assertEqual((2, 1), (self.blob.heads, self.blob.downloads))
+        self.assertEqual({"misses": 1, "local_hits": 1}, self.delta(before))
+
+    def test_other_workers_hit_the_shared_tier(self):
+        get_entity_summary(BLOB_URL, self.az)
+        before = self.counters()
+        with mock.patch.object(entity_cache, "_local", BoundedLRU(1000)):  # a fresh worker
+            _, source, _ = get_entity_summary(BLOB_URL, self.az)
+            self.assertEqual("shared", source)
+            _, source, _ = get_entity_summary(BLOB_URL, self.az)
+            self.assertEqual("local", source)
+        self.assertEqual(1, self.blob.downloads)
+        self.assertEqual({"shared_hits": 1, "local_hits": 1}, self.delta(before))
+
+    def test_new_etag_invalidates(self):
+        get_entity_summary(BLOB_URL, self.az)
+        self.blob.replace(result_json("Anna"), '"0x2"')
+        records, source, etag = get_entity_summary(BLOB_URL, self.az)
+        self.assertEqual(("blob", '"0x2"', ["Anna"]), (source, etag, [r["text"] for r in records]))
+        self.assertEqual(2, self.blob.downloads)
+
+    def test_blob_replaced_between_head_and_download_is_not_cached_under_the_old_etag(self):
+        original_head = self.blob.get_blob_properties
+
+        def head_then_replace():
+            properties = original_head()
+            self.blob.replace(result_json("Anna"), '"0x2"')
+            return properties
+
+        self.blob.get_blob_properties = head_then_replace
+        with self.assertRaises(ResourceModifiedError):
+            get_entity_summary(BLOB_URL, self.az)
+        self.blob.get_blob_properties = original_head
+        records, source, _ = get_entity_summary(BLOB_URL, self.az)
+        self.assertEqual(("blob", ["Anna"]), (source, [r["text"] for r in records]))
+
+    def test_missing_scores_are_json_null(self):
+        self.blob.replace(json.dumps({"entities": [{"text": "Mara", "type": "Person", "entityId": "1"}]}).encode(), '"0x3"')
+        records, _, _ = get_entity_summary(BLOB_URL, self.az)
+        self.assertIsNone(records[0]["confidenceScore"])
+
+
+class BoundedLRUTests(SimpleTestCase):
+    def test_bounded_by_rows_and_least_recently_used_goes_first(self):
+        lru = BoundedLRU(max_rows=5)
+        lru.set("a", [1, 2])
+        lru.set("b", [1, 2])
+        lru.get("a")
+        lru.set("c", [1, 2])
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual([1, 2], lru.get("a"))
+        self.assertEqual([1, 2], lru.get("c"))
+
+    def test_oversized_values_are_not_cached(self):
+        lru = BoundedLRU(max_rows=2)
+        lru.set("a", [1])
+        lru.set("big", [1, 2, 3])
+        self.assertIsNone(lru.get("big"))
+        self.assertEqual([1], lru.get("a"))
+
+
+class EntitiesEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(entity_cache, "_local", BoundedLRU(1000))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        user = User.objects.create_user(email="entities@example.com", password="x")
+        self.job = RedactionJob.objects.create(profile=user.profile, filename="a.pdf", status="succeeded",
+                                               entity_download_url=BLOB_URL)
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        self.blob = FakeBlob(result_json("Mara"))
+
+    def test_x_cache_reports_the_tier(self):
+        with mock.patch.object(AzurePIIRedaction, "get_blob_client", lambda az, url: self.blob):
+            first = self.client.get(f"/api/redact/{self.job.id}/entities/")
+            second = self.client.get(f"/api/redact/{self.job.id}/entities/")
+        self.assertEqual((200, "blob"), (first.status_code, first["X-Cache"]))
+        self.assertEqual((200, "local"), (second.status_code, second["X-Cache"]))
+        self.assertEqual(first.data, second.data)
+
+    def test_unfinished_job_has_no_entities(self):
+        RedactionJob.objects.filter(pk=self.job.pk).update(status="running")
+        self.assertEqual(409, self.client.get(f"/api/redact/{self.job.id}/entities/").status_code)
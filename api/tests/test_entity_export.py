@@ -0,0 +1,125 @@
+import csv
+import io
+from unittest import mock
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from api import entity_cache, entity_export
+from api.azure_ai import AzurePIIRedaction
+from api.entity_cache import BoundedLRU
+from api.entity_export import build_export_response, parse_range
+from api.models import RedactionJob
+from api.tests.test_entity_cache import BLOB_URL, FakeBlob, result_json
+from core.models import User
+
+RECORDS = [
+    {"text": f"Person {i}", "type": "Person", "entityId": f"[P-{i}]", "confidenceScore": i / 100}
+    for i in range(25)
+] + [{"text": "=HYPERLINK(\"x\")", "type": None, "entityId": None, "confidenceScore": None}]
+
+
+def body(response) -> bytes:
+    return b"".join(response.streaming_content) if response.streaming else response.content
+
+
+class ExportTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        patcher = mock.patch.object(entity_export, "ARROW_BATCH_ROWS", 10)  # several batches
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def export(self, output, **headers):
+        return build_export_response(self.factory.get("/", headers=headers), RECORDS, output, '"0x8"', "Vertrag.pdf")
+
+    def test_csv(self):
+        response = self.export("csv")
+        self.assertEqual((200, "text/csv; charset=utf-8"), (response.status_code, response["Content-Type"]))
+        self.assertEqual('"0x8-csv"', response["ETag"])
+        self.assertEqual('attachment; filename="Vertrag.entities.csv"', response["Content-Disposition"])
+        content = body(response)
+        self.assertEqual(int(response["Content-Length"]), len(content))
+        self.assertTrue(content.startswith(b"\xef\xbb\xbf"))
+        rows = list(csv.reader(io.StringIO(content.decode("utf-8-sig"))))
+        self.assertEqual(["text", "type", "entityId", "confidenceScore"], rows[0])
+        self.assertEqual(["Person 3", "Person", "[P-3]", "0.03"], rows[4])
+        self.assertEqual(["'=HYPERLINK(\"x\")", "", "", ""], rows[-1])  # no formula injection
+
+    def test_parquet_and_arrow_are_streamed_in_batches(self):
+        for output, read in (("parquet", lambda data: pq.read_table(pa.BufferReader(data))),
+                             ("arrow", lambda data: pa.ipc.open_file(pa.BufferReader(data)).read_all())):
+            with self.subTest(output=output):
+                response = self.export(output)
+                self.assertEqual(200, response.status_code)
+                self.assertNotIn("Content-Length", response)
+                chunks = list(response.streaming_content)
+                self.assertGreater(len(chunks), 3)  # not written as one piece
+                table = read(b"".join(chunks))
+                self.assertEqual(RECORDS, table.to_pylist())
+
+    def test_ranges_resume_the_same_bytes(self):
+        for output in ("csv", "parquet", "arrow"):
+            with self.subTest(output=output):
+                whole = body(self.export(output))
+                etag = f'"0x8-{output}"'
+                first = self.export(output, Range="bytes=0-99", If_Range=etag)
+                rest = self.export(output, Range="bytes=100-", If_Range=etag)
+                self.assertEqual((206, 206), (first.status_code, rest.status_code))
+                self.assertEqual(f"bytes 0-99/{len(whole)}", first["Content-Range"])
+                self.assertEqual(f"bytes 100-{len(whole) - 1}/{len(whole)}", rest["Content-Range"])
+                self.assertEqual(whole, body(first) + body(rest))
+                self.assertEqual(whole[-10:], body(self.export(output, Range="bytes=-10")))
+
+    def test_changed_result_sends_the_whole_file(self):
+        response = self.export("csv", Range="bytes=100-", If_Range='"0x7-csv"')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(body(self.export("csv")), body(response))
+
+    def test_unsatisfiable_range(self):
+        response = self.export("parquet", Range="bytes=999999-")
+        self.assertEqual(416, response.status_code)
+        self.assertTrue(response["Content-Range"].startswith("bytes */"))
+
+    def test_not_modified(self):
+        self.assertEqual(304, self.export("arrow", If_None_Match='"0x8-arrow"').status_code)
+
+    def test_parse_range(self):
+        self.assertIsNone(parse_range(None, 10))
+        self.assertIsNone(parse_range("bytes=0-1,4-5", 10))
+        self.assertEqual((2, 9), parse_range("bytes=2-", 10))
+        self.assertEqual((2, 9), parse_range("bytes=2-50", 10))
+        self.assertEqual((0, 9), parse_range("bytes=-50", 10))
+        for header in ("bytes=10-", "bytes=5-2", "bytes=-0"):
+            with self.subTest(header=header), self.assertRaises(ValueError):
+                parse_range(header, 10)
+
+
+class ExportEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(entity_cache, "_local", BoundedLRU(1000))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        user = User.objects.create_user(email="export@example.com", password="x")
+        self.job = RedactionJob.objects.create(profile=user.profile, filename="a.pdf", status="succeeded",
+                                               entity_download_url=BLOB_URL)
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        self.blob = FakeBlob(result_json("Mara", "Tom"))
+        patcher = mock.patch.object(AzurePIIRedaction, "get_blob_client", lambda az, url: self.blob)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_export(self):
+        response = self.client.get(f"/api/redact/{self.job.id}/export/?output=parquet")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('"0x1-parquet"', response["ETag"])
+        table = pq.read_table(pa.BufferReader(body(response)))
+        self.assertEqual(["Mara", "Tom"], table.column("text").to_pylist())
+
+    def test_unknown_output(self):
+        self.assertEqual(400, self.client.get(f"/api/redact/{self.job.id}/export/?output=xlsx").status_code)
@@ -0,0 +1,183 @@
+import math
+import random
+from unittest import mock
+
+import pandas as pd
+from django.test import SimpleTestCase
+
+from api.entity_processing import SMALL_INPUT_THRESHOLD, EntityProcessor, PandasEntityBackend, RecordEntityBackend
+
+BACKENDS = ("records", "pandas")
+
+FILTER_CHAINS = [
+    [],
+    [("type", "Person")],
+    [("confidence", 0.4)],
+    [("confidence", 1.0)],  # scores of exactly 1.0 occur: the bound is inclusive
+    [("type", "Person"), ("confidence", 0.2), ("confidence", 0.5)],
+    [("type", "Person"), ("type", "Organization")],
+]
+
+
+def make_result(n: int, seed: int) -> dict:
+    """Synthetic `.result.json` with the awkward cases: missing keys, None/NaN, mixed id types, non-dict rows."""
+    rng = random.Random(seed)
+    entities = []
+    for i in range(n):
+        entity = {
+            "text": rng.choice(["Mara", "Tom", "Jonas", "Acme", None]),
+            "type": rng.choice(["Person", "Organization", None]),
+            "entityId": rng.choice([f"[P-{i % 50}]", None, i % 7]),
+            "confidenceScore": rng.choice([rng.random(), None, 1.0]),
+        }
+        if rng.random() < 0.05:
+            del entity["confidenceScore"]
+        entities.append("junk" if rng.random() < 0.02 else entity)
+    return {"entities": entities}
+
+
+# ---------- Reference: the original DataFrame implementation ----------
+
+def reference_frame(data: dict) -> pd.DataFrame:
+    entities = [e for e in data["entities"] if isinstance(e, dict)]
+    df = pd.DataFrame(entities)
+    for col in ["text", "type", "entityId", "confidenceScore"]:
+        if col not in df:
+            df[col] = pd.NA
+    return df[["text", "type", "entityId", "confidenceScore"]]
+
+
+def reference_filter(df: pd.DataFrame, chain: list) -> pd.DataFrame:
+    for kind, value in chain:
+        if df.empty:
+            break
+        df = df[df["type"] == value] if kind == "type" else df[df["confidenceScore"] >= value]
+    return df
+
+
+def reference_aggregate(df: pd.DataFrame) -> list[dict]:
+    if df.empty:
+        return []
+    return df.groupby(["text", "type"]).agg({
+        "entityId": lambda ids: ",".join(sorted(set(ids.dropna().astype(str)))),
+        "confidenceScore": "mean"}).reset_index().to_dict("records")
+
+
+def reference_unique_ids(df: pd.DataFrame) -> list[str]:
+    label = lambda value: "None" if pd.isna(value) else str(value)
+    mapping, counters, ids = {}, {}, []
+    for text, entity_type in zip(df["text"], df["type"]):
+        key = (label(text), label(entity_type))
+        if key not in mapping:
+            upper = key[1].upper()
+            counters[upper] = counters.get(upper, 0) + 1
+            mapping[key] = f"[{upper}-{counters[upper]}]"
+        ids.append(mapping[key])
+    return ids
+
+
+def apply_chain(target, chain: list):
+    for kind, value in chain:
+        target = target.filter_by_type(value) if kind == "type" else target.filter_by_confidence(value)
+    return target
+
+
+class RecordsAssertions:
+    def assertRecordsEqual(self, expected: list[dict], actual: list[dict]):
+        self.assertEqual(len(expected), len(actual))
+        for want, got in zip(expected, actual):
+            self.assertEqual(set(want), set(got))
+            for key, value in want.items():
+                if isinstance(value, float) and math.isnan(value):
+                    self.assertTrue(isinstance(got[key], float) and math.isnan(got[key]), (want, got))
+                elif isinstance(value, float):
+                    self.assertAlmostEqual(value, got[key], places=12)
+                else:
+                    self.assertEqual(value, got[key])
+
+
+class EntityBackendEquivalenceTests(RecordsAssertions, SimpleTestCase):
+    """Both EntityProcessor backends, eager and lazy, must give what the original pandas code gave."""
+
+    sizes = (0, 1, 5, 50, 500)
+    seeds = range(3)
+
+    def test_filters_and_aggregate_match_reference(self):
+        for n in self.sizes:
+            for seed in self.seeds:
+                data = make_result(n, seed)
+                for chain in FILTER_CHAINS:
+                    expected = reference_aggregate(reference_filter(reference_frame(data), chain))
+                    for backend in BACKENDS:
+                        with self.subTest(n=n, seed=seed, chain=chain, backend=backend):
+                            eager = apply_chain(EntityProcessor("x", backend=backend).load_from_dict(data), chain)
+                            self.assertRecordsEqual(expected, eager.aggregate_records())
+                            self.assertRecordsEqual(expected, eager.aggregate_entity_ids_by_text().to_dict("records"))
+
+    def test_lazy_matches_eager(self):
+        for n in self.sizes:
+            data = make_result(n, seed=7)
+            for chain in FILTER_CHAINS:
+                expected = reference_filter(reference_frame(data), chain)
+                for backend in BACKENDS:
+                    with self.subTest(n=n, chain=chain, backend=backend):
+                        processor = EntityProcessor("x", backend=backend).load_from_dict(data)
+                        query = apply_chain(processor.lazy(), chain)
+                        self.assertRecordsEqual(reference_aggregate(expected), query.aggregate_records())
+                        self.assertEqual(len(expected), len(apply_chain(processor.lazy(), chain).collect()))
+                        # a lazy query leaves the processor it started from untouched
+                        self.assertEqual(len(reference_frame(data)) if n else 0, len(processor.df))
+
+    def test_unique_ids_match_reference(self):
+        for n in self.sizes:
+            for seed in self.seeds:
+                data = make_result(n, seed)
+                expected = reference_unique_ids(reference_frame(data)) if n else []
+                for backend in BACKENDS:
+                    with self.subTest(n=n, seed=seed, backend=backend):
+                        df = EntityProcessor("x", backend=backend).load_from_dict(data).assign_unique_entity_ids().df
+                        self.assertEqual(expected, list(df.get("uniqueEntityId", [])))
+
+    def test_backend_is_picked_by_input_size(self):
+        small = EntityProcessor("x").load_from_dict(make_result(SMALL_INPUT_THRESHOLD, seed=1))
+        large = EntityProcessor("x").load_from_dict(make_result(SMALL_INPUT_THRESHOLD * 2, seed=1))
+        self.assertEqual("records", small.backend)
+        self.assertEqual("pandas", large.backend)
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            EntityProcessor("x", backend="polars")
+
+
+class FusedQueryTests(RecordsAssertions, SimpleTestCase):
+    """The lazy query runs every recorded filter in one pass and gives what the eager filter chain gave."""
+
+    chain = [("type", "Person"), ("confidence", 0.2), ("confidence", 0.5)]
+
+    def test_lazy_query_filters_in_one_pass(self):
+        data = make_result(SMALL_INPUT_THRESHOLD * 3, seed=11)
+        for backend_class in (RecordEntityBackend, PandasEntityBackend):
+            with self.subTest(backend=backend_class.name):
+                processor = EntityProcessor("x", backend=backend_class.name).load_from_dict(data)
+                with mock.patch.object(backend_class, "filter", autospec=True,
+                                       side_effect=backend_class.filter) as fused:
+                    lazy = apply_chain(processor.lazy(), self.chain).aggregate_records()
+                self.assertEqual(1, fused.call_count)
+                self.assertEqual((["Person"], [0.2, 0.5]), fused.call_args.args[1:])
+
+                with mock.patch.object(backend_class, "filter", autospec=True,
+                                       side_effect=backend_class.filter) as step:
+                    eager = apply_chain(EntityProcessor("x", backend=backend_class.name).load_from_dict(data),
+                                        self.chain).aggregate_records()
+                self.assertEqual(len(self.chain), step.call_count)
+                self.assertRecordsEqual(eager, lazy)
+
+    def test_large_input_matches_the_old_path(self):
+        # the size-picked (pandas) backend with vectorized aggregation against successive
+        # DataFrame filters and the per-group lambda the module used before
+        data = make_result(SMALL_INPUT_THRESHOLD * 10, seed=12)
+        old = reference_aggregate(reference_filter(reference_frame(data), self.chain))
+        processor = EntityProcessor("x").load_from_dict(data)
+        self.assertEqual("pandas", processor.backend)
+        self.assertRecordsEqual(old, apply_chain(processor.lazy(), self.chain).aggregate_records())
+        self.assertRecordsEqual(old, apply_chain(processor, self.chain).aggregate_entity_ids_by_text().to_dict("records"))
@@ -0,0 +1,45 @@
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.azure_ai import AzurePIIRedaction
+from api.management.commands.benchmark_pii_text import fake_pii_pool, start_fake_language_service
+from core.models import User
+
+
+class InlineTextRedactionTests(TestCase):
+    """POST /api/redact/ with `texts` against the local fake of the synchronous PII endpoint."""
+
+    def setUp(self):
+        self.server = start_fake_language_service()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        patcher = mock.patch.object(AzurePIIRedaction, "pool", fake_pii_pool(self.server))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email="pii@example.com", password="x"))
+
+    def redact(self, texts, policy="pseudonym"):
+        return self.client.post("/api/redact/", {"texts": texts, "document_lang": "en", "policy": policy}, format="json")
+
+    def test_texts_are_redacted_across_batches_in_order(self):
+        # more snippets than one synchronous request takes
+        texts = [f"Mail {i}: Anna Bauer wrote to anna@example.com." for i in range(AzurePIIRedaction.SYNC_MAX_DOCUMENTS * 2 + 1)]
+        texts[3] = "Nothing to see here."
+        response = self.redact(texts)
+        self.assertEqual(200, response.status_code)
+        documents = response.data["documents"]
+        self.assertEqual(len(texts), len(documents))
+        self.assertEqual("Mail 0: [PERSON-1] wrote to [EMAIL-1].", documents[0]["redacted_text"])
+        self.assertEqual("Mail 10: [PERSON-1] wrote to [EMAIL-1].", documents[10]["redacted_text"])
+        self.assertEqual("Nothing to see here.", documents[3]["redacted_text"])
+        self.assertEqual(["Person", "Email"], [e["type"] for e in documents[0]["entities"]])
+
+    def test_failing_endpoint_is_a_bad_gateway(self):
+        self.server.server_close()
+        self.server.shutdown()
+        response = self.redact(["Anna Bauer"])
+        self.assertEqual(502, response.status_code)
+        self.assertNotIn("Anna", str(response.data))
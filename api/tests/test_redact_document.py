@@ -0,0 +1,31 @@
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.azure_ai import AzurePIIRedaction
+from api.models import RedactionJob
+from core.models import User
+
+
+class RedactDocumentTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email="redact@example.com", password="x"))
+
+    def post(self):
+        return self.client.post("/api/redact/", {"file": SimpleUploadedFile("a.pdf", b"%PDF", "application/pdf"),
+                                                 "document_lang": "de"}, format="multipart")
+
+    def test_refused_submission_is_a_bad_gateway(self):
+        with mock.patch.object(AzurePIIRedaction, "perform_redaction", return_value=None):
+            response = self.post()
+        self.assertEqual(502, response.status_code)
+        self.assertFalse(RedactionJob.objects.exists())
+
+    def test_submitted_job(self):
+        with mock.patch.object(AzurePIIRedaction, "perform_redaction", return_value=("https://in/a.pdf", "https://op/1")):
+            response = self.post()
+        self.assertEqual(201, response.status_code)
+        self.assertEqual("https://op/1", RedactionJob.objects.get().operation_location)
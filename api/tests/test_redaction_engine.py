@@ -0,0 +1,68 @@
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from api.redaction_engine import POLICY_CATEGORY, POLICY_MASK, POLICY_PSEUDONYM, apply_redactions, entity_error
+from core.models import User
+
+TEXT = "Mara met Tom. Mara called Acme."
+ENTITIES = [
+    {"text": "Mara", "type": "Person", "offset": 0, "length": 4},
+    {"text": "Tom", "type": "Person", "offset": 9, "length": 3},
+    {"text": "Mara", "type": "Person", "offset": 14, "length": 4},
+    {"text": "Acme", "type": "Organization", "offset": 26, "length": 4},
+]
+
+
+class RedactionEngineTests(SimpleTestCase):
+    def test_policies(self):
+        self.assertEqual("**** met ***. **** called ****.", apply_redactions(TEXT, ENTITIES, POLICY_MASK))
+        self.assertEqual("[PERSON] met [PERSON]. [PERSON] called [ORGANIZATION].",
+                         apply_redactions(TEXT, ENTITIES, POLICY_CATEGORY))
+        self.assertEqual("[PERSON-1] met [PERSON-2]. [PERSON-1] called [ORGANIZATION-1].",
+                         apply_redactions(TEXT, ENTITIES, POLICY_PSEUDONYM))
+
+    def test_entities_without_offsets_are_located_in_order(self):
+        located = [{k: v for k, v in e.items() if k not in ("offset", "length")} for e in ENTITIES]
+        self.assertEqual(apply_redactions(TEXT, ENTITIES, POLICY_PSEUDONYM),
+                         apply_redactions(TEXT, located, POLICY_PSEUDONYM))
+        # out of order: "Tom" is not after "Acme", so it is searched again from the start
+        self.assertEqual("Mara met ***. Mara called ****.", apply_redactions(TEXT, [located[3], located[1]], POLICY_MASK))
+
+    def test_overlapping_spans_are_merged(self):
+        entities = [{"type": "Person", "offset": 0, "length": 8}, {"type": "Organization", "offset": 4, "length": 8}]
+        self.assertEqual("[PERSON]. Mara called Acme.", apply_redactions(TEXT, entities))
+
+    def test_entity_errors(self):
+        self.assertIsNone(entity_error(TEXT, ENTITIES[0]))
+        self.assertIsNone(entity_error(TEXT, {"text": "Tom"}))
+        self.assertIsNone(entity_error(TEXT, {"offset": 0, "length": len(TEXT)}))
+        for entity in ({"offset": "3", "length": 2}, {"offset": 3}, {"offset": True, "length": 2},
+                       {"offset": -3, "length": 2}, {"offset": 3, "length": -1}, {"offset": 30, "length": 5},
+                       {"text": 5}, {"text": "Tom", "type": ["Person"]}):
+            with self.subTest(entity=entity):
+                self.assertIsNotNone(entity_error(TEXT, entity))
+
+
+class ApplyEndpointTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email="apply@example.com", password="x"))
+
+    def apply(self, text, entities, policy=POLICY_CATEGORY):
+        return self.client.post("/api/redact/apply/", {"text": text, "entities": entities, "policy": policy},
+                                format="json")
+
+    def test_applies_the_policy(self):
+        response = self.apply(TEXT, ENTITIES, POLICY_PSEUDONYM)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("[PERSON-1] met [PERSON-2]. [PERSON-1] called [ORGANIZATION-1].", response.data["redacted_text"])
+
+    def test_invalid_entities_are_rejected(self):
+        for entity in ({"offset": "3", "length": 2}, {"offset": -5, "length": 5}, {"offset": 6, "length": 10}):
+            with self.subTest(entity=entity):
+                response = self.apply("hello world", ["junk", entity])
+                self.assertEqual(400, response.status_code)
+                self.assertTrue(response.data["error"].startswith("entities[1]:"))
+
+    def test_unknown_policy_is_rejected(self):
+        self.assertEqual(400, self.apply(TEXT, ENTITIES, "shred").status_code)
@@ -0,0 +1,43 @@
+from unittest import mock
+
+import requests
+from azure.core.exceptions import ServiceRequestError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.azure_ai import AzureDocumentTranslator
+from api.models import TranslationJob
+from core.models import User
+
+
+class SmallDocumentTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email="sync@example.com", password="x"))
+        patcher = mock.patch("api.views.use_sync_document_path", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch("api.views.translate_document_cached", return_value=(b"translated", False))
+        self.translate_document_cached = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self):
+        return self.client.post("/api/translate/", {"file": SimpleUploadedFile("a.txt", b"hello", "text/plain"),
+                                                    "target_lang": "de"}, format="multipart")
+
+    def test_storage_failure_is_a_bad_gateway(self):
+        with mock.patch.object(AzureDocumentTranslator, "store_translated_document",
+                               side_effect=ServiceRequestError("connection reset")):
+            response = self.post()
+        self.assertEqual(502, response.status_code)
+        self.assertFalse(TranslationJob.objects.exists())
+
+    def test_translator_failure_falls_back_to_batch(self):
+        self.translate_document_cached.side_effect = requests.ConnectionError("reset")
+        az = mock.Mock(endpoint_name="primary")
+        with mock.patch("api.views.call_with_failover", return_value=(az, "src", "tgt", "op")) as failover:
+            response = self.post()
+        self.assertEqual(201, response.status_code)
+        failover.assert_called_once()
+        self.assertEqual("notStarted", TranslationJob.objects.get().status)
@@ -0,0 +1,99 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from django.test import TestCase, override_settings
+
+from api.job_status import transition_job
+from api.models import TranslationJob, WebhookDelivery
+from api.webhooks import EVENT_HEADER, SIGNATURE_HEADER, dispatch_due_deliveries, sign_payload
+from core.models import User
+
+
+class Receiver(BaseHTTPRequestHandler):
+    """Records every POST and answers with the next queued status (200 once the queue is empty)."""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append((dict(self.headers), body))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        self.send_response(status)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(DEBUG=True)  # the receiver listens on loopback, which outside DEBUG is refused
+class WebhookDeliveryTests(TestCase):
+    def setUp(self):
+        self.server = HTTPServer(("127.0.0.1", 0), Receiver)
+        self.server.received, self.server.statuses = [], []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        user = User.objects.create_user(email="hook@example.com", password="x")
+        self.profile = user.profile
+        self.profile.webhook_url = self.url
+        self.profile.save()
+
+    def finish_job(self, **fields) -> TranslationJob:
+        job = TranslationJob.objects.create(
+            profile=self.profile, filename="a.pdf", target_lang="de", source_blob_url="https://blob/a",
+            target_container_url="https://blob/out", operation_location="https://op/1", status="running", **fields)
+        self.assertTrue(transition_job(job, "succeeded", {"download_url": "https://blob/out/a.pdf"}))
+        return job
+
+    def make_due(self, delivery: WebhookDelivery):
+        WebhookDelivery.objects.filter(pk=delivery.pk).update(next_attempt_at=delivery.created_at)
+
+    def test_terminal_transition_is_delivered_signed(self):
+        job = self.finish_job()
+        self.assertEqual((1, 0), dispatch_due_deliveries())
+
+        headers, body = self.server.received[0]
+        payload = json.loads(body)
+        self.assertEqual("translation.succeeded", headers[EVENT_HEADER])
+        self.assertEqual(str(job.id), payload["job"]["id"])
+        self.assertEqual("https://blob/out/a.pdf", payload["job"]["download_url"])
+        timestamp = int(headers[SIGNATURE_HEADER].split(",")[0].removeprefix("t="))
+        self.profile.refresh_from_db()
+        self.assertEqual(sign_payload(self.profile.webhook_secret, timestamp, body), headers[SIGNATURE_HEADER])
+
+        delivery = WebhookDelivery.objects.get(job_id=job.id)
+        self.assertEqual(WebhookDelivery.STATUS_DELIVERED, delivery.status)
+        self.assertEqual(1, delivery.attempts)
+        self.assertEqual((0, 0), dispatch_due_deliveries())
+        self.assertEqual(1, len(self.server.received))
+
+    def test_failed_attempt_is_retried_later(self):
+        self.server.statuses = [500]
+        job = self.finish_job()
+        self.assertEqual((0, 1), dispatch_due_deliveries())
+        delivery = WebhookDelivery.objects.get(job_id=job.id)
+        self.assertEqual(WebhookDelivery.STATUS_PENDING, delivery.status)
+        self.assertTrue(delivery.last_error.startswith("HTTP 500"))
+        # backed off: nothing is due yet
+        self.assertEqual((0, 0), dispatch_due_deliveries())
+
+        self.make_due(delivery)
+        self.assertEqual((1, 0), dispatch_due_deliveries())
+        delivery.refresh_from_db()
+        self.assertEqual(WebhookDelivery.STATUS_DELIVERED, delivery.status)
+        self.assertEqual(2, delivery.attempts)
+        self.assertEqual(2, len(self.server.received))
+
+    def test_callback_url_overrides_profile_url(self):
+        self.profile.webhook_url = "http://127.0.0.1:9/unused"
+        self.profile.save()
+        job = self.finish_job(callback_url=self.url)
+        self.assertEqual((1, 0), dispatch_due_deliveries())
+        self.assertEqual(self.url, WebhookDelivery.objects.get(job_id=job.id).url)
+
+    def test_internal_host_is_refused_outside_debug(self):
+        job = self.finish_job()
+        with override_settings(DEBUG=False):
+            self.assertEqual((0, 1), dispatch_due_deliveries())
+        self.assertEqual([], self.server.received)
+        self.assertIn("non-public address", WebhookDelivery.objects.get(job_id=job.id).last_error)
@@ -1,13 +1,17 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from api.views import ProfileViewSet, TranslationJobViewSet, LanguageCodeViewSet, PIIRedactionViewSet
+from api.views import (EntitySearchViewSet, LanguageCodeViewSet, MetricsViewSet, PIIRedactionViewSet, ProfileViewSet,
+                       TranslationJobViewSet, UploadSessionViewSet)
 
 router = DefaultRouter()
 router.register(r'translate', TranslationJobViewSet, basename='translate')
 router.register(r'languages', LanguageCodeViewSet, basename='languages')
 router.register(r'redact', PIIRedactionViewSet, basename='redact')
 router.register(r'profile', ProfileViewSet, basename='profile')
+router.register(r'uploads', UploadSessionViewSet, basename='uploads')
+router.register(r'entities', EntitySearchViewSet, basename='entities')
+router.register(r'metrics', MetricsViewSet, basename='metrics')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,32 +1,441 @@
 from rest_framework import viewsets
-from rest_framework.parsers import MultiPartParser, FormParser
-from rest_framework import status
+from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
+from rest_framework import serializers, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin
 from rest_framework.viewsets import GenericViewSet
-from rest_framework.permissions import IsAuthenticated
-from django.db import transaction
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser, IsAuthenticated
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import URLValidator
+from django.db import router, transaction
+from django.db.models import Q
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_etags
 from django.utils import timezone as django_timezone
+import hashlib
 import requests
 import os
 import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import ExitStack
 from datetime import  datetime, timedelta, timezone
-logging.basicConfig(level=logging.INFO)
 
 
+from api import metrics
+from api.admission import LONG_POLL_GATE, SUBMIT_GATE, UPLOAD_GATE, Overloaded
+from api.authentication import ClaimsJWTAuthentication, get_profile_id
 from api.azure_ai import AzureDocumentTranslator, AzurePIIRedaction
-from api.models import LanguageCode, Profile, RedactionJob, TranslationJob
-from api.serializers import LanguageCodeSerializer, ProfileSerializer, RedactionJobSerializer, TranslationJobSerializer
+from api.catalogue import get_language_catalogue
+from api.db_router import read_from_replica, is_primary_sticky, mark_primary_sticky
+from api.direct_upload import new_upload_blob_name, upload_filename
+from api.endpoint_pool import call_with_failover
+from api.entity_cache import get_entity_summary
+from api.entity_export import EXPORT_FORMATS, build_export_response
+from api.entity_index import SEARCH_CONTAINS, SEARCH_MATCHES, search_entities
+from api.job_eta import estimated_completion, poll_delay
+from api.job_status import SAS_TTL_MINUTES, TERMINAL_STATUSES, job_etag, refresh_redaction_job, refresh_translation_job
+from api.models import (JobTombstone, LanguageCode, Profile, RedactionJob, RedactionJobArchive, TranslationJob,
+                        TranslationJobArchive, UploadSession)
+from api.parsers import ChunkParser
+from api.serializers import (LanguageCodeSerializer, ProfileSerializer, RedactionEntitySerializer, RedactionJobArchiveSerializer,
+                             RedactionJobSerializer, TranslationJobArchiveSerializer, TranslationJobSerializer,
+                             UploadSessionSerializer, WebhookSettingsSerializer)
+from api.redaction_engine import POLICIES, POLICY_CATEGORY, apply_redactions, entity_error
+from api.sync_translation import translate_document_cached, translate_text_cached, use_sync_document_path
+from api.webhooks import JOB_TYPES, enqueue_job_event, ensure_webhook_secret, webhook_url_error
 
-SAS_TTL_MINUTES = 60
+LANGUAGE_CATALOGUE_MAX_AGE = 60 * 60 * 24
+STATUS_LONG_POLL_MAX_SECONDS = 25
+STATUS_LONG_POLL_INTERVAL_SECONDS = 2
+PII_TEXT_MAX_SNIPPETS = 100
+ENTITY_SEARCH_MIN_QUERY = 3  # shorter substrings produce no trigrams to search with
+ENTITY_SEARCH_PAGE_SIZE = 50
+ENTITY_SEARCH_MAX_PAGE_SIZE = 200
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+ARCHIVE_PAGE_SIZE = 100
+ARCHIVE_MAX_PAGE_SIZE = 500
+
+
+class ReplicaReadMixin:
+    """
+    Serves the read-only `replica_actions` from a read replica, unless the user wrote something
+    within the last READ_REPLICA_STICKY_SECONDS (read-your-writes). Successful writes start that window.
+    """
+    replica_actions = ("list", "retrieve", "status")
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (request.method in SAFE_METHODS and self.action in self.replica_actions
+                and not is_primary_sticky(request.user.id)):
+            self._replica_token = read_from_replica.set(True)
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            # also when an exception escapes DRF, or the worker thread keeps reading from replicas
+            token = getattr(self, "_replica_token", None)
+            if token is not None:
+                read_from_replica.reset(token)
+                self._replica_token = None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (getattr(self, "_replica_token", None) is None and request.method not in SAFE_METHODS
+                and response.status_code < 400 and request.user.is_authenticated):
+            mark_primary_sticky(request.user.id)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class AdmissionControlMixin:
+    """
+    Actions listed in `admission_gates` need a slot in each of their gates before the request
+    body is read; otherwise they are answered 503 with Retry-After right away. Other actions
+    (status, lists, languages, profile) never wait for them.
+    """
+    admission_gates = {}
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        gates = self.admission_gates.get(self.action, ())
+        if gates:
+            self._admission = ExitStack()
+            try:
+                for gate in gates:
+                    gate.admit(self._admission)
+            except Overloaded:
+                self._admission.close()
+                self._admission = None
+                raise
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        admission = getattr(self, "_admission", None)
+        if admission is not None:
+            self._admission = None
+            admission.close()
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class JobStatusMixin:
+    """
+    Conditional GET and optional long-poll (`?wait=<seconds>`) for the job `status` actions.
+    A long-poll sleeps in the request thread, so it only happens on multithreaded workers and
+    within LONG_POLL_GATE; otherwise `wait` is ignored and the status is answered at once.
+    Unfinished jobs also get `estimated_completion_at` and a Retry-After hint (api.job_eta).
+    """
+
+    def status_response(self, request, job, refresh):
+        known_etags = parse_etags(request.headers.get("If-None-Match", ""))
+        baseline = known_etags or [job_etag(job)]
+        wait = self._get_wait_seconds(request)
+        slot = None
+        if wait and request.META.get("wsgi.multithread"):
+            slot = LONG_POLL_GATE.try_acquire()
+        if slot is None:
+            wait = 0
+        deadline = time.monotonic() + wait
+
+        try:
+            job = refresh(job)
+            while (job.status not in TERMINAL_STATUSES and job_etag(job) in baseline
+                   and time.monotonic() + STATUS_LONG_POLL_INTERVAL_SECONDS <= deadline):
+                time.sleep(STATUS_LONG_POLL_INTERVAL_SECONDS)
+                job = refresh(job)
+        finally:
+            if slot is not None:
+                LONG_POLL_GATE.release(slot)
+
+        etag = job_etag(job)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            data = self.serializer_class(job).data
+            if job.status not in TERMINAL_STATUSES:
+                data["estimated_completion_at"] = estimated_completion(job)
+            response = Response(data, status=status.HTTP_200_OK)
+        response["ETag"] = etag
+        if job.status not in TERMINAL_STATUSES:
+            # when checking again is worthwhile, from the same model the poller schedules by
+            response["Retry-After"] = str(poll_delay(job))
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def _get_wait_seconds(self, request) -> float:
+        try:
+            wait = float(request.query_params.get("wait", 0))
+        except ValueError:
+            return 0
+        return min(max(wait, 0), STATUS_LONG_POLL_MAX_SECONDS)
+
+
+class ArchiveListMixin:
+    """
+    Lets staff list every job, hot and archived, with `?include_archive=true`, as
+    {"results": [...], "next_cursor": ...}. Archived jobs are always older than the hot ones, so one
+    keyset on (-created_at, -id) walks the hot table (all of it, not the 24h list window) and then
+    the archive, `limit` rows at a time; pass `next_cursor` back as `archive_cursor` for the next page.
+    A job archived between two pages keeps its key and is neither skipped nor repeated.
+    """
+    archive_model = None
+    archive_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if not (request.user.is_staff and request.query_params.get("include_archive", "").lower() in ("1", "true")):
+            return super().list(request, *args, **kwargs)
+        params = request.query_params
+        try:
+            limit = min(max(int(params.get('limit', ARCHIVE_PAGE_SIZE)), 1), ARCHIVE_MAX_PAGE_SIZE)
+            cursor = params.get('archive_cursor')
+            after = Q()
+            if cursor:
+                micros, job_id = cursor.split(":", 1)
+                created_at, job_id = SYNC_CURSOR_EPOCH + timedelta(microseconds=int(micros)), uuid.UUID(job_id)
+                after = Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=job_id)
+        except ValueError:
+            return Response({"error": "limit must be an integer and archive_cursor a next_cursor of an earlier page."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        hot = list(self.job_model.objects.filter(after).order_by("-created_at", "-id")[:limit + 1])
+        archived = []
+        if len(hot) <= limit:
+            archived = list(self.archive_model.objects.filter(after).order_by("-created_at", "-id")[:limit + 1 - len(hot)])
+        next_cursor = None
+        if len(hot) + len(archived) > limit:
+            last = (hot + archived)[limit - 1]
+            next_cursor = f"{sync_cursor(last.created_at)}:{last.id}"
+        hot, archived = hot[:limit], archived[:limit - len(hot)]
+        results = self.get_serializer(hot, many=True).data + self.archive_serializer_class(archived, many=True).data
+        return Response({"results": results, "next_cursor": next_cursor}, status=status.HTTP_200_OK)
+
+
+SYNC_CURSOR_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def sync_cursor(moment: datetime) -> int:
+    """Cursor of the `?since=` list sync: microseconds since the epoch."""
+    return (moment - SYNC_CURSOR_EPOCH) // timedelta(microseconds=1)
+
+
+class DeltaSyncMixin:
+    """
+    `?since=<cursor>` turns a job list into a sync: only jobs created or changed after the cursor,
+    the ids of jobs deleted since, and the cursor for the next call ({"results", "deleted", "cursor"}).
+    `since=0` starts with the full list. Jobs leaving the list window by age are not reported.
+    Syncs read from the primary, so a lagging replica cannot make a cursor skip a change;
+    cursors older than JOB_TOMBSTONE_DAYS get 410 and the client reloads the list.
+    """
+
+    def list(self, request, *args, **kwargs):
+        since = request.query_params.get("since")
+        if since is None:
+            return super().list(request, *args, **kwargs)
+        try:
+            since = int(since)
+        except ValueError:
+            since = -1
+        if since < 0:
+            return Response({"error": "since must be 0 or a cursor returned by an earlier sync."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        now = django_timezone.now()
+        since_at = SYNC_CURSOR_EPOCH + timedelta(microseconds=since)
+        if since and since_at < now - timedelta(days=settings.JOB_TOMBSTONE_DAYS):
+            return Response({"error": "Cursor expired, load the full list again."}, status=status.HTTP_410_GONE)
+        # Taken before reading; rows written while this runs come again next time (clients upsert by id).
+        cursor = max(since, sync_cursor(now - timedelta(seconds=settings.DELTA_SYNC_OVERLAP_SECONDS)))
+
+        primary = router.db_for_write(self.job_model)
+        jobs = self.get_queryset().using(primary).filter(updated_at__gt=since_at).order_by("updated_at")
+        deleted = []
+        if since:
+            tombstones = JobTombstone.objects.using(primary).filter(job_type=JOB_TYPES[self.job_model],
+                                                                    deleted_at__gt=since_at)
+            if not request.user.is_staff:
+                tombstones = tombstones.filter(profile_id=get_profile_id(request.user))
+            deleted = [str(job_id) for job_id in tombstones.values_list("job_id", flat=True)]
+        return Response({"results": self.get_serializer(jobs, many=True).data, "deleted": deleted, "cursor": cursor},
+                        status=status.HTTP_200_OK)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            JobTombstone.objects.create(job_type=JOB_TYPES[type(instance)], job_id=instance.pk,
+                                        profile_id=instance.profile_id)
+            super().perform_destroy(instance)
+
+
+class IdempotentCreateMixin:
+    """
+    `Idempotency-Key` header for document creates. The first request with a key creates the job;
+    replays within IDEMPOTENCY_KEY_HOURS return that job (header Idempotent-Replayed: true)
+    without uploading or calling Azure. Concurrent requests with the same key wait for each other
+    on a lock of that (job type, profile, key), so a duplicate sees the job of the first one;
+    requests with other keys and other writers of the profile are not held up.
+    """
+
+    def create_once(self, request, fields: dict, create_job) -> Response:
+        """`fields` must match the original job's; create_job(key) creates it."""
+        key = request.headers.get("Idempotency-Key", "").strip()
+        if not key:
+            return create_job("")
+        if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            return Response({"error": f"Idempotency-Key is limited to {IDEMPOTENCY_KEY_MAX_LENGTH} characters."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        profile_id = get_profile_id(request.user)
+        with transaction.atomic():
+            self._lock_idempotency_key(profile_id, key)
+            existing = self.job_model.objects.filter(profile_id=profile_id, idempotency_key=key).first()
+            if existing is not None:
+                window_start = django_timezone.now() - timedelta(hours=settings.IDEMPOTENCY_KEY_HOURS)
+                if existing.created_at < window_start:
+                    # expired, the key may start a new job
+                    self.job_model.objects.filter(pk=existing.pk).update(idempotency_key="")
+                elif any(getattr(existing, name) != value for name, value in fields.items()):
+                    return Response({"error": "Idempotency-Key was already used for a different request."},
+                                    status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+                else:
+                    metrics.increment("idempotency.replays")
+                    response = Response(self.get_serializer_class()(existing).data, status=status.HTTP_200_OK)
+                    response["Idempotent-Replayed"] = "true"
+                    return response
+            return create_job(key)
+
+    def _lock_idempotency_key(self, profile_id: int, key: str):
+        """
+        Transaction-scoped Postgres advisory lock on a 64-bit hash of the key. Other databases
+        (SQLite in development) serialize writing transactions anyway.
+        """
+        connection = transaction.get_connection(router.db_for_write(self.job_model))
+        if connection.vendor != "postgresql":
+            return
+        digest = hashlib.sha256(f"{self.job_model._meta.label}:{profile_id}:{key}".encode("utf-8")).digest()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [int.from_bytes(digest[:8], "big", signed=True)])
+
+
+class DirectUploadMixin(ABC):
+    """
+    Two-step upload that bypasses the app server:
+    POST upload/ {"filename"} returns a write-only SAS for a fresh blob name; the browser PUTs
+    the file there (header x-ms-blob-type: BlockBlob). POST commit/ {"blob_name", "endpoint", ...}
+    then checks the blob and submits the job with `submit_upload` on the same Azure resource.
+    """
+    azure_client_class = None
+    job_model = None
+    commit_required_fields = ()
+
+    @action(detail=False, methods=['post'])
+    def upload(self, request):
+        filename = request.data.get('filename')
+        if not filename or not isinstance(filename, str):
+            return Response({"error": "filename is required."}, status=status.HTTP_400_BAD_REQUEST)
+        blob_name = new_upload_blob_name(get_profile_id(request.user), filename)
+        az = self.azure_client_class()
+        upload_url, expires_at = az.build_upload_sas(blob_name, settings.DIRECT_UPLOAD_SAS_MINUTES)
+        return Response({
+            "blob_name": blob_name,
+            "endpoint": az.endpoint_name,
+            "upload_url": upload_url,
+            "expires_at": expires_at,
+            "max_bytes": settings.DIRECT_UPLOAD_MAX_BYTES,
+            "headers": {"x-ms-blob-type": "BlockBlob"},
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'])
+    def commit(self, request):
+        blob_name = request.data.get('blob_name') or ""
+        filename = upload_filename(blob_name, get_profile_id(request.user))
+        if filename is None:
+            return Response({"error": "Unknown blob_name, request one from upload/ first."}, status=status.HTTP_400_BAD_REQUEST)
+        endpoint = request.data.get('endpoint') or ""
+        if endpoint and endpoint not in self.azure_client_class.pool.names:
+            return Response({"error": "Unknown endpoint."}, status=status.HTTP_400_BAD_REQUEST)
+        error = self.validate_commit(request)
+        if error is not None:
+            return error
+
+        az = self.azure_client_class(endpoint)
+        blob_url, properties = az.get_upload_properties(blob_name)
+        if properties is None:
+            return Response({"error": "No file uploaded to this blob_name yet."}, status=status.HTTP_409_CONFLICT)
+        return self.finish_upload(request, az, blob_url, properties.size, filename)
+
+    def validate_commit(self, request) -> Response | None:
+        missing = [field for field in self.commit_required_fields if not request.data.get(field)]
+        if missing:
+            return Response({"error": f"{', '.join(missing)} required."}, status=status.HTTP_400_BAD_REQUEST)
+        get_callback_url(request)
+        return None
+
+    def finish_upload(self, request, az, blob_url: str, size: int, filename: str) -> Response:
+        """Submits the job for an uploaded blob (also used by UploadSessionViewSet.finalize)."""
+        if not 0 < size <= settings.DIRECT_UPLOAD_MAX_BYTES:
+            az.delete_blobs([blob_url])
+            return Response({"error": f"File must be between 1 byte and {settings.DIRECT_UPLOAD_MAX_BYTES} bytes."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        # a retried commit returns the job of the first one
+        existing = self.job_model.objects.filter(profile_id=get_profile_id(request.user), source_blob_url=blob_url).first()
+        if existing is not None:
+            return Response(self.get_serializer_class()(existing).data, status=status.HTTP_200_OK)
+
+        job = self.submit_upload(request, az, blob_url, filename, size, get_callback_url(request))
+        if job is None:
+            return Response({"error": "Submitting the job to Azure failed."}, status=status.HTTP_502_BAD_GATEWAY)
+        return Response(self.get_serializer_class()(job).data, status=status.HTTP_201_CREATED)
+
+    @abstractmethod
+    def submit_upload(self, request, az, blob_url: str, filename: str, size: int, callback_url: str):
+        """Submits the Azure job for `blob_url` and returns the new job, or None if Azure refused it."""
+
+
+def get_callback_url(request) -> str:
+    callback_url = request.data.get('callback_url') or ""
+    if callback_url:
+        try:
+            URLValidator(schemes=["http", "https"])(callback_url)
+        except DjangoValidationError:
+            raise serializers.ValidationError({"callback_url": "Enter a valid http(s) URL."})
+        error = webhook_url_error(callback_url)
+        if error is not None:
+            raise serializers.ValidationError({"callback_url": error})
+    return callback_url
+
+
+def translator_error_response(error: requests.RequestException) -> Response:
+    """400 for requests Translator rejected (e.g. an unknown target_lang), 502 for everything else."""
+    response = getattr(error, "response", None)
+    if response is not None and 400 <= response.status_code < 500 and response.status_code != 429:
+        try:
+            message = response.json()["error"]["message"]
+        except (ValueError, KeyError, TypeError):
+            message = "Translator rejected the request."
+        return Response({"error": message}, status=status.HTTP_400_BAD_REQUEST)
+    logging.warning(f"Synchronous translation failed: {error}")
+    return Response({"error": "Translation failed."}, status=status.HTTP_502_BAD_GATEWAY)
+
+
+def get_texts(request) -> list:
+    """`texts` (list, or repeated form field) or a single `text` from the request body."""
+    data = request.data
+    if hasattr(data, "getlist"):
+        return data.getlist('texts') or data.getlist('text')
+    texts = data.get('texts') or data.get('text') or []
+    return texts if isinstance(texts, list) else [texts]
 
 
 # Create your views here.
-class TranslationJobViewSet(viewsets.ModelViewSet):
+class TranslationJobViewSet(AdmissionControlMixin, ReplicaReadMixin, JobStatusMixin, DeltaSyncMixin, ArchiveListMixin,
+                            IdempotentCreateMixin, DirectUploadMixin, viewsets.ModelViewSet):
     serializer_class = TranslationJobSerializer
-    parser_classes = [MultiPartParser, FormParser]
+    archive_model = TranslationJobArchive
+    archive_serializer_class = TranslationJobArchiveSerializer
+    azure_client_class = AzureDocumentTranslator
+    job_model = TranslationJob
+    commit_required_fields = ("target_lang",)
+    admission_gates = {"create": (UPLOAD_GATE, SUBMIT_GATE), "commit": (SUBMIT_GATE,)}
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
     permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
 
     def get_serializer_context(self):
         return {'profile_id': self.request.user.id}
@@ -36,21 +445,45 @@ class TranslationJobViewSet(viewsets.ModelViewSet):
         day_start = django_timezone.now() - timedelta(days=1)
         if user.is_staff:
             return TranslationJob.objects.all().order_by("-created_at")
-        profile_id = Profile.objects.only("id").get(user_id=user.id)
+        profile_id = get_profile_id(user)
         return TranslationJob.objects.filter(profile_id=profile_id, created_at__gte=day_start).order_by("-created_at")
   
     
     def create(self, request, *args, **kwargs):
         file = request.FILES.get('file')
+        text = request.data.get('text')
         target_lang = request.data.get('target_lang')
+        if not file and text and target_lang:
+            return self._translate_text(text, target_lang)
         if not file or not target_lang:
-            return Response({"error": "File and target_lang are required."}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"error": "File (or text) and target_lang are required."}, status=status.HTTP_400_BAD_REQUEST)
         
-        az = AzureDocumentTranslator()
+        callback_url = get_callback_url(request)
+        return self.create_once(request, {"filename": file.name, "target_lang": target_lang},
+                                lambda key: self._translate_document(request, file, target_lang, callback_url, key))
+
+    def _translate_document(self, request, file, target_lang: str, callback_url: str, idempotency_key: str):
+        from azure.core.exceptions import AzureError
+        if use_sync_document_path(file):
+            try:
+                return self._translate_small_document(request, file, target_lang, callback_url, idempotency_key)
+            except requests.RequestException as e:
+                logging.warning(f"Synchronous translation of {file.name} failed, falling back to batch: {e}")
+                file.seek(0)
+            except AzureError as e:
+                # the batch path uploads to the same storage account, so it would fail as well
+                logging.error(f"Storing the synchronous translation of {file.name} failed: {e}")
+                return Response({"error": "Storing the translated document failed."}, status=status.HTTP_502_BAD_GATEWAY)
+
         filename = file.name
-        
+
+        def translate(az):
+            file.seek(0)
+            return az, *az.translate_single_doument(file, filename, target_lang)
+
         with transaction.atomic():
-            source_blob_url, target_blob_url, operation_location = az.translate_single_doument(file, filename, target_lang)
+            # the file is still at hand, so a failing resource can be skipped
+            az, source_blob_url, target_blob_url, operation_location = call_with_failover(AzureDocumentTranslator, translate)
             job = TranslationJob.objects.create(
                 filename=filename,
                 target_lang=target_lang,
@@ -58,147 +491,469 @@ class TranslationJobViewSet(viewsets.ModelViewSet):
                 target_container_url=target_blob_url, 
                 status="notStarted",
                 operation_location=operation_location,
-                profile=request.user.profile
+                callback_url=callback_url,
+                file_size=file.size,
+                endpoint_name=az.endpoint_name,
+                idempotency_key=idempotency_key,
+                profile_id=get_profile_id(request.user)
             )
         return Response(TranslationJobSerializer(job).data, status=status.HTTP_201_CREATED)
     
+    def _translate_text(self, text: str, target_lang: str):
+        if len(text) > settings.SYNC_TRANSLATION_MAX_CHARS:
+            return Response({"error": f"Text is limited to {settings.SYNC_TRANSLATION_MAX_CHARS} characters."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            translated, cached = translate_text_cached(text, target_lang)
+        except requests.RequestException as e:
+            return translator_error_response(e)
+        return Response({"target_lang": target_lang, "translated_text": translated, "cached": cached},
+                        status=status.HTTP_200_OK)
+
+    def _translate_small_document(self, request, file, target_lang: str, callback_url: str, idempotency_key: str):
+        translated, cached = translate_document_cached(file.read(), file.name, target_lang, file.content_type)
+        az = AzureDocumentTranslator()
+        target_url = az.store_translated_document(translated, file.name, target_lang)
+        download_url, download_expires_at = az.build_sas_url(target_url, minutes_valid=SAS_TTL_MINUTES)
+        with transaction.atomic():
+            job = TranslationJob.objects.create(
+                filename=file.name,
+                target_lang=target_lang,
+                source_blob_url="",
+                target_container_url=target_url,
+                status="succeeded",
+                operation_location="",
+                download_url=download_url,
+                download_expires_at=download_expires_at,
+                callback_url=callback_url,
+                file_size=file.size,
+                endpoint_name=az.endpoint_name,
+                idempotency_key=idempotency_key,
+                profile_id=get_profile_id(request.user)
+            )
+            enqueue_job_event(job)
+        logging.info(f"Translated {file.name} synchronously (cached={cached})")
+        return Response(TranslationJobSerializer(job).data, status=status.HTTP_201_CREATED)
+
+    def submit_upload(self, request, az, blob_url: str, filename: str, size: int, callback_url: str):
+        target_lang = request.data.get('target_lang')
+        target_blob_url, operation_location = az.submit_translation(blob_url, filename, target_lang)
+        return TranslationJob.objects.create(
+            filename=filename,
+            target_lang=target_lang,
+            source_blob_url=blob_url,
+            target_container_url=target_blob_url,
+            status="notStarted",
+            operation_location=operation_location,
+            callback_url=callback_url,
+            file_size=size,
+            endpoint_name=az.endpoint_name,
+            profile_id=get_profile_id(request.user)
+        )
+
     @action(detail=False, methods=['get'])
     def list_blobs(self, request):
-        az = AzureDocumentTranslator()
+        az = AzureDocumentTranslator(request.query_params.get('endpoint', ""))
         blobs = az.get_all_blobs_in_container('document-out')
         return Response({"blobs": blobs}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['get'])
     def status(self, request, pk=None):
-        job = self.get_object()
-        az = AzureDocumentTranslator()
-
-        # No jumping back in status - useful for UI display
-        progress_order = ["notStarted", "running", "succeeded", "failed", "canceled"]
-        def is_monotone(old_status, new_status):
-            try:
-                return progress_order.index(new_status) >= progress_order.index(old_status)
-            except ValueError:
-                return False
-            
-        try:
-            op = az.get_operation_status(job.operation_location)
-            azure_status = (op.get('status') or '').lower()
-            mapped = {
-                "notstarted": "notStarted",
-                "running": "running",
-                "cancelling": "running",
-                "succeeded": "succeeded",
-                "failed": "failed",
-                "cancelled": "canceled"
-            }.get(azure_status, job.status)
-
-            if is_monotone(job.status, mapped):
-                job.status = mapped
-                
-                # Generate SAS only once when first succeeded and not already existing
-                if job.status == "succeeded" and not job.download_url:
-                    az = AzureDocumentTranslator()
-                    job.download_url, job.download_expires_at = az.build_sas_url(job.target_container_url, minutes_valid=SAS_TTL_MINUTES)
-            job.save()
-            data = TranslationJobSerializer(job).data
-            return Response(data, status=status.HTTP_200_OK)
-        
-        except requests.HTTPError as e:
-            job.status = "failed"
-            job.error_message = f"Azure polling error: {str(e)}"
-            job.save()
-            return Response(TranslationJobSerializer(job).data, status=status.HTTP_200_OK)
+        return self.status_response(request, self.get_object(), refresh_translation_job)
         
 
 class LanguageCodeViewSet(ListModelMixin, GenericViewSet):
     queryset = LanguageCode.objects.all().order_by('name')
     serializer_class = LanguageCodeSerializer
     permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
+
+    def list(self, request, *args, **kwargs):
+        catalogue = get_language_catalogue()
+        last_modified = int(catalogue.last_modified.timestamp())
+        response = get_conditional_response(request, etag=catalogue.etag, last_modified=last_modified)
+        if response is None:
+            response = Response(catalogue.data, status=status.HTTP_200_OK)
+        response["ETag"] = catalogue.etag
+        response["Last-Modified"] = http_date(last_modified)
+        # Same list for every user, but the endpoint requires authentication.
+        patch_cache_control(response, private=True, max_age=LANGUAGE_CATALOGUE_MAX_AGE)
+        return response
 
 
-class PIIRedactionViewSet(viewsets.ModelViewSet):
+class PIIRedactionViewSet(AdmissionControlMixin, ReplicaReadMixin, JobStatusMixin, DeltaSyncMixin, ArchiveListMixin,
+                          IdempotentCreateMixin, DirectUploadMixin, viewsets.ModelViewSet):
     serializer_class = RedactionJobSerializer
-    parser_classes = [MultiPartParser, FormParser]
+    archive_model = RedactionJobArchive
+    archive_serializer_class = RedactionJobArchiveSerializer
+    azure_client_class = AzurePIIRedaction
+    job_model = RedactionJob
+    commit_required_fields = ("document_lang",)
+    admission_gates = {"create": (UPLOAD_GATE, SUBMIT_GATE), "commit": (SUBMIT_GATE,)}
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
     permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
 
     def get_queryset(self):
         user = self.request.user
         day_start = django_timezone.now() - timedelta(days=1)
         if user.is_staff:
             return RedactionJob.objects.filter(created_at__gte=day_start).order_by("-created_at")
-        profile_id = Profile.objects.only("id").get(user_id=user.id)
+        profile_id = get_profile_id(user)
         return RedactionJob.objects.filter(profile_id=profile_id, created_at__gte=day_start).order_by("-created_at")
     
     
     def create(self, request, *args, **kwargs):
         file = request.FILES.get('file')
         document_lang = request.data.get('document_lang') # In Frontend we have to make sure this is provided
+        texts = get_texts(request)
+        if not file and texts and document_lang:
+            return self._redact_texts(texts, document_lang, request.data.get('policy') or POLICY_CATEGORY)
         if not file or not document_lang:
-            return Response({"error": "File and document_lang are required."}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"error": "File (or text) and document_lang are required."}, status=status.HTTP_400_BAD_REQUEST)
         
+        callback_url = get_callback_url(request)
+        return self.create_once(request, {"filename": file.name},
+                                lambda key: self._redact_document(request, file, document_lang, callback_url, key))
+
+    def _redact_document(self, request, file, document_lang: str, callback_url: str, idempotency_key: str):
         az = AzurePIIRedaction()
         filename = file.name
 
         with transaction.atomic():
-            source_blob_url, operation_location = az.perform_redaction(file, filename, document_lang)
+            submitted = az.perform_redaction(file, filename, document_lang)
+            if submitted is None:
+                return Response({"error": "Submitting the job to Azure failed."}, status=status.HTTP_502_BAD_GATEWAY)
+            source_blob_url, operation_location = submitted
             job = RedactionJob.objects.create(
                 filename=filename,
                 source_blob_url=source_blob_url,
                 status="notStarted",
                 operation_location=operation_location,
-                profile=request.user.profile
+                callback_url=callback_url,
+                file_size=file.size,
+                endpoint_name=az.endpoint_name,
+                idempotency_key=idempotency_key,
+                profile_id=get_profile_id(request.user)
             )
         return Response(RedactionJobSerializer(job).data, status=status.HTTP_201_CREATED)
     
+    def submit_upload(self, request, az, blob_url: str, filename: str, size: int, callback_url: str):
+        operation_location = az.submit_redaction(blob_url, request.data.get('document_lang'))
+        if operation_location is None:
+            return None
+        return RedactionJob.objects.create(
+            filename=filename,
+            source_blob_url=blob_url,
+            status="notStarted",
+            operation_location=operation_location,
+            callback_url=callback_url,
+            file_size=size,
+            endpoint_name=az.endpoint_name,
+            profile_id=get_profile_id(request.user)
+        )
+
+    def _redact_texts(self, texts: list[str], document_lang: str, policy: str):
+        """
+        Inline redaction for short snippets: one synchronous recognition call per
+        batch of snippets, masks applied locally from the returned offsets.
+        """
+        if len(texts) > PII_TEXT_MAX_SNIPPETS:
+            return Response({"error": f"At most {PII_TEXT_MAX_SNIPPETS} texts per request."}, status=status.HTTP_400_BAD_REQUEST)
+        if policy not in POLICIES:
+            return Response({"error": f"policy must be one of {', '.join(POLICIES)}."}, status=status.HTTP_400_BAD_REQUEST)
+        if any(not isinstance(t, str) or len(t) > AzurePIIRedaction.SYNC_MAX_CHARS for t in texts):
+            return Response({"error": f"Each text must be a string of at most {AzurePIIRedaction.SYNC_MAX_CHARS} characters."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results = call_with_failover(AzurePIIRedaction, lambda az: az.recognize_pii_texts(texts, document_lang))
+        except requests.RequestException as e:
+            logging.warning(f"Synchronous PII recognition failed: {e}")
+            return Response({"error": "PII recognition failed."}, status=status.HTTP_502_BAD_GATEWAY)
+        # A text Azure could not analyze gets its error, never the unredacted text.
+        documents = [
+            {"error": result["error"]} if "error" in result else
+            {"redacted_text": apply_redactions(text, result["entities"], policy), "entities": result["entities"]}
+            for text, result in zip(texts, results)
+        ]
+        return Response({"documents": documents}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'])
+    def apply(self, request):
+        """
+        Re-applies a redaction policy locally to text whose entities are already known
+        (offsets from a text redaction, or the entity list of a `.result.json`).
+        """
+        text = request.data.get('text')
+        entities = request.data.get('entities')
+        policy = request.data.get('policy') or POLICY_CATEGORY
+        if not isinstance(text, str) or not isinstance(entities, list):
+            return Response({"error": "text and entities are required."}, status=status.HTTP_400_BAD_REQUEST)
+        if policy not in POLICIES:
+            return Response({"error": f"policy must be one of {', '.join(POLICIES)}."}, status=status.HTTP_400_BAD_REQUEST)
+        for i, entity in enumerate(entities):
+            error = entity_error(text, entity) if isinstance(entity, dict) else None
+            if error is not None:
+                return Response({"error": f"entities[{i}]: {error}"}, status=status.HTTP_400_BAD_REQUEST)
+        entities = [e for e in entities if isinstance(e, dict)]
+        return Response({"redacted_text": apply_redactions(text, entities, policy)}, status=status.HTTP_200_OK)
+
     @action(detail=True, methods=['get'])
     def status(self, request, pk=None):
+        return self.status_response(request, self.get_object(), refresh_redaction_job)
+
+    @action(detail=True, methods=['get'])
+    def entities(self, request, pk=None):
+        """
+        Aggregated entities of a succeeded job (one row per entity text with all its ids),
+        cached per result blob ETag so repeated views skip the download and processing.
+        """
+        from azure.core.exceptions import ResourceNotFoundError
         job = self.get_object()
-        az = AzurePIIRedaction()
+        if job.status != "succeeded" or not job.entity_download_url:
+            return Response({"error": "Entities are available once the job has succeeded."}, status=status.HTTP_409_CONFLICT)
+        try:
+            records, source, _ = get_entity_summary(job.entity_download_url, AzurePIIRedaction(job.endpoint_name))
+        except ResourceNotFoundError:
+            return Response({"error": "The entity result is no longer available."}, status=status.HTTP_410_GONE)
+        response = Response({"entities": records}, status=status.HTTP_200_OK)
+        response["X-Cache"] = source
+        return response
 
-        # No jumping back in status - useful for UI display
-        progress_order = ["notStarted", "running", "succeeded", "failed", "canceled"]
-        def is_monotone(old_status, new_status):
-            try:
-                return progress_order.index(new_status) >= progress_order.index(old_status)
-            except ValueError:
-                return False
-            
+    @action(detail=True, methods=['get'])
+    def export(self, request, pk=None):
+        """
+        Downloads the aggregated entities as ?output=csv (default), parquet or arrow.
+        Supports Range/If-Range so large downloads can be resumed. The summary is the
+        cached record list; Parquet/Arrow are streamed as their record batches are written.
+        """
+        from azure.core.exceptions import ResourceNotFoundError
+        job = self.get_object()
+        output = (request.query_params.get('output') or 'csv').lower()
+        if output not in EXPORT_FORMATS:
+            return Response({"error": f"output must be one of {', '.join(EXPORT_FORMATS)}."}, status=status.HTTP_400_BAD_REQUEST)
+        if job.status != "succeeded" or not job.entity_download_url:
+            return Response({"error": "Entities are available once the job has succeeded."}, status=status.HTTP_409_CONFLICT)
         try:
-            op = az.get_operation_status(job.operation_location)
-            azure_status = (op.get('status') or '').lower()
-            mapped = {
-                "notstarted": "notStarted",
-                "running": "running",
-                "cancelling": "running",
-                "succeeded": "succeeded",
-                "failed": "failed",
-                "cancelled": "canceled"
-            }.get(azure_status, job.status)
-
-            if is_monotone(job.status, mapped):
-                job.status = mapped
-                
-                # Generate SAS only once when first succeeded and not already existing
-                if job.status == "succeeded" and not job.download_url:
-                    redacted_file_url, entities_json_url  = az.get_target_blob_urls(op)
-                    job.target_blob_url = redacted_file_url
-                    job.download_url, job.download_expires_at = az.build_sas_url(job.target_blob_url, minutes_valid=SAS_TTL_MINUTES, as_attachment=False)
-                    job.entity_download_url, job.entity_expires_at = az.build_sas_url(entities_json_url, minutes_valid=SAS_TTL_MINUTES, as_attachment=True)
-            job.save()
-            data = RedactionJobSerializer(job).data
-            return Response(data, status=status.HTTP_200_OK)
-        
-        except requests.HTTPError as e:
-            job.status = "failed"
-            job.error_message = f"Azure polling error: {str(e)}"
-            job.save()
-            return Response(RedactionJobSerializer(job).data, status=status.HTTP_200_OK)
+            records, _, etag = get_entity_summary(job.entity_download_url, AzurePIIRedaction(job.endpoint_name))
+        except ResourceNotFoundError:
+            return Response({"error": "The entity result is no longer available."}, status=status.HTTP_410_GONE)
+        try:
+            return build_export_response(request, records, output, etag, job.filename)
+        except ImportError:
+            logging.error(f"pyarrow is not installed, cannot export entities as {output}")
+            return Response({"error": f"{output} export is not available on this server."}, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+
+class EntitySearchViewSet(ReplicaReadMixin, GenericViewSet):
+    """
+    Staff search over the entities of all redaction jobs (hot and archived):
+    ?q=<text>&type=<type>&match=contains|words&cursor=<id>&limit=<n>.
+    `contains` is a case-insensitive substring match (trigram index), `words` a full-text
+    word match. Pages are newest first; pass `next_cursor` back as `cursor` for the next one.
+    """
+    serializer_class = RedactionEntitySerializer
+    permission_classes = [IsAdminUser]
+    authentication_classes = [ClaimsJWTAuthentication]
+
+    def list(self, request):
+        params = request.query_params
+        q = (params.get('q') or "").strip()
+        entity_type = (params.get('type') or "").strip()
+        match = params.get('match') or SEARCH_CONTAINS
+        if match not in SEARCH_MATCHES:
+            return Response({"error": f"match must be one of {', '.join(SEARCH_MATCHES)}."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(q) < ENTITY_SEARCH_MIN_QUERY and not entity_type:
+            return Response({"error": f"q (at least {ENTITY_SEARCH_MIN_QUERY} characters) or type is required."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(min(int(params.get('limit') or ENTITY_SEARCH_PAGE_SIZE), ENTITY_SEARCH_MAX_PAGE_SIZE), 1)
+            cursor = int(params['cursor']) if params.get('cursor') else None
+        except ValueError:
+            return Response({"error": "limit and cursor must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        page, next_cursor = search_entities(q, entity_type, match, cursor, limit)
+        return Response({
+            "results": RedactionEntitySerializer(page, many=True).data,
+            "next_cursor": next_cursor,
+        }, status=status.HTTP_200_OK)
+
+
+# job_type of an UploadSession -> viewset that submits the finished upload
+UPLOAD_JOB_TYPES = {
+    "translation": TranslationJobViewSet,
+    "redaction": PIIRedactionViewSet,
+}
+# Azure accepts at most this many blocks per blob
+MAX_UPLOAD_CHUNKS = 50000
+
+
+def upload_block_id(index: int) -> str:
+    # all block ids of a blob must have the same length
+    return f"{index:06d}"
+
+
+class UploadSessionViewSet(AdmissionControlMixin, RetrieveModelMixin, GenericViewSet):
+    """
+    Resumable chunked upload for large documents:
+    POST /api/uploads/ {"filename", "size", "job_type": "translation"|"redaction"} opens a session.
+    PUT /api/uploads/{id}/chunks/{n}/ (application/octet-stream, chunk_size bytes, the last chunk
+    shorter) stages chunk n as a block; re-sending a chunk replaces it.
+    GET /api/uploads/{id}/ reports received and missing chunks.
+    POST /api/uploads/{id}/finalize/ with the commit fields of the job (target_lang or
+    document_lang, callback_url) assembles the blob and submits the job.
+    """
+    serializer_class = UploadSessionSerializer
+    admission_gates = {"chunk": (UPLOAD_GATE,), "finalize": (SUBMIT_GATE,)}
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
+    parser_classes = [JSONParser, FormParser, MultiPartParser]
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(profile_id=get_profile_id(self.request.user), expires_at__gt=django_timezone.now())
+
+    def _target(self, job_type: str):
+        return UPLOAD_JOB_TYPES[job_type](request=self.request, format_kwarg=None, action="commit")
+
+    def create(self, request, *args, **kwargs):
+        job_type = request.data.get('job_type')
+        filename = request.data.get('filename')
+        try:
+            size = int(request.data.get('size'))
+        except (TypeError, ValueError):
+            size = 0
+        if job_type not in UPLOAD_JOB_TYPES or not filename or not isinstance(filename, str):
+            return Response({"error": f"filename and job_type ({', '.join(UPLOAD_JOB_TYPES)}) are required."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        chunk_size = settings.UPLOAD_CHUNK_BYTES
+        if not 0 < size <= settings.DIRECT_UPLOAD_MAX_BYTES or -(-size // chunk_size) > MAX_UPLOAD_CHUNKS:
+            return Response({"error": f"size must be between 1 and {settings.DIRECT_UPLOAD_MAX_BYTES} bytes."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        profile_id = get_profile_id(request.user)
+        blob_name = new_upload_blob_name(profile_id, filename)
+        az = self._target(job_type).azure_client_class()
+        blob_client = az.get_upload_blob_client(blob_name)
+        session = UploadSession.objects.create(
+            profile_id=profile_id,
+            job_type=job_type,
+            endpoint_name=az.endpoint_name,
+            filename=upload_filename(blob_name, profile_id),
+            blob_name=blob_name,
+            blob_url=blob_client.url,
+            size=size,
+            chunk_size=chunk_size,
+            expires_at=django_timezone.now() + timedelta(hours=settings.UPLOAD_SESSION_HOURS),
+        )
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED)
+
+    def retrieve(self, request, *args, **kwargs):
+        session = self.get_object()
+        data = UploadSessionSerializer(session).data
+        if session.status == UploadSession.STATUS_OPEN:
+            received = self._received_chunks(session, self._blob_client(session))
+            data["received_chunks"] = sorted(received)
+            data["missing_chunks"] = [i for i in range(session.chunk_count) if i not in received]
+            data["received_bytes"] = sum(session.chunk_length(i) for i in received)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['put'], url_path=r'chunks/(?P<index>\d+)', parser_classes=[ChunkParser])
+    def chunk(self, request, pk=None, index=None):
+        session = self.get_object()
+        if session.status != UploadSession.STATUS_OPEN:
+            return Response({"error": "This upload has already been finalized."}, status=status.HTTP_409_CONFLICT)
+        index = int(index)
+        if index >= session.chunk_count:
+            return Response({"error": f"Chunk index must be below {session.chunk_count}."}, status=status.HTTP_400_BAD_REQUEST)
+        data = request.data
+        expected = session.chunk_length(index)
+        if not isinstance(data, bytes) or len(data) != expected:
+            return Response({"error": f"Chunk {index} must be exactly {expected} bytes of application/octet-stream."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        self._blob_client(session).stage_block(upload_block_id(index), data, length=len(data))
+        return Response({"index": index, "size": len(data)}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        from azure.storage.blob import BlobBlock
+        target = self._target(self.get_object().job_type)
+        error = target.validate_commit(request)
+        if error is not None:
+            return error
+
+        with transaction.atomic():
+            # serializes concurrent finalize calls of the same session
+            session = UploadSession.objects.select_for_update().get(pk=pk)
+            if session.status == UploadSession.STATUS_FINALIZED:
+                job = target.job_model.objects.get(pk=session.job_id)
+                return Response(target.get_serializer_class()(job).data, status=status.HTTP_200_OK)
+
+            az = target.azure_client_class(session.endpoint_name)
+            if session.status == UploadSession.STATUS_OPEN:
+                blob_client = az.get_upload_blob_client(session.blob_name)
+                received = self._received_chunks(session, blob_client)
+                missing = [i for i in range(session.chunk_count) if i not in received]
+                if missing:
+                    return Response({"error": "Some chunks are missing.", "missing_chunks": missing},
+                                    status=status.HTTP_409_CONFLICT)
+                blob_client.commit_block_list([BlobBlock(block_id=upload_block_id(i)) for i in range(session.chunk_count)])
+                session.status = UploadSession.STATUS_COMMITTED
+                session.save(update_fields=["status"])
+
+            response = target.finish_upload(request, az, session.blob_url, session.size, session.filename)
+            if response.status_code in (status.HTTP_200_OK, status.HTTP_201_CREATED):
+                session.status = UploadSession.STATUS_FINALIZED
+                session.job_id = response.data["id"]
+                session.save(update_fields=["status", "job_id"])
+        return response
+
+    def _blob_client(self, session):
+        return self._target(session.job_type).azure_client_class(session.endpoint_name).get_upload_blob_client(session.blob_name)
+
+    def _received_chunks(self, session, blob_client) -> set[int]:
+        """Chunks staged with the expected length, read from the blob's uncommitted block list."""
+        from azure.core.exceptions import ResourceNotFoundError
+        try:
+            _, uncommitted = blob_client.get_block_list("uncommitted")
+        except ResourceNotFoundError:
+            return set()
+        received = set()
+        for block in uncommitted:
+            if block.id.isdigit() and int(block.id) < session.chunk_count and block.size == session.chunk_length(int(block.id)):
+                received.add(int(block.id))
+        return received
+
+
+class MetricsViewSet(GenericViewSet):
+    """Process-local counters of the worker answering the request."""
+    permission_classes = [IsAdminUser]
+    authentication_classes = [ClaimsJWTAuthentication]
+
+    def list(self, request):
+        return Response(metrics.snapshot(), status=status.HTTP_200_OK)
 
 
 class ProfileViewSet(ListModelMixin, GenericViewSet):
     serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
 
     def get_queryset(self):
-        return Profile.objects.filter(user=self.request.user)
\ No newline at end of file
+        return Profile.objects.filter(user_id=self.request.user.id)
+
+    @action(detail=False, methods=['get', 'put'])
+    def webhook(self, request):
+        """
+        Default callback URL for terminal job transitions. PUT {"webhook_url": ..., "rotate_secret": true}
+        sets it; the secret used to sign deliveries is generated on first use.
+        """
+        profile = self.get_queryset().get()
+        if request.method == 'PUT':
+            serializer = WebhookSettingsSerializer(profile, data=request.data)
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            if str(request.data.get('rotate_secret', '')).lower() in ('1', 'true'):
+                profile.webhook_secret = ""
+            ensure_webhook_secret(profile)
+        return Response(WebhookSettingsSerializer(profile).data, status=status.HTTP_200_OK)
\ No newline at end of file
@@ -0,0 +1,24 @@
+import importlib
+import logging
+import time
+
+# Modules that are imported lazily by api.azure_ai but are needed by every
+# job request. Workers that serve job traffic can import them at boot.
+HEAVY_MODULES = (
+    "azure.storage.blob",
+    "api.entity_processing",
+    # only used by EntityProcessor for results above SMALL_INPUT_THRESHOLD entities
+    "pandas",
+)
+
+
+def preload_heavy_modules(modules=HEAVY_MODULES) -> float:
+    """
+    Imports the given modules and returns the time it took in milliseconds.
+    """
+    started = time.perf_counter()
+    for name in modules:
+        importlib.import_module(name)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logging.info("Preloaded %d heavy modules in %.1f ms", len(modules), elapsed_ms)
+    return elapsed_ms
@@ -0,0 +1,188 @@
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import secrets
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone as django_timezone
+
+from api.models import Profile, RedactionJob, TranslationJob, WebhookDelivery
+
+SIGNATURE_HEADER = "X-Webhook-Signature"
+EVENT_HEADER = "X-Webhook-Event"
+DELIVERY_TIMEOUT_SECONDS = 10
+MAX_ATTEMPTS = 8
+# A claimed delivery is retried by another dispatcher if the claiming one dies.
+CLAIM_LEASE_SECONDS = 60
+
+JOB_TYPES = {
+    TranslationJob: "translation",
+    RedactionJob: "redaction",
+}
+
+
+def ensure_webhook_secret(profile: Profile) -> str:
+    if not profile.webhook_secret:
+        profile.webhook_secret = secrets.token_hex(32)
+        profile.save(update_fields=["webhook_secret"])
+    return profile.webhook_secret
+
+
+def webhook_url_error(url: str) -> str | None:
+    """
+    Why `url` may not receive webhooks, or None. Outside DEBUG, hosts that resolve to loopback,
+    private, link-local or other non-public addresses are refused, so user-supplied URLs cannot
+    make the server POST into its own network. Checked on input and again before every attempt.
+    """
+    if settings.DEBUG:
+        return None
+    host = urlsplit(url).hostname
+    if not host:
+        return "The URL has no host."
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except (socket.gaierror, UnicodeError):
+        return f"{host} cannot be resolved."
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+        if not ip.is_global or ip.is_multicast:
+            return f"{host} resolves to the non-public address {ip}."
+    return None
+
+
+def sign_payload(secret: str, timestamp: int, body: bytes) -> str:
+    """
+    Signature header value: `t=<unix time>,v1=<hex HMAC-SHA256 of "<t>.<body>">`.
+    Receivers recompute the HMAC over the raw body and reject old timestamps.
+    """
+    digest = hmac.new(secret.encode("utf-8"), f"{timestamp}.".encode("utf-8") + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def enqueue_job_event(job) -> WebhookDelivery | None:
+    """
+    Adds an outbox row for a job's terminal transition. Call inside the transaction
+    that saves the new status so the event is recorded exactly when the change is.
+    """
+    url = job.callback_url or job.profile.webhook_url
+    if not url:
+        return None
+    job_type = JOB_TYPES[type(job)]
+    payload = {
+        "event": f"{job_type}.{job.status}",
+        "job_type": job_type,
+        "job": {
+            "id": str(job.id),
+            "filename": job.filename,
+            "status": job.status,
+            "error_message": job.error_message,
+            "download_url": job.download_url,
+            "download_expires_at": job.download_expires_at,
+            "created_at": job.created_at,
+            "updated_at": job.updated_at,
+        },
+    }
+    if job_type == "redaction":
+        payload["job"]["entity_download_url"] = job.entity_download_url
+        payload["job"]["entity_expires_at"] = job.entity_expires_at
+    ensure_webhook_secret(job.profile)
+    return WebhookDelivery.objects.create(
+        profile=job.profile,
+        job_type=job_type,
+        job_id=job.id,
+        event=payload["event"],
+        url=url,
+        payload=payload,
+        next_attempt_at=django_timezone.now(),
+    )
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff: 30s, 1m, 2m, ... capped at one hour."""
+    return timedelta(seconds=min(30 * 2 ** (attempts - 1), 3600))
+
+
+def claim_due_deliveries(batch_size: int) -> list[WebhookDelivery]:
+    """
+    Locks up to batch_size due deliveries and pushes their next attempt out by the
+    claim lease, so concurrent dispatchers never send the same row twice.
+    """
+    now = django_timezone.now()
+    with transaction.atomic():
+        deliveries = list(
+            # of=("self",): only the delivery rows, the joined profiles stay unlocked
+            WebhookDelivery.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("profile")
+            .filter(status=WebhookDelivery.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        if deliveries:
+            WebhookDelivery.objects.filter(pk__in=[d.pk for d in deliveries]).update(
+                next_attempt_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS)
+            )
+    return deliveries
+
+
+def send_delivery(delivery: WebhookDelivery, session: requests.Session) -> str | None:
+    """
+    POSTs one delivery. Returns None on a 2xx response, otherwise the error text.
+    """
+    body = json.dumps(delivery.payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    headers = {
+        "Content-Type": "application/json",
+        EVENT_HEADER: delivery.event,
+        SIGNATURE_HEADER: sign_payload(delivery.profile.webhook_secret, int(time.time()), body),
+    }
+    error = webhook_url_error(delivery.url)
+    if error is not None:
+        return error
+    try:
+        # no redirects: they could lead to an address webhook_url_error refuses
+        response = session.post(delivery.url, data=body, headers=headers, timeout=DELIVERY_TIMEOUT_SECONDS,
+                                allow_redirects=False)
+    except requests.RequestException as e:
+        return str(e)
+    if 200 <= response.status_code < 300:
+        return None
+    return f"HTTP {response.status_code}: {response.text[:500]}"
+
+
+def dispatch_due_deliveries(batch_size: int = 100, max_workers: int = 8) -> tuple[int, int]:
+    """
+    Sends one batch of due deliveries concurrently and records the outcome.
+    Returns (delivered, failed attempts).
+    """
+    deliveries = claim_due_deliveries(batch_size)
+    if not deliveries:
+        return 0, 0
+
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        errors = list(pool.map(lambda d: send_delivery(d, session), deliveries))
+
+    delivered = failed = 0
+    now = django_timezone.now()
+    for delivery, error in zip(deliveries, errors):
+        delivery.attempts += 1
+        if error is None:
+            delivery.status = WebhookDelivery.STATUS_DELIVERED
+            delivery.delivered_at = now
+            delivered += 1
+        else:
+            delivery.last_error = error
+            failed += 1
+            if delivery.attempts >= MAX_ATTEMPTS:
+                delivery.status = WebhookDelivery.STATUS_FAILED
+                logging.error(f"Giving up on webhook {delivery.pk} for job {delivery.job_id}: {error}")
+            else:
+                delivery.next_attempt_at = now + retry_delay(delivery.attempts)
+        delivery.save(update_fields=["attempts", "status", "delivered_at", "last_error", "next_attempt_at"])
+    return delivered, failed
@@ -12,10 +12,10 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from datetime import timedelta
 from pathlib import Path
+from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
 import os
 
-from api.azure_ai import AzureDocumentTranslator
 load_dotenv(override=True)
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -50,6 +50,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "corsheaders",
     "djoser",
@@ -115,6 +116,24 @@ DATABASES = {
     }
 }
 
+# Read replicas (comma separated hosts). Routed by api.db_router.ReplicaRouter; to try routing
+# locally add a second alias pointing at the same database with "TEST": {"MIRROR": "default"}.
+for i, host in enumerate(filter(None, os.getenv("DATABASE_REPLICA_HOSTS", "").split(",")), start=1):
+    DATABASES[f"replica_{i}"] = {**DATABASES["default"], "HOST": host.strip(), "TEST": {"MIRROR": "default"}}
+DATABASE_READ_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["api.db_router.ReplicaRouter"]
+# Seconds a user's reads stay on the primary after one of their writes
+READ_REPLICA_STICKY_SECONDS = int(os.getenv("READ_REPLICA_STICKY_SECONDS", "5"))
+
+# The cache must be shared by all workers: catalogue invalidation, sticky primary reads, admission
+# slots and the shared entity tier all rely on it. Redis when REDIS_URL is set, otherwise a table
+# in the primary database (created by migration api.0017_cache_table).
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL}}
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "api_cache"}}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -167,6 +186,8 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
+CORS_EXPOSE_HEADERS = ["Idempotent-Replayed"]
 
 AUTH_USER_MODEL = "core.User"
 
@@ -184,7 +205,101 @@ DJOSER = {
     }
 }
 
+# Import the Azure SDK and pandas once per worker at boot instead of on the
+# first request that needs them (see api/warmup.py).
+PRELOAD_HEAVY_MODULES = os.getenv("PRELOAD_HEAVY_MODULES", "false").lower() in ("1", "true", "yes")
+
+# Upper bound for `manage.py startup_benchmark` (cumulative import time of django.setup()).
+STARTUP_IMPORT_BUDGET_MS = int(os.getenv("STARTUP_IMPORT_BUDGET_MS", "400"))
+
+# Inputs at or below these sizes are translated with the synchronous Translator APIs
+# and returned from the create call instead of going through a batch job.
+SYNC_TRANSLATION_MAX_BYTES = int(os.getenv("SYNC_TRANSLATION_MAX_BYTES", str(256 * 1024)))
+SYNC_TRANSLATION_MAX_CHARS = int(os.getenv("SYNC_TRANSLATION_MAX_CHARS", "10000"))
+SYNC_TRANSLATION_EXTENSIONS = os.getenv(
+    "SYNC_TRANSLATION_EXTENSIONS", ".txt,.html,.htm,.md,.csv,.tsv,.docx,.xlsx,.pptx,.xlf,.xliff,.msg"
+).split(",")
+
+# Jobs and their blobs older than this are removed by `manage.py purge_expired_jobs`.
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "30"))
+# Jobs older than this are moved to the archive tables by `manage.py archive_jobs`.
+JOB_ARCHIVE_AFTER_DAYS = int(os.getenv("JOB_ARCHIVE_AFTER_DAYS", "7"))
+# Deleted-job markers of the `?since=` list sync are kept this long; older cursors must reload the list.
+JOB_TOMBSTONE_DAYS = int(os.getenv("JOB_TOMBSTONE_DAYS", "7"))
+# Each sync cursor lies this far behind the server clock, so changes committed while a sync ran are not missed.
+DELTA_SYNC_OVERLAP_SECONDS = int(os.getenv("DELTA_SYNC_OVERLAP_SECONDS", "5"))
+
+# Browser uploads straight to blob storage (upload/commit actions)
+DIRECT_UPLOAD_SAS_MINUTES = int(os.getenv("DIRECT_UPLOAD_SAS_MINUTES", "15"))
+DIRECT_UPLOAD_MAX_BYTES = int(os.getenv("DIRECT_UPLOAD_MAX_BYTES", str(40 * 1024 * 1024)))
+# Resumable upload sessions: chunk size (one staged block each) and lifetime
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(4 * 1024 * 1024)))
+UPLOAD_SESSION_HOURS = int(os.getenv("UPLOAD_SESSION_HOURS", "24"))
+
+# Upper bound on aggregated entity rows each worker keeps in memory (api.entity_cache)
+ENTITY_CACHE_MAX_ROWS = int(os.getenv("ENTITY_CACHE_MAX_ROWS", "200000"))
+
+# JSON log lines, written by a background thread (api.structured_logging)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Verbose Azure response bodies logged per process and operation per minute (0 = never)
+LOG_PAYLOADS_PER_MINUTE = int(os.getenv("LOG_PAYLOADS_PER_MINUTE", "6"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "json": {"()": "api.structured_logging.JsonFormatter"},
+    },
+    "handlers": {
+        "background": {
+            "class": "api.structured_logging.BackgroundStreamHandler",
+            "formatter": "json",
+            "stream": "ext://sys.stdout",
+        },
+    },
+    "root": {"handlers": ["background"], "level": LOG_LEVEL},
+    "loggers": {
+        # replaces Django's DEBUG-only console handler; records propagate to the root handler
+        "django": {"level": LOG_LEVEL},
+    },
+}
+
+# Circuit breaker of the Azure endpoint pools (api.endpoint_pool)
+ENDPOINT_FAILURE_THRESHOLD = int(os.getenv("ENDPOINT_FAILURE_THRESHOLD", "3"))
+ENDPOINT_COOLDOWN_SECONDS = int(os.getenv("ENDPOINT_COOLDOWN_SECONDS", "30"))
+
+# Admission control of uploads and Azure submissions (api.admission). Keep the per-process upload
+# cap below the worker's thread count (WEB_THREADS in the Procfile) so cheap requests always find a thread.
+ADMISSION_UPLOADS_PER_PROCESS = int(os.getenv("ADMISSION_UPLOADS_PER_PROCESS", "2"))
+ADMISSION_UPLOADS_GLOBAL = int(os.getenv("ADMISSION_UPLOADS_GLOBAL", "8"))
+ADMISSION_SUBMISSIONS_PER_PROCESS = int(os.getenv("ADMISSION_SUBMISSIONS_PER_PROCESS", "4"))
+ADMISSION_SUBMISSIONS_GLOBAL = int(os.getenv("ADMISSION_SUBMISSIONS_GLOBAL", "16"))
+# Upper bound of one admitted request; a slot left behind by a crashed worker expires after it
+ADMISSION_SLOT_TTL_SECONDS = int(os.getenv("ADMISSION_SLOT_TTL_SECONDS", "600"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "5"))
+# Concurrent `?wait=` status long-polls; beyond these (and on single-threaded workers) status answers at once
+STATUS_LONG_POLLS_PER_PROCESS = int(os.getenv("STATUS_LONG_POLLS_PER_PROCESS", "2"))
+STATUS_LONG_POLLS_GLOBAL = int(os.getenv("STATUS_LONG_POLLS_GLOBAL", "8"))
+
+# Job duration model (api.job_eta): weight of the newest succeeded job in the rolling mean,
+# samples a key needs before it is trusted, and the estimate used before any job finished
+JOB_DURATION_EWMA_ALPHA = float(os.getenv("JOB_DURATION_EWMA_ALPHA", "0.2"))
+JOB_DURATION_MIN_SAMPLES = int(os.getenv("JOB_DURATION_MIN_SAMPLES", "3"))
+JOB_DURATION_DEFAULT_SECONDS = int(os.getenv("JOB_DURATION_DEFAULT_SECONDS", "120"))
+# Bounds of the Retry-After hint on status responses and of the poller's interval per job
+JOB_POLL_MIN_SECONDS = int(os.getenv("JOB_POLL_MIN_SECONDS", "2"))
+JOB_POLL_MAX_SECONDS = int(os.getenv("JOB_POLL_MAX_SECONDS", "60"))
+
+# Hours a create request's Idempotency-Key replays the original job
+IDEMPOTENCY_KEY_HOURS = int(os.getenv("IDEMPOTENCY_KEY_HOURS", "24"))
+
+# Seconds the API trusts a cached is_active/is_staff of a token's user (api.authentication)
+AUTH_USER_STATE_TTL = int(os.getenv("AUTH_USER_STATE_TTL", "60"))
+# Seconds each process keeps that state in memory in front of the shared cache
+AUTH_USER_STATE_LOCAL_TTL = int(os.getenv("AUTH_USER_STATE_LOCAL_TTL", "5"))
+
 SIMPLE_JWT = {
    'AUTH_HEADER_TYPES': ('JWT',),
-   "ACCESS_TOKEN_LIFETIME": timedelta(days=1)
+   "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
+   "TOKEN_OBTAIN_SERIALIZER": "api.authentication.ClaimsTokenObtainPairSerializer",
 }
\ No newline at end of file
@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "bauer_translator_backend.settings")
 
 application = get_wsgi_application()
+
+from django.conf import settings
+
+if settings.PRELOAD_HEAVY_MODULES:
+    from api.warmup import preload_heavy_modules
+    preload_heavy_modules()